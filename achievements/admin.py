@@ -1,4 +1,6 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+
+from .backfill import backfill_achievement
 from .models import Achievement, UserAchievement
 
 
@@ -19,10 +21,31 @@ class AchievementAdmin(admin.ModelAdmin):
 
     list_filter:
         Enables filtering by rule_type for easier navigation.
+
+    actions:
+        - backfill: Award the selected achievements to every user who
+          already qualifies (see achievements.backfill).
     """
 
     list_display = ("code", "title", "rule_type", "icon")
     list_filter = ("rule_type",)
+    actions = ["backfill"]
+
+    @admin.action(description="Award to every user who already qualifies")
+    def backfill(self, request, queryset):
+        """Backfill each selected achievement and report the awards."""
+        for achievement in queryset:
+            try:
+                result = backfill_achievement(achievement)
+            except ValueError as exc:
+                self.message_user(request, str(exc), messages.ERROR)
+                continue
+            self.message_user(
+                request,
+                f"{achievement.code}: awarded {result['awarded']} of "
+                f"{result['eligible']} eligible users.",
+                messages.SUCCESS,
+            )
 
 
 @admin.register(UserAchievement)
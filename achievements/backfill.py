@@ -0,0 +1,97 @@
+"""Retroactive awarding of a catalog achievement.
+
+New Achievement rows are otherwise only awarded lazily, the next time
+each user is evaluated. `backfill_achievement` finds every eligible user
+with the grouped query the achievement's rule declares (see
+achievements.rules) and inserts the awards in chunks, without evaluating
+users one at a time.
+
+Bulk inserts bypass UserAchievement's post_save signal, so
+`awards_bulk_created` is sent after every bulk insert of awards, here and
+in `evaluate_achievements_for_user`. Keyword arguments sent with it:
+    achievements (list[Achievement]): The achievements awarded.
+    user_ids (list[int]): Users who received them.
+"""
+
+from itertools import islice
+
+from django.db import transaction
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .models import UserAchievement
+from .rules import get_rule
+
+awards_bulk_created = Signal()
+
+#: Awards inserted per round trip.
+BACKFILL_CHUNK_SIZE = 5000
+
+
+def backfill_achievement(
+    achievement, chunk_size=BACKFILL_CHUNK_SIZE, dry_run=False, today=None
+):
+    """
+    Award an achievement to every user who already qualifies for it.
+
+    Eligible users come from one aggregate query over the rule's source
+    (rollups or outcomes), streamed in chunks. Each chunk is inserted with
+    `bulk_create(ignore_conflicts=True)` in its own transaction, so users
+    who already hold the award are skipped and reruns are idempotent.
+
+    Args:
+        achievement (Achievement): The achievement to backfill.
+        chunk_size (int): Awards inserted per round trip.
+        dry_run (bool): Only count eligible users.
+        today (date, optional): Reference date (defaults to local today).
+
+    Returns:
+        dict: A summary with keys:
+            - "eligible" (int): Users meeting the rule.
+            - "awarded" (int): Awards created by this run.
+
+    Raises:
+        ValueError: If the achievement's rule type is not registered.
+    """
+    rule = get_rule(achievement.rule_type)
+    if rule is None:
+        raise ValueError(f"Unknown rule type {achievement.rule_type!r}.")
+
+    today = today or timezone.localdate()
+    user_ids = rule.eligible_users(achievement.rule_params or {}, today)
+    if hasattr(user_ids, "iterator"):
+        user_ids = user_ids.iterator(chunk_size=chunk_size)
+    user_ids = iter(user_ids)
+
+    awards = UserAchievement.objects.filter(achievement=achievement)
+    eligible, awarded = 0, 0
+    while True:
+        chunk = list(islice(user_ids, chunk_size))
+        if not chunk:
+            break
+        eligible += len(chunk)
+        if dry_run:
+            continue
+
+        with transaction.atomic():
+            owned = set(
+                awards.filter(user_id__in=chunk)
+                .values_list("user_id", flat=True)
+            )
+            new = [user_id for user_id in chunk if user_id not in owned]
+            UserAchievement.objects.bulk_create(
+                [
+                    UserAchievement(user_id=user_id, achievement=achievement)
+                    for user_id in new
+                ],
+                ignore_conflicts=True,
+            )
+        awarded += len(new)
+        if new:
+            awards_bulk_created.send(
+                sender=UserAchievement,
+                achievements=[achievement],
+                user_ids=new,
+            )
+
+    return {"eligible": eligible, "awarded": awarded}
@@ -0,0 +1,77 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from achievements.backfill import BACKFILL_CHUNK_SIZE, backfill_achievement
+from achievements.models import Achievement
+
+
+class Command(BaseCommand):
+    """
+    Django management command to award an achievement retroactively.
+
+    Finds every user who already meets the achievement's rule with one
+    grouped query and inserts the missing awards in chunks. Run it after
+    adding an achievement to the catalog (e.g. via loaddata), since new
+    achievements are otherwise only awarded the next time each user is
+    evaluated.
+
+    Usage:
+        python manage.py backfill_achievement hours_10
+        python manage.py backfill_achievement hours_10 --dry-run
+        python manage.py backfill_achievement hours_10 --chunk-size 20000
+
+    Attributes:
+        help (str): A short description shown in `python manage.py help`.
+    """
+
+    help = "Award an achievement to every user who already qualifies."
+
+    def add_arguments(self, parser):
+        """
+        Add command-line arguments.
+
+        Options:
+            code (str): Code of the achievement to backfill.
+            --chunk-size (int): Awards inserted per round trip
+            (default 5000).
+            --dry-run: Only count eligible users.
+        """
+        parser.add_argument("code")
+        parser.add_argument(
+            "--chunk-size", type=int, default=BACKFILL_CHUNK_SIZE
+        )
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **opts):
+        """
+        Backfill the achievement and print a summary.
+
+        Args:
+            *args: Positional command arguments.
+            **opts: Keyword options, including 'code', 'chunk_size' and
+            'dry_run'.
+
+        Returns:
+            None: Outputs results directly to the console.
+        """
+        achievement = Achievement.objects.filter(code=opts["code"]).first()
+        if achievement is None:
+            raise CommandError(f"No achievement with code {opts['code']!r}.")
+
+        started = perf_counter()
+        try:
+            result = backfill_achievement(
+                achievement,
+                chunk_size=opts["chunk_size"],
+                dry_run=opts["dry_run"],
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        prefix = "[DRY RUN] " if opts["dry_run"] else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{achievement.code} | eligible: {result['eligible']} | "
+            f"awarded: {result['awarded']} | "
+            f"{perf_counter() - started:.1f}s"
+        ))
@@ -0,0 +1,95 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from achievements.models import UserStreak
+from achievements.streaks import (
+    compute_streak_from_history,
+    rebuild_user_streak,
+)
+
+
+def _differs(stored, fresh):
+    """Return True if a stored streak disagrees with the recomputed one."""
+    if stored is None:
+        return fresh.last_week is not None
+    return (
+        bytes(stored.active_weeks) != bytes(fresh.active_weeks)
+        or stored.last_week != fresh.last_week
+        or stored.last_run_weeks != fresh.last_run_weeks
+        or stored.longest_weeks != fresh.longest_weeks
+    )
+
+
+class Command(BaseCommand):
+    """
+    Django management command to rebuild UserStreak records from history.
+
+    Streaks are normally maintained incrementally by StudySession signals.
+    This command recomputes them from each user's sessions, either to
+    repair them or (with --check) to report drift without writing.
+
+    Usage:
+        python manage.py rebuild_streaks
+        python manage.py rebuild_streaks --check
+        python manage.py rebuild_streaks --user 42
+
+    Attributes:
+        help (str): A short description shown in `python manage.py help`.
+    """
+
+    help = "Rebuild weekly streak records from session history."
+
+    def add_arguments(self, parser):
+        """
+        Add optional command-line arguments.
+
+        Options:
+            --check: Report users whose stored streak differs from history
+            without changing anything.
+            --user (int): Only process this user id.
+        """
+        parser.add_argument("--check", action="store_true")
+        parser.add_argument("--user", type=int)
+
+    def handle(self, *args, **opts):
+        """
+        Rebuild (or check) every user's streak and print a summary.
+
+        Args:
+            *args: Positional command arguments.
+            **opts: Keyword options, including 'check' and 'user'.
+
+        Returns:
+            None: Outputs results directly to the console.
+        """
+        users = get_user_model().objects.order_by("pk")
+        if opts["user"]:
+            users = users.filter(pk=opts["user"])
+
+        processed, drifted = 0, 0
+        for user_id in users.values_list("pk", flat=True).iterator():
+            processed += 1
+            if not opts["check"]:
+                rebuild_user_streak(user_id)
+                continue
+
+            stored = UserStreak.objects.filter(user_id=user_id).first()
+            fresh = compute_streak_from_history(user_id)
+            if _differs(stored, fresh):
+                drifted += 1
+                self.stdout.write(self.style.WARNING(
+                    f"Drift for user {user_id}: stored "
+                    f"{stored.last_run_weeks if stored else '-'}/"
+                    f"{stored.longest_weeks if stored else '-'} vs history "
+                    f"{fresh.last_run_weeks}/{fresh.longest_weeks} "
+                    f"(latest run/longest)"
+                ))
+
+        if opts["check"]:
+            self.stdout.write(self.style.SUCCESS(
+                f"Checked {processed} users | drifted: {drifted}"
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Rebuilt streaks for {processed} users."
+            ))
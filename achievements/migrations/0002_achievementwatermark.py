@@ -0,0 +1,31 @@
+# Generated by Django 4.2.25 on 2026-10-17 10:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('achievements', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AchievementWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_minutes', models.PositiveIntegerField(default=0)),
+                ('active_week', models.DateField(blank=True, null=True)),
+                ('streak_weeks', models.PositiveIntegerField(default=0)),
+                ('next_total_minutes', models.PositiveIntegerField(blank=True, null=True)),
+                ('next_streak_weeks', models.PositiveIntegerField(blank=True, null=True)),
+                ('next_completed_goals', models.PositiveIntegerField(blank=True, null=True)),
+                ('stale', models.BooleanField(default=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='achievement_watermark', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
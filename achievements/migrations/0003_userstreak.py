@@ -0,0 +1,28 @@
+# Generated by Django 4.2.25 on 2026-10-17 11:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('achievements', '0002_achievementwatermark'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserStreak',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('active_weeks', models.BinaryField(default=b'')),
+                ('last_week', models.DateField(blank=True, null=True)),
+                ('last_run_weeks', models.PositiveIntegerField(default=0)),
+                ('longest_weeks', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='study_streak', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.25 on 2026-10-17 21:00
+
+from django.db import migrations, models
+
+
+def mark_stale(apps, schema_editor):
+    """Rebuild every watermark so the session counters start out right."""
+    AchievementWatermark = apps.get_model(
+        "achievements", "AchievementWatermark"
+    )
+    AchievementWatermark.objects.update(stale=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('achievements', '0003_userstreak'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='achievementwatermark',
+            name='total_sessions',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='achievementwatermark',
+            name='next_total_sessions',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(mark_stale, migrations.RunPython.noop),
+    ]
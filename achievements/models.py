@@ -1,3 +1,5 @@
+from datetime import date
+
 from django.db import models
 from django.contrib.auth import get_user_model
 
@@ -74,3 +76,135 @@ class UserAchievement(models.Model):
         useful for admin display and debugging.
         """
         return f"{self.user} - {self.achievement.code}"
+
+
+class AchievementWatermark(models.Model):
+    """
+    Per-user "next unlock" thresholds used to skip achievement evaluation.
+
+    After a full evaluation, the lowest unearned threshold of each rule type
+    is stored here together with the counters it is compared against.
+    Session signals keep `total_minutes` and the streak fields current, so
+    `evaluate_achievements_for_user` only needs to compare this one row
+    against its watermarks until one is crossed.
+
+    Fields:
+        user (OneToOneField): The user the watermark belongs to.
+        total_minutes (PositiveIntegerField): Lifetime study minutes.
+        total_sessions (PositiveIntegerField): Lifetime study sessions.
+        active_week (DateField): Monday of the latest week with a session
+            (as of the last update), or None if the user never studied.
+        streak_weeks (PositiveIntegerField): Consecutive active weeks
+            ending with `active_week`.
+        next_total_minutes (PositiveIntegerField): Minutes at which the
+            next "total_hours" achievement unlocks (None if none left).
+            "course_hours" rules set it to the fewest total minutes at
+            which they could be met.
+        next_total_sessions (PositiveIntegerField): Session count at which
+            the next "study_days" or "sessions_in_window" achievement
+            could unlock, at the earliest (None if none left).
+        next_streak_weeks (PositiveIntegerField): Streak length at which
+            the next "weekly_streak" achievement unlocks (None if none
+            left).
+        next_completed_goals (PositiveIntegerField): Completed-goal count
+            at which the next "goals_completed" achievement unlocks (None
+            if none left). Outcome freezes mark the watermark stale, so
+            this is informational.
+        stale (BooleanField): Set when the counters or catalog may have
+            changed in ways the fast path cannot follow; forces a full
+            evaluation.
+        updated_at (DateTimeField): Last time the row changed.
+    """
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        related_name="achievement_watermark",
+    )
+    total_minutes = models.PositiveIntegerField(default=0)
+    total_sessions = models.PositiveIntegerField(default=0)
+    active_week = models.DateField(null=True, blank=True)
+    streak_weeks = models.PositiveIntegerField(default=0)
+    next_total_minutes = models.PositiveIntegerField(null=True, blank=True)
+    next_total_sessions = models.PositiveIntegerField(null=True, blank=True)
+    next_streak_weeks = models.PositiveIntegerField(null=True, blank=True)
+    next_completed_goals = models.PositiveIntegerField(null=True, blank=True)
+    stale = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def is_crossed(self, this_week):
+        """
+        Return True if a stored counter has reached its next watermark.
+
+        Args:
+            this_week (date): Monday of the current ISO week; the streak
+            only counts while the current week is active.
+
+        Returns:
+            bool: Whether a full evaluation could unlock something.
+        """
+        if (
+            self.next_total_minutes is not None
+            and self.total_minutes >= self.next_total_minutes
+        ):
+            return True
+        if (
+            self.next_total_sessions is not None
+            and self.total_sessions >= self.next_total_sessions
+        ):
+            return True
+        if (
+            self.next_streak_weeks is not None
+            and self.active_week == this_week
+            and self.streak_weeks >= self.next_streak_weeks
+        ):
+            return True
+        return False
+
+    def __str__(self):
+        """Return the username and the watermark state."""
+        return f"{self.user} watermark{' (stale)' if self.stale else ''}"
+
+
+class UserStreak(models.Model):
+    """
+    Persisted weekly-streak state for a user.
+
+    Active study weeks are stored as a compact bitmap (bit ``i`` is the
+    ``i``-th ISO week after ``EPOCH_MONDAY``, the earliest study date
+    sessions may have; earlier weeks are never tracked). The latest active
+    week, the length of the run ending there and the longest run ever are
+    kept alongside so "current streak" and "longest streak" can be answered
+    without scanning sessions. Session create/update/delete signals keep
+    the record in step; `rebuild_streaks` recomputes it from history.
+
+    Fields:
+        user (OneToOneField): The user the streak belongs to.
+        active_weeks (BinaryField): Little-endian bitmap of active weeks.
+        last_week (DateField): Monday of the latest active week, or None.
+        last_run_weeks (PositiveIntegerField): Consecutive active weeks
+            ending with `last_week`.
+        longest_weeks (PositiveIntegerField): Longest run of consecutive
+            active weeks.
+        updated_at (DateTimeField): Last time the record changed.
+    """
+
+    EPOCH_MONDAY = date(1970, 1, 5)
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        related_name="study_streak",
+    )
+    active_weeks = models.BinaryField(default=b"")
+    last_week = models.DateField(null=True, blank=True)
+    last_run_weeks = models.PositiveIntegerField(default=0)
+    longest_weeks = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        """Return the username with current and longest run lengths."""
+        return (
+            f"{self.user} streak {self.last_run_weeks} "
+            f"(longest {self.longest_weeks})"
+        )
@@ -0,0 +1,419 @@
+"""Declarative achievement rules.
+
+Each rule type (the `Achievement.rule_type` string) is a Rule subclass
+registered in RULES. A rule declares the per-user Metric it compares
+against, the target read from `rule_params`, its progress hint and the
+watermark that tells `evaluate_achievements_for_user` when it could next
+unlock. Adding a badge of an existing type is a data change; adding a
+new type is one registered class.
+
+`collect_metrics` gathers the metrics of any set of achievements and
+compiles them into a single SELECT, one scalar subquery per distinct
+metric, so evaluation and progress hints cost one statement however many
+rule types the catalog uses. The weekly streak is the exception: it is
+read from the incrementally maintained UserStreak record.
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import timedelta
+from math import ceil
+from typing import Callable, Optional
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from goals.models import GoalOutcome
+from study_sessions.models import DailyStudyRollup
+
+from .models import UserStreak
+from .streaks import streak_summary
+
+
+@dataclass(frozen=True)
+class Metric:
+    """
+    A per-user figure that rules compare against.
+
+    The figure is `aggregate` over the rows returned by `source`, grouped
+    by the user (and by `group_by`, keeping each user's largest group).
+
+    Attributes:
+        key (str): Name of the value in the stats dict (and SQL alias).
+        source (callable | None): Takes `today` and returns the queryset
+            to aggregate, or None for values filled in from the streak
+            summary.
+        user_field (str): Lookup from the source rows to the user.
+        aggregate (callable | None): Returns the aggregate expression.
+        group_by (tuple[str]): Extra grouping fields.
+    """
+
+    key: str
+    source: Optional[Callable] = None
+    user_field: str = "user"
+    aggregate: Optional[Callable] = None
+    group_by: tuple = ()
+
+    def _grouped(self, qs):
+        return (
+            qs.values(self.user_field, *self.group_by)
+            .annotate(value=self.aggregate())
+        )
+
+    def expression(self, today):
+        """Return a scalar subquery of the value, correlated to user pk."""
+        qs = self.source(today).filter(**{self.user_field: OuterRef("pk")})
+        return Coalesce(
+            Subquery(
+                self._grouped(qs).order_by("-value").values("value")[:1],
+                output_field=IntegerField(),
+            ),
+            0,
+        )
+
+    def users_reaching(self, target, today):
+        """Return ids of every user whose value is at least `target`."""
+        return (
+            self._grouped(self.source(today))
+            .filter(value__gte=target)
+            .order_by()
+            .values_list(self.user_field, flat=True)
+            .distinct()
+        )
+
+
+def _rollups(today):
+    return DailyStudyRollup.objects.all()
+
+
+def _completed_outcomes(today):
+    return GoalOutcome.objects.filter(completed=True, is_final=True)
+
+
+def _rollups_in_window(days):
+    def source(today):
+        return DailyStudyRollup.objects.filter(
+            day__gt=today - timedelta(days=days), day__lte=today
+        )
+    return source
+
+
+TOTAL_MINUTES = Metric(
+    "total_minutes", _rollups, aggregate=lambda: Sum("minutes")
+)
+TOTAL_SESSIONS = Metric(
+    "total_sessions", _rollups, aggregate=lambda: Sum("session_count")
+)
+COMPLETED_GOALS = Metric(
+    "completed_goals", _completed_outcomes, "goal__user",
+    aggregate=lambda: Count("pk"),
+)
+STUDY_DAYS = Metric(
+    "study_days", _rollups, aggregate=lambda: Count("day", distinct=True)
+)
+BEST_COURSE_MINUTES = Metric(
+    "best_course_minutes", _rollups,
+    aggregate=lambda: Sum("minutes"), group_by=("course",),
+)
+WEEKLY_STREAK = Metric("weekly_streak_weeks")
+
+#: Metrics every stats dict carries: the watermark stores them.
+BASE_METRICS = (
+    TOTAL_MINUTES, TOTAL_SESSIONS, COMPLETED_GOALS, WEEKLY_STREAK,
+)
+
+
+class Rule(ABC):
+    """
+    Base class for a rule type.
+
+    Subclasses set `rule_type` and implement `metric`, `target`, `hint`
+    and `watermark`; a subclass missing one cannot be instantiated, so it
+    fails when registered. By default a rule is met when its metric
+    reaches its target.
+    """
+
+    rule_type = None
+
+    @abstractmethod
+    def metric(self, params):
+        """Return the Metric this rule compares against."""
+
+    @abstractmethod
+    def target(self, params):
+        """Return the metric value at which the rule is met."""
+
+    @abstractmethod
+    def hint(self, params, value):
+        """Return a progress message for a locked achievement."""
+
+    def is_met(self, params, stats):
+        """Return True if the stats meet this rule."""
+        return stats[self.metric(params).key] >= self.target(params)
+
+    def eligible_users(self, params, today):
+        """
+        Return ids of every user who meets this rule, as one grouped query.
+
+        Args:
+            params (dict): The achievement's rule_params.
+            today (date): Reference date.
+
+        Returns:
+            Iterable[int]: User ids (a flat QuerySet by default).
+        """
+        return self.metric(params).users_reaching(self.target(params), today)
+
+    @abstractmethod
+    def watermark(self, params, stats):
+        """
+        Return the AchievementWatermark field and threshold that signal
+        this rule may have become met.
+
+        The threshold must not overshoot: the rule must not be able to
+        become met before the watermark counter reaches it. Rules whose
+        metric is not stored on the watermark bound it by the lifetime
+        minutes or sessions it takes at least to get there.
+
+        Returns:
+            tuple[str, int]: (watermark field, value to reach).
+        """
+
+
+RULES = {}
+
+
+def register(cls):
+    """Class decorator adding a Rule subclass to RULES by its rule_type."""
+    RULES[cls.rule_type] = cls()
+    return cls
+
+
+def get_rule(rule_type):
+    """Return the registered Rule for a rule_type, or None if unknown."""
+    return RULES.get(rule_type)
+
+
+@register
+class TotalHoursRule(Rule):
+    """Unlocks after total study hours reach `threshold`."""
+
+    rule_type = "total_hours"
+
+    def metric(self, params):
+        return TOTAL_MINUTES
+
+    def target(self, params):
+        return ceil(params.get("threshold", 0) * 60)
+
+    def hint(self, params, value):
+        threshold = params.get("threshold", 0)
+        current_hours = round(value / 60, 1)
+        remaining = max(threshold - current_hours, 0)
+        return (
+            f"Study {threshold} total hours "
+            f"(you’re at {current_hours}h, {remaining}h to go)."
+        )
+
+    def watermark(self, params, stats):
+        return "next_total_minutes", self.target(params)
+
+
+@register
+class GoalsCompletedRule(Rule):
+    """Unlocks after `threshold` weekly goal outcomes are completed."""
+
+    rule_type = "goals_completed"
+
+    def metric(self, params):
+        return COMPLETED_GOALS
+
+    def target(self, params):
+        return params.get("threshold", 0)
+
+    def hint(self, params, value):
+        threshold = self.target(params)
+        remaining = max(threshold - value, 0)
+        return (
+            f"Complete {threshold} goals "
+            f"(you’ve completed {value}, {remaining} to go)."
+        )
+
+    def watermark(self, params, stats):
+        return "next_completed_goals", self.target(params)
+
+
+@register
+class WeeklyStreakRule(Rule):
+    """Unlocks after `weeks` consecutive active weeks."""
+
+    rule_type = "weekly_streak"
+
+    def metric(self, params):
+        return WEEKLY_STREAK
+
+    def target(self, params):
+        return params.get("weeks", 0)
+
+    def hint(self, params, value):
+        needed = self.target(params)
+        remaining = max(needed - value, 0)
+        return (
+            f"Maintain a {needed}-week streak "
+            f"(you’re at {value} weeks, {remaining} to go)."
+        )
+
+    def watermark(self, params, stats):
+        return "next_streak_weeks", self.target(params)
+
+    def eligible_users(self, params, today):
+        # Read the maintained streak records; a run only counts while the
+        # current week is active. The rare records with future-dated
+        # weeks are resolved one by one through streak_summary.
+        needed = self.target(params)
+        this_week = today - timedelta(days=today.weekday())
+        current = UserStreak.objects.filter(
+            last_week=this_week, last_run_weeks__gte=needed
+        ).values_list("user_id", flat=True)
+        yield from current.iterator()
+        for streak in (
+            UserStreak.objects.filter(last_week__gt=this_week)
+            .select_related("user")
+        ):
+            if streak_summary(streak.user, today)["current_weeks"] >= needed:
+                yield streak.user_id
+
+
+@register
+class StudyDaysRule(Rule):
+    """Unlocks after studying on `days` distinct days."""
+
+    rule_type = "study_days"
+
+    def metric(self, params):
+        return STUDY_DAYS
+
+    def target(self, params):
+        return params.get("days", 0)
+
+    def hint(self, params, value):
+        needed = self.target(params)
+        remaining = max(needed - value, 0)
+        return (
+            f"Study on {needed} different days "
+            f"(you’re at {value}, {remaining} to go)."
+        )
+
+    def watermark(self, params, stats):
+        # Each new study day takes at least one more session
+        missing = self.target(params) - stats["study_days"]
+        return "next_total_sessions", stats["total_sessions"] + missing
+
+
+@register
+class SessionsInWindowRule(Rule):
+    """Unlocks after `sessions` sessions within the last `days` days."""
+
+    rule_type = "sessions_in_window"
+
+    def metric(self, params):
+        days = params.get("days", 7)
+        return Metric(
+            f"sessions_last_{days}_days",
+            _rollups_in_window(days),
+            aggregate=lambda: Sum("session_count"),
+        )
+
+    def target(self, params):
+        return params.get("sessions", 0)
+
+    def hint(self, params, value):
+        needed = self.target(params)
+        days = params.get("days", 7)
+        remaining = max(needed - value, 0)
+        return (
+            f"Log {needed} sessions within {days} days "
+            f"(you’re at {value}, {remaining} to go)."
+        )
+
+    def watermark(self, params, stats):
+        # Sessions only leave the window, so the rest must all be new
+        value = stats[self.metric(params).key]
+        missing = self.target(params) - value
+        return "next_total_sessions", stats["total_sessions"] + missing
+
+
+@register
+class CourseHoursRule(Rule):
+    """Unlocks after `hours` hours studied on any single course."""
+
+    rule_type = "course_hours"
+
+    def metric(self, params):
+        return BEST_COURSE_MINUTES
+
+    def target(self, params):
+        return ceil(params.get("hours", 0) * 60)
+
+    def hint(self, params, value):
+        hours = params.get("hours", 0)
+        current_hours = round(value / 60, 1)
+        remaining = max(hours - current_hours, 0)
+        return (
+            f"Study {hours} hours on one course "
+            f"(your best is {current_hours}h, {remaining}h to go)."
+        )
+
+    def watermark(self, params, stats):
+        # No course gains more minutes than the user logs in total
+        missing = self.target(params) - stats["best_course_minutes"]
+        return "next_total_minutes", stats["total_minutes"] + missing
+
+
+def collect_metrics(user, achievements=(), today=None):
+    """
+    Compute the base metrics plus those of the given achievements.
+
+    Every SQL-backed metric becomes one scalar subquery in a single
+    SELECT on the user table; the streak figures come from
+    `streak_summary`.
+
+    Args:
+        user (User): The user to measure.
+        achievements (Iterable[Achievement]): Achievements whose metrics
+            are needed (unknown rule types are ignored).
+        today (date, optional): Reference date (defaults to local today).
+
+    Returns:
+        dict: Metric values by key, plus "longest_streak_weeks",
+        "last_active_week" and "last_active_streak_weeks".
+    """
+    today = today or timezone.localdate()
+    metrics = {m.key: m for m in BASE_METRICS}
+    for achievement in achievements:
+        rule = get_rule(achievement.rule_type)
+        if rule is not None:
+            metric = rule.metric(achievement.rule_params or {})
+            metrics[metric.key] = metric
+
+    expressions = {
+        key: metric.expression(today)
+        for key, metric in metrics.items()
+        if metric.source is not None
+    }
+    stats = (
+        get_user_model().objects.filter(pk=user.pk)
+        .values(**expressions)
+        .get()
+    )
+
+    streak = streak_summary(user, today)
+    stats.update({
+        "weekly_streak_weeks": streak["current_weeks"],
+        "longest_streak_weeks": streak["longest_weeks"],
+        "last_active_week": streak["last_active_week"],
+        "last_active_streak_weeks": streak["last_active_weeks"],
+    })
+    return stats
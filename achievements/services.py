@@ -1,133 +1,189 @@
-from datetime import date
+from datetime import timedelta
 from django.utils import timezone
-from django.db.models import Sum
+from django.db import transaction
+from django.db.models import Case, F, Value, When
 
-from .models import Achievement, UserAchievement
-from study_sessions.models import StudySession
-from goals.models import GoalOutcome
+from .backfill import awards_bulk_created
+from .models import Achievement, AchievementWatermark, UserAchievement
+from .rules import collect_metrics, get_rule
 
 
-def get_user_stats(user):
+def _monday_of(d):
+    """Return the Monday of the ISO week containing the given date."""
+    return d - timedelta(days=d.weekday())
+
+
+def get_user_stats(user, achievements=()):
     """
     Collect study-related statistics for a given user.
 
-    This function aggregates key performance metrics used to evaluate
-    achievement progress, including total study time, number of completed
-    goals,
-    and the user’s current weekly streak.
+    The figures are the metrics declared by the achievement rules (see
+    achievements.rules). The base metrics are always included; pass the
+    achievements about to be checked to add theirs. All SQL-backed
+    metrics are computed in one statement.
 
     Logic overview:
-        - Total minutes are summed across all StudySession records.
-        - Completed goals are counted via GoalOutcome entries marked as
-        completed.
+        - Total minutes are summed across the user's DailyStudyRollup rows.
+        - Completed goals are counted via final GoalOutcome entries marked
+        as completed.
         - Weekly streak counts consecutive ISO weeks (ending with the current
         week)
-          in which the user has logged at least one study session.
+          in which the user has logged at least one study session. It is
+          read from the user's UserStreak record rather than by scanning
+          sessions.
 
     Args:
         user (User): The user instance whose stats are being calculated.
+        achievements (Iterable[Achievement]): Achievements whose rule
+        metrics should be included as well.
 
     Returns:
-        dict: A dictionary with the following keys:
+        dict: A dictionary with the following keys, plus one per extra
+        metric:
             - "total_minutes" (int): Total study minutes logged.
+            - "total_sessions" (int): Total study sessions logged.
             - "completed_goals" (int): Number of completed goals.
             - "weekly_streak_weeks" (int): Number of consecutive
             active study weeks.
+            - "longest_streak_weeks" (int): Longest streak ever.
+            - "last_active_week" (date | None): Monday of the latest
+            week (up to the current one) with a session.
+            - "last_active_streak_weeks" (int): Consecutive active weeks
+            ending with last_active_week.
     """
-    # Total study minutes for this user
-    total_minutes = (
-        StudySession.objects.filter(user=user)
-        .aggregate(total=Sum("duration_minutes"))
-        .get("total") or 0
-    )
-
-    # Count of completed goals owned by this user
-    completed_goals = GoalOutcome.objects.filter(
-        goal__user=user,
-        completed=True
-    ).count()
-
-    # Determine weekly streak: consecutive ISO weeks
-    # with at least one study session
-    sessions = (
-        StudySession.objects
-        .filter(user=user)
-        .values_list("started_at", flat=True)
-    )
-
-    weeks_with_study = set()
-    for dt in sessions:
-        d = dt.date()
-        year, week, _ = d.isocalendar()
-        weeks_with_study.add((year, week))
-
-    streak = 0
-    if weeks_with_study:
-        today = timezone.localdate()
-        year, week, _ = today.isocalendar()
-
-        # Walk backwards through weeks while activity continues
-        while (year, week) in weeks_with_study:
-            streak += 1
-            week -= 1
-            if week == 0:
-                year -= 1
-                # Handle ISO week rollover at new year
-                week = date(year, 12, 28).isocalendar()[1]
-
-    return {
-        "total_minutes": total_minutes,
-        "completed_goals": completed_goals,
-        "weekly_streak_weeks": streak,
-    }
+    return collect_metrics(user, achievements)
 
 
 def is_eligible(achievement, stats):
     """
     Determine if a user qualifies for a specific achievement.
 
-    Compares the user’s statistics (from `get_user_stats`) to the
-    achievement’s rule type and parameters to see if they meet
-    the conditions required to unlock it.
-
-    Supported rule types:
-        - "total_hours": unlocks after total study hours >= threshold.
-        - "goals_completed": unlocks after completed goals >= threshold.
-        - "weekly_streak": unlocks after maintaining a streak >= weeks target.
+    Looks up the achievement's rule type in the rule registry and
+    compares the rule's metric from `stats` with its target.
 
     Args:
         achievement (Achievement): The achievement to evaluate.
-        stats (dict): A dictionary of user statistics from `get_user_stats()`.
+        stats (dict): Statistics from `get_user_stats()`, including the
+        achievement's metric.
 
     Returns:
         bool: True if the user meets or exceeds the achievement criteria,
-        False otherwise.
+        False otherwise (including unknown rule types).
+    """
+    rule = get_rule(achievement.rule_type)
+    if rule is None:
+        return False
+    return rule.is_met(achievement.rule_params or {}, stats)
+
+
+def mark_watermarks_stale(users=None):
+    """
+    Force the next evaluation for the given users to run in full.
+
+    Args:
+        users (QuerySet | list | None): Users (or user ids) to mark. If None,
+            every watermark is marked, e.g. after an Achievement catalog
+            change.
+
+    Returns:
+        int: Number of watermark rows marked stale.
     """
-    p = achievement.rule_params or {}
+    qs = AchievementWatermark.objects.filter(stale=False)
+    if users is not None:
+        qs = qs.filter(user__in=users)
+    return qs.update(stale=True)
 
-    if achievement.rule_type == "total_hours":
-        threshold_hours = p.get("threshold", 0)
-        return stats["total_minutes"] >= threshold_hours * 60
 
-    if achievement.rule_type == "goals_completed":
-        threshold = p.get("threshold", 0)
-        return stats["completed_goals"] >= threshold
+def record_session_logged(session):
+    """
+    Fold a newly logged session into the user's watermark counters.
 
-    if achievement.rule_type == "weekly_streak":
-        needed_weeks = p.get("weeks", 0)
-        return stats["weekly_streak_weeks"] >= needed_weeks
+    Sessions in the current week add their minutes and count and extend
+    (or restart) the streak with a single UPDATE. Backdated or future
+    sessions can join or split streaks in ways a counter cannot follow, so
+    they mark the watermark stale instead.
 
-    # Unknown or unsupported rule types default to False
-    return False
+    Args:
+        session (StudySession): The session that was just created.
+    """
+    watermarks = AchievementWatermark.objects.filter(user_id=session.user_id)
+    this_week = _monday_of(timezone.localdate())
+
+    if _monday_of(session.study_date) != this_week:
+        watermarks.update(stale=True)
+        return
+
+    watermarks.update(
+        total_minutes=F("total_minutes") + session.duration_minutes,
+        total_sessions=F("total_sessions") + 1,
+        streak_weeks=Case(
+            When(active_week=this_week, then=F("streak_weeks")),
+            When(
+                active_week=this_week - timedelta(days=7),
+                then=F("streak_weeks") + 1,
+            ),
+            default=Value(1),
+        ),
+        active_week=this_week,
+    )
+
+
+def _lowest(current, candidate):
+    """Return the smaller of two thresholds, treating None as unset."""
+    return candidate if current is None else min(current, candidate)
+
+
+def _store_watermark(watermark, stats, owned_codes, achievements):
+    """
+    Save the lowest next-unlock threshold for each watermark field.
+
+    Each pending achievement's rule names the field and threshold that
+    signal it may have become met.
+
+    Args:
+        watermark (AchievementWatermark): The user's (locked) watermark.
+        stats (dict): Stats from `get_user_stats`.
+        owned_codes (set[str]): Codes the user has now been awarded.
+        achievements (list[Achievement]): The full achievement catalog.
+    """
+    thresholds = {
+        "next_total_minutes": None,
+        "next_total_sessions": None,
+        "next_completed_goals": None,
+        "next_streak_weeks": None,
+    }
+
+    for achievement in achievements:
+        rule = get_rule(achievement.rule_type)
+        if achievement.code in owned_codes or rule is None:
+            continue
+        field, needed = rule.watermark(achievement.rule_params or {}, stats)
+        thresholds[field] = _lowest(thresholds[field], needed)
+
+    watermark.total_minutes = stats["total_minutes"]
+    watermark.total_sessions = stats["total_sessions"]
+    watermark.active_week = stats["last_active_week"]
+    watermark.streak_weeks = stats["last_active_streak_weeks"]
+    for field, value in thresholds.items():
+        setattr(watermark, field, value)
+    watermark.stale = False
+    watermark.save()
 
 
 def evaluate_achievements_for_user(user):
     """
     Evaluate all achievements for a user and award any newly earned ones.
 
-    This function checks every Achievement in the system and determines
-    whether the given user qualifies for it based on their current stats.
-    Any newly earned achievements are recorded in UserAchievement.
+    Fast path: the user's AchievementWatermark is read and, unless it is
+    stale or one of its counters has reached the next unlock threshold,
+    nothing else is queried. Otherwise the watermark row is locked for the
+    rest of the evaluation, so concurrent evaluations of the same user run
+    one after the other and each sees the awards of the one before. Every
+    Achievement the user does not own is checked against the metrics its
+    rule declares (all computed in one statement), newly earned
+    achievements are inserted with a single
+    `bulk_create(ignore_conflicts=True)` and read back with one query, and
+    the watermark is rebuilt.
 
     The function is **idempotent** — calling it multiple times will not
     create duplicate entries for the same achievement.
@@ -140,27 +196,58 @@ def evaluate_achievements_for_user(user):
         instances
         (empty if the user earned none this round).
     """
-    stats = get_user_stats(user)
-
-    # Get all achievement codes the user already owns
-    already_have = set(
-        UserAchievement.objects.filter(user=user)
-        .values_list("achievement__code", flat=True)
-    )
+    watermark = AchievementWatermark.objects.filter(user=user).first()
+    if (
+        watermark is not None
+        and not watermark.stale
+        and not watermark.is_crossed(_monday_of(timezone.localdate()))
+    ):
+        return []
 
     new_awards = []
+    with transaction.atomic():
+        if watermark is None:
+            AchievementWatermark.objects.get_or_create(user=user)
+        # Serialises evaluations of this user until the commit
+        watermark = (
+            AchievementWatermark.objects.select_for_update().get(user=user)
+        )
+
+        # Get all achievement codes the user already owns
+        already_have = set(
+            UserAchievement.objects.filter(user=user)
+            .values_list("achievement__code", flat=True)
+        )
+
+        achievements = list(Achievement.objects.all())
+        pending = [a for a in achievements if a.code not in already_have]
+
+        # One statement computes the metrics of every pending achievement
+        stats = get_user_stats(user, pending)
+
+        # Write every newly earned award in one statement
+        earned = [a for a in pending if is_eligible(a, stats)]
+        if earned:
+            UserAchievement.objects.bulk_create(
+                [UserAchievement(user=user, achievement=a) for a in earned],
+                ignore_conflicts=True,
+            )
+            new_awards = list(
+                UserAchievement.objects.filter(
+                    user=user, achievement__in=earned
+                )
+                .select_related("achievement")
+                .order_by("achievement_id")
+            )
+            already_have.update(a.code for a in earned)
 
-    # Check each achievement and create new ones if eligible
-    for achievement in Achievement.objects.all():
-        if achievement.code in already_have:
-            continue
+        _store_watermark(watermark, stats, already_have, achievements)
 
-        if is_eligible(achievement, stats):
-            ua, created = UserAchievement.objects.get_or_create(
-                user=user,
-                achievement=achievement,
-            )
-            if created:
-                new_awards.append(ua)
+    if new_awards:
+        awards_bulk_created.send(
+            sender=UserAchievement,
+            achievements=[ua.achievement for ua in new_awards],
+            user_ids=[user.pk],
+        )
 
     return new_awards
@@ -0,0 +1,68 @@
+"""Signal receivers keeping achievement watermarks in step with writes.
+
+Connected in AchievementsConfig.ready().
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from goals.models import GoalOutcome
+from goals.signals import outcomes_frozen
+from study_sessions.models import StudySession
+
+from .models import Achievement
+from .services import mark_watermarks_stale, record_session_logged
+from .streaks import record_session_deleted, record_session_saved
+
+
+@receiver(post_save, sender=StudySession)
+def session_saved(sender, instance, created, **kwargs):
+    """
+    Update the streak record and watermark for a saved session.
+
+    New sessions are added to the watermark; edits force a full evaluation.
+    """
+    record_session_saved(instance, created)
+    if created:
+        record_session_logged(instance)
+    else:
+        mark_watermarks_stale([instance.user_id])
+
+
+@receiver(post_delete, sender=StudySession)
+def session_deleted(sender, instance, **kwargs):
+    """
+    Clear the session's week from the streak if it is now empty.
+
+    Deleted sessions shrink counters, so also force a full evaluation.
+    """
+    record_session_deleted(instance)
+    mark_watermarks_stale([instance.user_id])
+
+
+@receiver(post_save, sender=GoalOutcome)
+def outcome_saved(sender, instance, **kwargs):
+    """A completed outcome may unlock a goals_completed achievement."""
+    if instance.completed and instance.is_final:
+        mark_watermarks_stale(
+            GoalOutcome.objects
+            .filter(pk=instance.pk)
+            .values("goal__user_id")
+        )
+
+
+@receiver(outcomes_frozen)
+def week_frozen(sender, week_start, goals, **kwargs):
+    """Mark users who completed a goal in the frozen week."""
+    mark_watermarks_stale(
+        GoalOutcome.objects
+        .filter(week_start=week_start, completed=True, goal__in=goals)
+        .values("goal__user_id")
+    )
+
+
+@receiver(post_save, sender=Achievement)
+@receiver(post_delete, sender=Achievement)
+def catalog_changed(sender, **kwargs):
+    """Any catalog change invalidates every user's next-unlock thresholds."""
+    mark_watermarks_stale()
@@ -0,0 +1,309 @@
+"""Incremental weekly-streak tracking backed by UserStreak.
+
+Each user's active ISO weeks are kept as a bitmap on UserStreak together
+with the latest active week, the run ending there and the longest run.
+Session writes flip single bits and adjust those counters, so reading a
+streak never scans the user's sessions. `rebuild_user_streak` recomputes
+the record from history (used lazily and by `manage.py rebuild_streaks`).
+Weeks before the bitmap's epoch, which form and model validation reject,
+are ignored.
+"""
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models.functions import TruncWeek
+from django.db.models import DateField
+from django.utils import timezone
+
+from study_sessions.models import StudySession
+
+from .models import UserStreak
+
+EPOCH = UserStreak.EPOCH_MONDAY
+
+
+# ---------- Bitmap helpers ----------
+def _index(week):
+    """Return the bit index for a Monday."""
+    return (week - EPOCH).days // 7
+
+
+def _week(index):
+    """Return the Monday for a bit index."""
+    return EPOCH + timedelta(weeks=index)
+
+
+def _load(streak):
+    """Return the streak's bitmap as an int."""
+    return int.from_bytes(bytes(streak.active_weeks), "little")
+
+
+def _dump(bits):
+    """Return an int bitmap as little-endian bytes."""
+    return bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+
+
+def _is_set(bits, index):
+    """Return True if the bit at index is set."""
+    return index >= 0 and bool(bits >> index & 1)
+
+
+def _run_ending_at(bits, index):
+    """Count consecutive set bits walking down from index."""
+    run = 0
+    while _is_set(bits, index):
+        run += 1
+        index -= 1
+    return run
+
+
+def _longest_run(bits):
+    """Return the length of the longest run of set bits."""
+    run = 0
+    while bits:
+        bits &= bits >> 1
+        run += 1
+    return run
+
+
+def _highest_at_or_below(bits, index):
+    """Return the highest set bit index <= index, or -1."""
+    if index < 0:
+        return -1
+    return (bits & ((1 << (index + 1)) - 1)).bit_length() - 1
+
+
+def _apply(streak, bits):
+    """Store a bitmap and refresh the derived counters from it."""
+    streak.active_weeks = _dump(bits)
+    if bits:
+        top = bits.bit_length() - 1
+        streak.last_week = _week(top)
+        streak.last_run_weeks = _run_ending_at(bits, top)
+    else:
+        streak.last_week = None
+        streak.last_run_weeks = 0
+
+
+# ---------- Week helpers ----------
+def week_of(study_date):
+    """
+    Return the Monday of the ISO week a session's local date falls in.
+
+    Args:
+        study_date (date): The session's local study date.
+
+    Returns:
+        date: Monday of that week.
+    """
+    return study_date - timedelta(days=study_date.weekday())
+
+
+def _week_has_sessions(user_id, week):
+    """Return True if the user still has a session in the given week."""
+    return StudySession.objects.filter(
+        user_id=user_id,
+        study_date__gte=week,
+        study_date__lt=week + timedelta(days=7),
+    ).exists()
+
+
+# ---------- Rebuild ----------
+def compute_streak_from_history(user_id):
+    """
+    Build an unsaved UserStreak for a user from their sessions.
+
+    Only the distinct active weeks are fetched from the database.
+
+    Args:
+        user_id (int): The user's primary key.
+
+    Returns:
+        UserStreak: An unsaved instance with every field populated.
+    """
+    weeks = (
+        StudySession.objects
+        .filter(user_id=user_id, study_date__gte=EPOCH)
+        .annotate(week=TruncWeek("study_date", output_field=DateField()))
+        .values_list("week", flat=True)
+        .order_by()
+        .distinct()
+    )
+    bits = 0
+    for week in weeks:
+        bits |= 1 << _index(week)
+
+    streak = UserStreak(user_id=user_id)
+    _apply(streak, bits)
+    streak.longest_weeks = _longest_run(bits)
+    return streak
+
+
+def rebuild_user_streak(user_id):
+    """
+    Recompute and persist a user's UserStreak from their session history.
+
+    Args:
+        user_id (int): The user's primary key.
+
+    Returns:
+        UserStreak: The saved record.
+    """
+    fresh = compute_streak_from_history(user_id)
+    streak, _ = UserStreak.objects.update_or_create(
+        user_id=user_id,
+        defaults={
+            "active_weeks": fresh.active_weeks,
+            "last_week": fresh.last_week,
+            "last_run_weeks": fresh.last_run_weeks,
+            "longest_weeks": fresh.longest_weeks,
+        },
+    )
+    return streak
+
+
+# ---------- Incremental updates ----------
+def add_active_week(user_id, week):
+    """
+    Mark a week as active for a user, extending runs as needed.
+
+    Args:
+        user_id (int): The user's primary key.
+        week (date): Monday of the week that gained a session.
+    """
+    with transaction.atomic():
+        streak = (
+            UserStreak.objects.select_for_update()
+            .filter(user_id=user_id).first()
+        )
+        if streak is None:
+            rebuild_user_streak(user_id)
+            return
+
+        bits = _load(streak)
+        index = _index(week)
+        if index < 0 or _is_set(bits, index):
+            return
+
+        bits |= 1 << index
+
+        # Length of the run the new week joined (below + above it)
+        run = _run_ending_at(bits, index)
+        after = index + 1
+        while _is_set(bits, after):
+            run += 1
+            after += 1
+
+        _apply(streak, bits)
+        streak.longest_weeks = max(streak.longest_weeks, run)
+        streak.save()
+
+
+def remove_active_week(user_id, week):
+    """
+    Clear a week for a user if none of their sessions remain in it.
+
+    Args:
+        user_id (int): The user's primary key.
+        week (date): Monday of the week that lost a session.
+    """
+    if _week_has_sessions(user_id, week):
+        return
+
+    with transaction.atomic():
+        streak = (
+            UserStreak.objects.select_for_update()
+            .filter(user_id=user_id).first()
+        )
+        if streak is None:
+            rebuild_user_streak(user_id)
+            return
+
+        bits = _load(streak)
+        index = _index(week)
+        if not _is_set(bits, index):
+            return
+
+        bits &= ~(1 << index)
+        _apply(streak, bits)
+        streak.longest_weeks = _longest_run(bits)
+        streak.save()
+
+
+def record_session_saved(session, created):
+    """
+    Update the owner's streak after a session is created or edited.
+
+    Args:
+        session (StudySession): The saved session.
+        created (bool): Whether the session was just inserted.
+    """
+    new_week = week_of(session.study_date)
+    loaded = getattr(session, "_loaded_values", {})
+    old_date = loaded.get("study_date")
+    old_user_id = loaded.get("user_id", session.user_id)
+
+    if created or old_date is None:
+        add_active_week(session.user_id, new_week)
+        return
+
+    old_week = week_of(old_date)
+    if old_week != new_week or old_user_id != session.user_id:
+        add_active_week(session.user_id, new_week)
+        remove_active_week(old_user_id, old_week)
+
+
+def record_session_deleted(session):
+    """
+    Update the owner's streak after a session is deleted.
+
+    Args:
+        session (StudySession): The deleted session.
+    """
+    remove_active_week(session.user_id, week_of(session.study_date))
+
+
+# ---------- Reading ----------
+def streak_summary(user, today=None):
+    """
+    Return the user's streak figures without scanning sessions.
+
+    The UserStreak record is rebuilt from history the first time it is
+    needed for a user who does not have one yet.
+
+    Args:
+        user (User): The user to summarise.
+        today (date, optional): Reference date (defaults to local today).
+
+    Returns:
+        dict: With keys:
+            - "current_weeks" (int): Consecutive active weeks ending with
+            the current week (0 if the current week has no session).
+            - "longest_weeks" (int): Longest run ever.
+            - "last_active_week" (date | None): Latest active week up to
+            the current one.
+            - "last_active_weeks" (int): Run ending at last_active_week.
+    """
+    streak = UserStreak.objects.filter(user=user).first()
+    if streak is None:
+        streak = rebuild_user_streak(user.pk)
+
+    today = today or timezone.localdate()
+    this_week = today - timedelta(days=today.weekday())
+
+    if streak.last_week is None or streak.last_week <= this_week:
+        last_active, run = streak.last_week, streak.last_run_weeks
+    else:
+        # Future-dated sessions exist; find the latest week up to now
+        bits = _load(streak)
+        top = _highest_at_or_below(bits, _index(this_week))
+        last_active = _week(top) if top >= 0 else None
+        run = _run_ending_at(bits, top) if top >= 0 else 0
+
+    return {
+        "current_weeks": run if last_active == this_week else 0,
+        "longest_weeks": streak.longest_weeks,
+        "last_active_week": last_active,
+        "last_active_weeks": run,
+    }
@@ -0,0 +1,424 @@
+from datetime import datetime, timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import QuerySet
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from courses.models import Course
+from study_sessions.forms import StudySessionForm
+from study_sessions.models import StudySession
+
+from .models import (
+    Achievement,
+    AchievementWatermark,
+    UserAchievement,
+    UserStreak,
+)
+from .backfill import awards_bulk_created, backfill_achievement
+from .rules import (
+    TOTAL_MINUTES,
+    Rule,
+    collect_metrics,
+    get_rule,
+    register,
+)
+from .services import evaluate_achievements_for_user, get_user_stats
+from .views import build_progress_hint
+from .streaks import compute_streak_from_history, streak_summary
+
+
+class WatermarkEvaluationTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="star", password="pw"
+        )
+        self.course = Course.objects.create(title="Maths", owner=self.user)
+        Achievement.objects.create(
+            code="hours_1", title="1 Hour", rule_type="total_hours",
+            rule_params={"threshold": 1},
+        )
+        Achievement.objects.create(
+            code="hours_2", title="2 Hours", rule_type="total_hours",
+            rule_params={"threshold": 2},
+        )
+
+    def log(self, minutes, when=None):
+        StudySession.objects.create(
+            user=self.user,
+            course=self.course,
+            duration_minutes=minutes,
+            started_at=when or timezone.now(),
+        )
+        return evaluate_achievements_for_user(self.user)
+
+    def codes(self):
+        return set(
+            UserAchievement.objects.filter(user=self.user)
+            .values_list("achievement__code", flat=True)
+        )
+
+    def test_first_evaluation_builds_watermark(self):
+        self.log(30)
+        watermark = AchievementWatermark.objects.get(user=self.user)
+        self.assertEqual(watermark.total_minutes, 30)
+        self.assertEqual(watermark.next_total_minutes, 60)
+        self.assertFalse(watermark.stale)
+
+    def test_fast_path_is_a_single_lookup(self):
+        self.log(10)
+        StudySession.objects.create(
+            user=self.user, course=self.course,
+            duration_minutes=10, started_at=timezone.now(),
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(evaluate_achievements_for_user(self.user), [])
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+    def test_crossing_watermark_awards_and_advances(self):
+        self.log(40)
+        awards = self.log(30)
+        self.assertEqual([ua.achievement.code for ua in awards], ["hours_1"])
+        self.assertEqual(
+            AchievementWatermark.objects.get(user=self.user)
+            .next_total_minutes,
+            120,
+        )
+
+    def test_backdated_session_forces_full_evaluation(self):
+        self.log(10)
+        self.log(60, when=timezone.now() - timedelta(days=30))
+        self.assertEqual(self.codes(), {"hours_1"})
+
+    def test_catalog_change_forces_full_evaluation(self):
+        self.log(50)
+        Achievement.objects.create(
+            code="hours_half", title="Half Hour", rule_type="total_hours",
+            rule_params={"threshold": 0.5},
+        )
+        self.assertTrue(
+            AchievementWatermark.objects.get(user=self.user).stale
+        )
+        evaluate_achievements_for_user(self.user)
+        self.assertEqual(self.codes(), {"hours_half"})
+
+    def test_simultaneous_unlocks_cost_the_same(self):
+        def evaluation_queries(user, minutes):
+            StudySession.objects.create(
+                user=user, course=self.course,
+                duration_minutes=minutes, started_at=timezone.now(),
+            )
+            AchievementWatermark.objects.filter(user=user).update(stale=True)
+            with CaptureQueriesContext(connection) as ctx:
+                awards = evaluate_achievements_for_user(user)
+            return awards, len(ctx.captured_queries)
+
+        one, one_queries = evaluation_queries(self.user, 60)
+        other = get_user_model().objects.create_user(
+            username="other", password="pw"
+        )
+        both, both_queries = evaluation_queries(other, 120)
+
+        self.assertEqual([ua.achievement.code for ua in one], ["hours_1"])
+        self.assertEqual(
+            [ua.achievement.code for ua in both], ["hours_1", "hours_2"]
+        )
+        self.assertEqual(both_queries, one_queries)
+
+    def test_concurrent_awards_are_not_reported_twice(self):
+        hours_1 = Achievement.objects.get(code="hours_1")
+        real_lock = QuerySet.select_for_update
+
+        def lock_after_concurrent_award(qs, *args, **kwargs):
+            # Another evaluation awarded hours_1 while this one waited
+            if qs.model is AchievementWatermark:
+                UserAchievement.objects.get_or_create(
+                    user=self.user, achievement=hours_1
+                )
+            return real_lock(qs, *args, **kwargs)
+
+        signalled = []
+
+        def receiver(sender, achievements, **kwargs):
+            signalled.extend(a.code for a in achievements)
+
+        awards_bulk_created.connect(receiver)
+        self.addCleanup(awards_bulk_created.disconnect, receiver)
+        with patch.object(
+            QuerySet, "select_for_update", lock_after_concurrent_award
+        ):
+            awards = self.log(120)
+
+        self.assertEqual([ua.achievement.code for ua in awards], ["hours_2"])
+        self.assertEqual(signalled, ["hours_2"])
+        self.assertEqual(self.codes(), {"hours_1", "hours_2"})
+
+
+class IncrementalStreakTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="streaky", password="pw"
+        )
+        self.course = Course.objects.create(title="Art", owner=self.user)
+        self.now = timezone.now()
+
+    def log(self, weeks_ago):
+        return StudySession.objects.create(
+            user=self.user,
+            course=self.course,
+            duration_minutes=20,
+            started_at=self.now - timedelta(weeks=weeks_ago),
+        )
+
+    def assert_matches_history(self):
+        stored = UserStreak.objects.get(user=self.user)
+        fresh = compute_streak_from_history(self.user.pk)
+        self.assertEqual(bytes(stored.active_weeks), fresh.active_weeks)
+        self.assertEqual(stored.last_week, fresh.last_week)
+        self.assertEqual(stored.last_run_weeks, fresh.last_run_weeks)
+        self.assertEqual(stored.longest_weeks, fresh.longest_weeks)
+
+    def test_create_and_delete_keep_streak_in_step(self):
+        sessions = [self.log(w) for w in (6, 5, 4, 2, 1, 0, 0)]
+        summary = streak_summary(self.user)
+        self.assertEqual(summary["current_weeks"], 3)
+        self.assertEqual(summary["longest_weeks"], 3)
+        self.assert_matches_history()
+
+        # Filling the gap joins both runs
+        self.log(3)
+        self.assertEqual(streak_summary(self.user)["current_weeks"], 7)
+
+        # Removing one of two sessions in a week keeps the week active
+        sessions[-1].delete()
+        self.assertEqual(streak_summary(self.user)["current_weeks"], 7)
+
+        sessions[3].delete()
+        summary = streak_summary(self.user)
+        self.assertEqual(summary["current_weeks"], 2)
+        self.assertEqual(summary["longest_weeks"], 4)
+        self.assert_matches_history()
+
+    def test_moving_a_session_updates_both_weeks(self):
+        self.log(1)
+        session = self.log(0)
+        session.started_at = self.now - timedelta(weeks=3)
+        session.save()
+        summary = streak_summary(self.user)
+        self.assertEqual(summary["current_weeks"], 0)
+        self.assertEqual(summary["last_active_weeks"], 1)
+        self.assert_matches_history()
+
+    def test_pre_epoch_session_is_rejected_and_ignored(self):
+        old = timezone.make_aware(datetime(1969, 7, 20, 12))
+        form = StudySessionForm(
+            data={
+                "course": self.course.pk,
+                "started_at": "1969-07-20T12:00",
+                "duration_minutes": 30,
+            },
+            user=self.user,
+        )
+        self.assertIn("started_at", form.errors)
+
+        # Saved anyway (bypassing validation), it leaves the streak alone
+        self.log(0)
+        StudySession.objects.create(
+            user=self.user, course=self.course, duration_minutes=20,
+            started_at=old,
+        )
+        self.assertEqual(streak_summary(self.user)["current_weeks"], 1)
+        self.assert_matches_history()
+
+    def test_rebuild_command_reports_drift(self):
+        self.log(0)
+        UserStreak.objects.filter(user=self.user).update(longest_weeks=9)
+
+        out = StringIO()
+        call_command("rebuild_streaks", "--check", stdout=out)
+        self.assertIn("drifted: 1", out.getvalue())
+
+        call_command("rebuild_streaks", stdout=StringIO())
+        self.assert_matches_history()
+
+
+class RuleEngineTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="ruled", password="pw"
+        )
+        self.maths = Course.objects.create(title="Maths", owner=self.user)
+        self.art = Course.objects.create(title="Art", owner=self.user)
+        self.now = timezone.now()
+        for days_ago, course, minutes in [
+            (0, self.maths, 60), (0, self.art, 30),
+            (1, self.maths, 45), (20, self.art, 15),
+        ]:
+            StudySession.objects.create(
+                user=self.user,
+                course=course,
+                duration_minutes=minutes,
+                started_at=self.now - timedelta(days=days_ago),
+            )
+        self.catalog = [
+            Achievement.objects.create(
+                code=code, title=code, rule_type=rule_type,
+                rule_params=params,
+            )
+            for code, rule_type, params in [
+                ("days_3", "study_days", {"days": 3}),
+                ("days_5", "study_days", {"days": 5}),
+                ("busy_week", "sessions_in_window",
+                 {"sessions": 3, "days": 7}),
+                ("maths_fan", "course_hours", {"hours": 1.5}),
+                ("hours_3", "total_hours", {"threshold": 3}),
+            ]
+        ]
+
+    def test_incomplete_rule_fails_at_registration(self):
+        class NoHint(Rule):
+            rule_type = "no_hint"
+
+            def metric(self, params):
+                return TOTAL_MINUTES
+
+            def target(self, params):
+                return 1
+
+        with self.assertRaises(TypeError):
+            register(NoHint)
+        self.assertIsNone(get_rule("no_hint"))
+
+    def test_metrics_compile_to_one_statement(self):
+        with CaptureQueriesContext(connection) as ctx:
+            stats = get_user_stats(self.user, self.catalog)
+        # The metrics statement plus the streak record lookup
+        self.assertEqual(len(ctx.captured_queries), 2)
+        self.assertEqual(stats["study_days"], 3)
+        self.assertEqual(stats["sessions_last_7_days"], 3)
+        self.assertEqual(stats["best_course_minutes"], 105)
+        self.assertEqual(stats["total_minutes"], 150)
+
+    def test_awards_and_hints_from_rules(self):
+        awards = evaluate_achievements_for_user(self.user)
+        self.assertEqual(
+            sorted(ua.achievement.code for ua in awards),
+            ["busy_week", "days_3", "maths_fan"],
+        )
+
+        stats = collect_metrics(self.user, self.catalog)
+        self.assertEqual(
+            build_progress_hint(self.catalog[1], stats),
+            "Study on 5 different days (you’re at 3, 2 to go).",
+        )
+        self.assertEqual(
+            build_progress_hint(self.catalog[4], stats),
+            "Study 3 total hours (you’re at 2.5h, 0.5h to go).",
+        )
+
+    def test_session_rules_wake_the_watermark(self):
+        evaluate_achievements_for_user(self.user)
+        watermark = AchievementWatermark.objects.get(user=self.user)
+        self.assertEqual(watermark.next_total_minutes, 180)
+        # days_5 needs two more days, so at least two more sessions
+        self.assertEqual(watermark.next_total_sessions, 6)
+
+        for _ in range(2):
+            StudySession.objects.create(
+                user=self.user, course=self.art,
+                duration_minutes=10, started_at=self.now,
+            )
+        evaluate_achievements_for_user(self.user)
+        # Nothing new unlocks (same day), but the watermark was rebuilt
+        self.assertEqual(
+            AchievementWatermark.objects.get(user=self.user)
+            .next_total_sessions,
+            8,
+        )
+
+    def test_pending_session_rules_keep_the_fast_path(self):
+        Achievement.objects.filter(code="hours_3").delete()
+        for code, rule_type, params in [
+            ("maths_buff", "course_hours", {"hours": 5}),
+            ("busy_fortnight", "sessions_in_window",
+             {"sessions": 10, "days": 14}),
+        ]:
+            Achievement.objects.create(
+                code=code, title=code, rule_type=rule_type,
+                rule_params=params,
+            )
+        evaluate_achievements_for_user(self.user)
+
+        StudySession.objects.create(
+            user=self.user, course=self.maths,
+            duration_minutes=10, started_at=self.now,
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(evaluate_achievements_for_user(self.user), [])
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+
+class BackfillAchievementTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        now = timezone.now()
+        self.users = []
+        for i, minutes in enumerate([30, 60, 90, 0]):
+            user = User.objects.create_user(username=f"b{i}", password="pw")
+            course = Course.objects.create(title="Chess", owner=user)
+            if minutes:
+                StudySession.objects.create(
+                    user=user, course=course,
+                    duration_minutes=minutes, started_at=now,
+                )
+            self.users.append(user)
+
+    def awarded(self, achievement):
+        return set(
+            UserAchievement.objects.filter(achievement=achievement)
+            .values_list("user__username", flat=True)
+        )
+
+    def test_awards_every_eligible_user_once(self):
+        hour = Achievement.objects.create(
+            code="hours_1", title="1 Hour", rule_type="total_hours",
+            rule_params={"threshold": 1},
+        )
+        UserAchievement.objects.create(user=self.users[1], achievement=hour)
+
+        with CaptureQueriesContext(connection) as ctx:
+            result = backfill_achievement(hour, chunk_size=2)
+        self.assertEqual(result, {"eligible": 2, "awarded": 1})
+        self.assertEqual(self.awarded(hour), {"b1", "b2"})
+        # One eligibility query, then lookup and insert per chunk
+        self.assertLessEqual(len(ctx.captured_queries), 6)
+
+        self.assertEqual(
+            backfill_achievement(hour), {"eligible": 2, "awarded": 0}
+        )
+
+    def test_streak_rule_reads_streak_records(self):
+        streak = Achievement.objects.create(
+            code="streak_1", title="Streak", rule_type="weekly_streak",
+            rule_params={"weeks": 1},
+        )
+        backfill_achievement(streak)
+        self.assertEqual(self.awarded(streak), {"b0", "b1", "b2"})
+
+    def test_command(self):
+        Achievement.objects.create(
+            code="days_1", title="First Day", rule_type="study_days",
+            rule_params={"days": 1},
+        )
+        out = StringIO()
+        call_command("backfill_achievement", "days_1", "--dry-run", stdout=out)
+        self.assertIn("eligible: 3 | awarded: 0", out.getvalue())
+        self.assertFalse(UserAchievement.objects.exists())
+
+        call_command("backfill_achievement", "days_1", stdout=StringIO())
+        self.assertEqual(UserAchievement.objects.count(), 3)
@@ -2,6 +2,7 @@ from django.contrib.auth.decorators import login_required
 from django.shortcuts import render
 
 from .models import Achievement, UserAchievement
+from .rules import get_rule
 from .services import get_user_stats
 
 
@@ -16,8 +17,8 @@ def achievement_list(request):
     how close
       the user is to unlocking them.
 
-    It gathers user study statistics via `get_user_stats` and uses that data
-    to determine progress toward each achievement.
+    It gathers the metrics of every locked achievement's rule via
+    `get_user_stats` (one statement) and uses them for the progress hints.
 
     Args:
         request (HttpRequest): The HTTP request object containing user session
@@ -33,7 +34,6 @@ def achievement_list(request):
             progress hint.
     """
     user = request.user
-    stats = get_user_stats(user)
 
     user_achievements = (
         UserAchievement.objects.filter(user=user)
@@ -46,15 +46,19 @@ def achievement_list(request):
     }
 
     earned = []
-    locked = []
+    pending = []
 
-    # Split achievements into earned and locked with progress information
+    # Split achievements into earned and locked
     for ach in Achievement.objects.all():
         ua = earned_by_code.get(ach.code)
         if ua:
             earned.append((ach, ua))
         else:
-            locked.append((ach, build_progress_hint(ach, stats)))
+            pending.append(ach)
+
+    # Progress for every locked achievement comes from one stats query
+    stats = get_user_stats(user, pending)
+    locked = [(ach, build_progress_hint(ach, stats)) for ach in pending]
 
     context = {
         "earned": earned,
@@ -67,51 +71,20 @@ def build_progress_hint(achievement, stats):
     """
     Generate a user-friendly progress message for a locked achievement.
 
-    This helper function calculates how far the user has progressed toward
-    unlocking
-    a given achievement, based on their current study statistics.
-
-    It supports multiple rule types:
-        - 'total_hours': compares user's total study hours to a threshold.
-        - 'goals_completed': compares completed goals to a target number.
-        - 'weekly_streak': compares the current weekly streak to a goal
-        number of weeks.
+    The message comes from the achievement's rule in the rule registry
+    (see achievements.rules), fed with the rule's metric from `stats`.
 
     Args:
         achievement (Achievement): The achievement instance being evaluated.
-        stats (dict): A dictionary of user study stats (e.g., total_minutes,
-            completed_goals, weekly_streak_weeks).
+        stats (dict): User stats from `get_user_stats`, including the
+            achievement's metric.
 
     Returns:
         str: A readable message describing progress toward the achievement,
         or an empty string if the rule type is unrecognized.
     """
-    p = achievement.rule_params or {}
-
-    if achievement.rule_type == "total_hours":
-        threshold = p.get("threshold", 0)
-        current_hours = round(stats["total_minutes"] / 60, 1)
-        remaining = max(threshold - current_hours, 0)
-        return (
-            f"Study {threshold} total hours "
-            f"(you’re at {current_hours}h, {remaining}h to go)."
-        )
-
-    if achievement.rule_type == "goals_completed":
-        threshold = p.get("threshold", 0)
-        current = stats["completed_goals"]
-        remaining = max(threshold - current, 0)
-        return (
-            f"Complete {threshold} goals "
-            f"(you’ve completed {current}, {remaining} to go)."
-        )
-
-    if achievement.rule_type == "weekly_streak":
-        needed = p.get("weeks", 0)
-        current = stats["weekly_streak_weeks"]
-        remaining = max(needed - current, 0)
-        return (
-            f"Maintain a {needed}-week streak "
-            f"(you’re at {current} weeks, {remaining} to go)."
-        )
-    return ""
+    rule = get_rule(achievement.rule_type)
+    if rule is None:
+        return ""
+    params = achievement.rule_params or {}
+    return rule.hint(params, stats[rule.metric(params).key])
@@ -0,0 +1,116 @@
+"""Hot paths measured by the benchmark suite.
+
+Each entry in HOT_PATHS maps a name to a factory taking a BenchContext and
+returning a zero-argument callable. The callable runs the path once; the
+runner times it, counts its queries and records its peak memory.
+"""
+
+from dataclasses import dataclass
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client
+from django.urls import reverse
+
+from achievements.services import (
+    evaluate_achievements_for_user,
+    get_user_stats,
+)
+from goals.models import Goal
+from goals.services import freeze_weekly_outcomes, last_week_range
+
+
+@dataclass
+class BenchContext:
+    """
+    Data shared by the hot paths at one scale.
+
+    Attributes:
+        user (User): The user whose pages and stats are measured.
+        goal (Goal): One of the user's goals, for the detail view.
+        client (Client): A test client logged in as `user`.
+        week (tuple): (Monday, Sunday) of the week frozen by the freeze path.
+    """
+
+    user: object
+    goal: Goal
+    client: Client
+    week: tuple
+
+    @classmethod
+    def build(cls):
+        """Pick the first seeded user and log a client in as them."""
+        user = get_user_model().objects.order_by("pk").first()
+        client = Client()
+        client.force_login(user)
+        return cls(
+            user=user,
+            goal=Goal.objects.filter(user=user).order_by("pk").first(),
+            client=client,
+            week=last_week_range(),
+        )
+
+
+def _get(ctx, url, clear_cache=False):
+    """Return a callable that GETs a URL and checks for a 200."""
+    def run():
+        if clear_cache:
+            cache.clear()
+        response = ctx.client.get(url)
+        assert response.status_code == 200, (url, response.status_code)
+    return run
+
+
+def freeze(ctx):
+    """Re-freeze last week for every active goal."""
+    week_start, week_end = ctx.week
+    return lambda: freeze_weekly_outcomes(
+        week_start=week_start, week_end=week_end
+    )
+
+
+def stats(ctx):
+    """Collect the user's achievement stats."""
+    return lambda: get_user_stats(ctx.user)
+
+
+def evaluate(ctx):
+    """Evaluate the user's achievements."""
+    return lambda: evaluate_achievements_for_user(ctx.user)
+
+
+def dashboard(ctx):
+    """Render the dashboard (cached after the first run)."""
+    return _get(ctx, reverse("tracker:dashboard"))
+
+
+def dashboard_cold(ctx):
+    """Render the dashboard with an empty cache."""
+    return _get(ctx, reverse("tracker:dashboard"), clear_cache=True)
+
+
+def goal_list(ctx):
+    """Render the user's goal list."""
+    return _get(ctx, reverse("goals:list"))
+
+
+def goal_detail(ctx):
+    """Render one goal's detail page."""
+    return _get(ctx, reverse("goals:detail", args=[ctx.goal.pk]))
+
+
+def achievement_list(ctx):
+    """Render the achievements page."""
+    return _get(ctx, reverse("achievements:list"))
+
+
+HOT_PATHS = {
+    "freeze_weekly_outcomes": freeze,
+    "get_user_stats": stats,
+    "evaluate_achievements_for_user": evaluate,
+    "dashboard": dashboard,
+    "dashboard_cold": dashboard_cold,
+    "GoalListView": goal_list,
+    "GoalDetailView": goal_detail,
+    "achievement_list": achievement_list,
+}
@@ -0,0 +1,237 @@
+"""Time the service and view hot paths at several data sizes.
+
+Each scale seeds a fresh test database with `seed_scale_dataset` and runs
+every hot path in benchmarks.paths, recording the median wall time, the
+query count and the peak traced memory of one call. Results are written
+to a JSON baseline; --compare re-runs the suite and flags any metric that
+grew by more than --threshold against a saved baseline.
+
+Scale N seeds N times as many users as 1x with the same per-user history,
+so per-user paths should stay flat while global ones grow with N.
+
+Usage:
+    python -m benchmarks.run
+    python -m benchmarks.run --scales 1 10 100
+    python -m benchmarks.run --out benchmarks/out/baseline.json
+    python -m benchmarks.run --compare benchmarks/out/baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tracemalloc
+from io import StringIO
+from pathlib import Path
+from time import perf_counter
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "studystar.settings")
+
+DEFAULT_OUT = Path(__file__).resolve().parent / "out" / "baseline.json"
+METRICS = ("wall_ms", "queries", "peak_kib")
+
+#: Users seeded per unit of scale, and the per-user history they get.
+USERS_PER_SCALE = 10
+SESSIONS_PER_USER = 200
+WEEKS = 26
+
+
+def measure(func, repeats):
+    """
+    Measure one hot path.
+
+    The path is run once to warm caches and lazily built records, then
+    `repeats` times for timing, then once more under tracemalloc.
+
+    Args:
+        func (callable): Zero-argument callable running the path once.
+        repeats (int): Timed runs; the median is reported.
+
+    Returns:
+        dict: "wall_ms", "queries" and "peak_kib" for the path.
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    func()
+
+    timings = []
+    for _ in range(repeats):
+        started = perf_counter()
+        func()
+        timings.append((perf_counter() - started) * 1000)
+
+    with CaptureQueriesContext(connection) as ctx:
+        func()
+    # Read now: the next request clears the connection's query log
+    queries = len(ctx.captured_queries)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "wall_ms": round(statistics.median(timings), 3),
+        "queries": queries,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def seed(scale):
+    """Reset the database and seed it for the given scale."""
+    from django.core.cache import cache
+    from django.core.management import call_command
+
+    call_command("flush", interactive=False, verbosity=0)
+    call_command("loaddata", "achievements_initial", verbosity=0)
+    call_command(
+        "seed_scale_dataset",
+        "--users", str(USERS_PER_SCALE * scale),
+        "--sessions-per-user", str(SESSIONS_PER_USER),
+        "--weeks", str(WEEKS),
+        stdout=StringIO(),
+    )
+    cache.clear()
+
+
+def run_suite(scales, repeats, only=None):
+    """
+    Seed each scale in turn and measure every hot path.
+
+    Args:
+        scales (list[int]): Scale factors to run.
+        repeats (int): Timed runs per path.
+        only (list[str] | None): Restrict to these path names.
+
+    Returns:
+        dict: {path: {scale: metrics}}, with scales as strings for JSON.
+    """
+    from .paths import HOT_PATHS, BenchContext
+
+    names = only or list(HOT_PATHS)
+    results = {name: {} for name in names}
+    for scale in scales:
+        started = perf_counter()
+        seed(scale)
+        print(f"[{scale}x] seeded in {perf_counter() - started:.1f}s")
+
+        ctx = BenchContext.build()
+        for name in names:
+            metrics = measure(HOT_PATHS[name](ctx), repeats)
+            results[name][str(scale)] = metrics
+            print(
+                f"[{scale}x] {name:32} {metrics['wall_ms']:10.2f} ms "
+                f"{metrics['queries']:5} queries "
+                f"{metrics['peak_kib']:10.1f} KiB"
+            )
+    return results
+
+
+def compare(baseline, current, threshold, min_delta_ms=1.0):
+    """
+    List metrics that regressed against a baseline.
+
+    Wall time and memory are flagged when they grow by more than
+    `threshold` (a fraction); query counts are flagged on any increase.
+    Wall time must also grow by at least `min_delta_ms`, so jitter on
+    sub-millisecond paths is not reported.
+
+    Args:
+        baseline (dict): Results from a saved run.
+        current (dict): Results from this run.
+        threshold (float): Allowed relative growth, e.g. 0.2 for 20%.
+        min_delta_ms (float): Smallest wall-time increase worth flagging.
+
+    Returns:
+        list[str]: One line per regression.
+    """
+    regressions = []
+    for name, scales in current.items():
+        for scale, metrics in scales.items():
+            before = baseline.get(name, {}).get(scale)
+            if before is None:
+                continue
+            for metric in METRICS:
+                old, new = before[metric], metrics[metric]
+                if metric == "queries":
+                    limit = old
+                elif metric == "wall_ms":
+                    limit = max(old * (1 + threshold), old + min_delta_ms)
+                else:
+                    limit = old * (1 + threshold)
+                if new > limit:
+                    regressions.append(
+                        f"{name} @ {scale}x: {metric} {old} -> {new}"
+                    )
+    return regressions
+
+
+def main(argv=None):
+    """Parse arguments, run the suite and write or compare the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scales", type=int, nargs="+", default=[1, 10, 100]
+    )
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--only", nargs="+", help="Hot path names to run.")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT)
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        help="Baseline JSON to compare against instead of writing one.",
+    )
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--min-delta-ms", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    django.setup()
+    from django.db import connection
+    from django.test.utils import (
+        setup_test_environment,
+        teardown_test_environment,
+    )
+
+    setup_test_environment(debug=False)
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        results = run_suite(args.scales, args.repeats, args.only)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())["results"]
+        regressions = compare(
+            baseline, results, args.threshold, args.min_delta_ms
+        )
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+        return 1 if regressions else 0
+
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps({
+        "meta": {
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "repeats": args.repeats,
+            "users_per_scale": USERS_PER_SCALE,
+            "sessions_per_user": SESSIONS_PER_USER,
+            "weeks": WEEKS,
+        },
+        "results": results,
+    }, indent=2))
+    print(f"Wrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.25 on 2026-10-17 16:00
+
+from django.db import migrations, models
+
+
+def dedupe_slugs(apps, schema_editor):
+    """Re-slug any courses that share an (owner, slug) before constraining."""
+    Course = apps.get_model("courses", "Course")
+    seen = set()
+    for course in Course.objects.order_by("owner_id", "pk").iterator():
+        key = (course.owner_id, course.slug)
+        if key in seen:
+            base, i = course.slug or "course", 2
+            while (course.owner_id, f"{base}-{i}") in seen or (
+                Course.objects.filter(
+                    owner_id=course.owner_id, slug=f"{base}-{i}"
+                ).exists()
+            ):
+                i += 1
+            course.slug = f"{base}-{i}"
+            course.save(update_fields=["slug"])
+        seen.add((course.owner_id, course.slug))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0002_alter_course_colour_alter_course_slug'),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_slugs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='course',
+            constraint=models.UniqueConstraint(fields=('owner', 'slug'), name='uniq_owner_slug_per_course'),
+        ),
+    ]
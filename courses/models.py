@@ -1,11 +1,15 @@
 """Course models and enums for StudyStar.
 
 Defines the Course model, its status/colour choices, and helper methods
-for validation, URL generation, and active-state checks.
+for validation, per-owner slug allocation, URL generation, and
+active-state checks.
 """
 
+from collections import defaultdict
+
 from django.conf import settings
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Q
 from django.utils.text import slugify
 from django.urls import reverse
 from django.core.exceptions import ValidationError
@@ -30,6 +34,42 @@ class CourseColour(models.TextChoices):
     NONE = "", "No colour"
 
 
+#: Attempts at saving with a freshly allocated slug before giving up.
+SLUG_SAVE_ATTEMPTS = 5
+
+
+def slug_base(title):
+    """
+    Return the slug stem for a course title.
+
+    Args:
+        title (str): The course title.
+
+    Returns:
+        str: The slugified title, truncated to leave room for a suffix.
+    """
+    return slugify(title)[:120] or "course"
+
+
+def next_free_slug(base, taken):
+    """
+    Return `base`, or `base-N` with the lowest N >= 2 not already taken.
+
+    Args:
+        base (str): Slug stem from `slug_base`.
+        taken (set[str]): Slugs already used by the owner.
+
+    Returns:
+        str: A slug not in `taken`.
+    """
+    if base not in taken:
+        return base
+    i = 2
+    while f"{base}-{i}" in taken:
+        i += 1
+    return f"{base}-{i}"
+
+
 class Course(models.Model):
     """
     Represents a user-owned course with optional dates, status, and colour.
@@ -126,6 +166,9 @@ class Course(models.Model):
             models.UniqueConstraint(
                 fields=["owner", "title"], name="uniq_owner_title_per_course"
             ),
+            models.UniqueConstraint(
+                fields=["owner", "slug"], name="uniq_owner_slug_per_course"
+            ),
         ]
 
     def __str__(self):
@@ -162,19 +205,66 @@ class Course(models.Model):
         Persist the course, auto-generating a unique slug per owner if missing.
 
         Slug is derived from the title (URL-safe) and made unique by appending
-        an incrementing suffix (-2, -3, …) if a clash exists for the same
-        owner.
+        the lowest free suffix (-2, -3, …) for the same owner. All clashing
+        slugs are fetched in one query; if a concurrent save takes the slug
+        first, the unique (owner, slug) constraint rejects this one and the
+        slug is allocated again.
+        """
+        if self.slug:
+            super().save(*args, **kwargs)
+            return
+
+        base = slug_base(self.title)
+        for attempt in range(SLUG_SAVE_ATTEMPTS):
+            taken = set(
+                Course.objects
+                .filter(owner_id=self.owner_id)
+                .filter(Q(slug=base) | Q(slug__startswith=f"{base}-"))
+                .exclude(pk=self.pk)
+                .values_list("slug", flat=True)
+            )
+            self.slug = next_free_slug(base, taken)
+            try:
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+                return
+            except IntegrityError:
+                clashed = Course.objects.filter(
+                    owner_id=self.owner_id, slug=self.slug
+                ).exclude(pk=self.pk).exists()
+                self.slug = ""
+                if not clashed or attempt == SLUG_SAVE_ATTEMPTS - 1:
+                    raise
+
+    @classmethod
+    def assign_slugs(cls, courses):
+        """
+        Give unsaved courses unique slugs in one query, for bulk_create.
+
+        Slugs are allocated against every existing slug of the courses'
+        owners and against each other. Courses that already have a slug
+        keep it.
+
+        Args:
+            courses (list[Course]): Unsaved courses with owner_id and title.
+
+        Returns:
+            list[Course]: The same courses, with slug set.
         """
-        if not self.slug:
-            base = slugify(self.title)[:120]
-            self.slug = base
-            i = 2
-            while Course.objects.filter(
-                owner=self.owner, slug=self.slug
-            ).exclude(pk=self.pk).exists():
-                self.slug = f"{base}-{i}"
-                i += 1
-        super().save(*args, **kwargs)
+        owners = {c.owner_id for c in courses if not c.slug}
+        taken = defaultdict(set)
+        for owner_id, slug in cls.objects.filter(
+            owner_id__in=owners
+        ).values_list("owner_id", "slug"):
+            taken[owner_id].add(slug)
+
+        for course in courses:
+            if not course.slug:
+                course.slug = next_free_slug(
+                    slug_base(course.title), taken[course.owner_id]
+                )
+            taken[course.owner_id].add(course.slug)
+        return courses
 
     def is_active(self):
         """
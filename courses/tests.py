@@ -0,0 +1,71 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from .models import Course, next_free_slug
+
+
+class CourseSlugTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="slugs", password="pw"
+        )
+
+    def create(self, title, owner=None):
+        return Course.objects.create(title=title, owner=owner or self.user)
+
+    def test_clashing_titles_get_lowest_free_suffix(self):
+        slugs = [self.create(t).slug for t in ("Maths", "Maths!", "Maths?")]
+        self.assertEqual(slugs, ["maths", "maths-2", "maths-3"])
+
+        Course.objects.get(slug="maths-2").delete()
+        self.assertEqual(self.create("Maths.").slug, "maths-2")
+
+        other = get_user_model().objects.create_user(
+            username="other", password="pw"
+        )
+        self.assertEqual(self.create("Maths", owner=other).slug, "maths")
+
+    def test_slug_lookup_is_one_query_however_many_clash(self):
+        for i in range(5):
+            self.create("Art" + "!" * i)
+        with CaptureQueriesContext(connection) as ctx:
+            course = self.create("Art" + "!" * 5)
+        self.assertEqual(course.slug, "art-6")
+        selects = [
+            q for q in ctx.captured_queries
+            if q["sql"].startswith("SELECT")
+        ]
+        self.assertEqual(len(selects), 1)
+
+    def test_concurrent_clash_is_retried(self):
+        self.create("Music")
+        # First allocation ignores the existing slug, as if another
+        # request had created it after our lookup
+        stale = ["music"]
+
+        def allocate(base, taken):
+            return stale.pop() if stale else next_free_slug(base, taken)
+
+        with mock.patch("courses.models.next_free_slug", allocate):
+            course = self.create("Music!")
+        self.assertEqual(course.slug, "music-2")
+
+    def test_title_clash_is_not_retried(self):
+        self.create("Drama")
+        with self.assertRaises(IntegrityError):
+            self.create("Drama")
+
+    def test_assign_slugs_for_bulk_create(self):
+        self.create("Physics")
+        courses = Course.assign_slugs([
+            Course(title=t, owner=self.user)
+            for t in ("Physics!", "Physics?", "Biology")
+        ])
+        self.assertEqual(
+            [c.slug for c in courses], ["physics-2", "physics-3", "biology"]
+        )
+        Course.objects.bulk_create(courses)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class GoalsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'goals'
+
+    def ready(self):
+        """Connect the receivers that keep outcomes up to date."""
+        from . import receivers  # noqa: F401
@@ -0,0 +1,254 @@
+"""Incremental re-freezing of outcomes made stale by late edits.
+
+A GoalOutcome is a snapshot of a finished week. It goes stale when a
+session is backdated into, moved out of or deleted from that week, or
+when the goal's weekly targets change. Instead of re-running a whole
+freeze, these writes queue the affected (goal, week) pairs as
+DirtyOutcome rows (receivers in goals.receivers), and
+`refreeze_dirty_outcomes` recomputes only those outcomes, a batch at a
+time with one grouped aggregate per batch.
+
+Only weeks before the owner's current one (in their time zone) are
+queued: the in-progress week's provisional outcome is kept current by
+goals.provisional, and the freeze finalises it.
+"""
+
+from datetime import timedelta
+
+from django.db import models, transaction
+from django.db.models import Q
+from django.db.models.functions import TruncWeek
+from django.utils import timezone
+
+from study_sessions.models import DailyStudyRollup
+
+from .models import DirtyOutcome, Goal, GoalOutcome
+from .provisional import current_week
+from .services import (
+    FREEZE_CHUNK_SIZE,
+    OUTCOME_UPDATE_FIELDS,
+    _monday_of_week,
+    _sunday_of_week,
+    build_outcome_data,
+    refresh_monthly_rollups,
+)
+from .signals import outcomes_frozen
+
+
+def mark_dirty(pairs, user):
+    """
+    Queue (goal_id, week_start) pairs for a re-freeze.
+
+    Pairs already queued get a fresh `marked_at`. Pairs for the owner's
+    current or a future week are ignored.
+
+    Args:
+        pairs (Iterable[tuple[int, date]]): Goal ids and Mondays.
+        user (User): Owner of the goals, whose time zone decides which
+        week is current.
+
+    Returns:
+        int: Number of pairs queued.
+    """
+    this_week = current_week(user)
+    rows = [
+        DirtyOutcome(goal_id=goal_id, week_start=week_start)
+        for goal_id, week_start in set(pairs)
+        if goal_id is not None and week_start < this_week
+    ]
+    DirtyOutcome.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["goal", "week_start"],
+        update_fields=["marked_at"],
+    )
+    return len(rows)
+
+
+def record_session_saved(session, created):
+    """
+    Queue the weeks a created or edited session affects.
+
+    For an edit, both the week and goal the session was loaded with and
+    its current ones are queued, but only if something that feeds an
+    outcome changed.
+
+    Args:
+        session (StudySession): The saved session.
+        created (bool): Whether the session was just inserted.
+    """
+    pairs = {(session.goal_id, _monday_of_week(session.study_date))}
+    loaded = getattr(session, "_loaded_values", None)
+    if not created and loaded and loaded.get("study_date"):
+        old = (loaded["goal_id"], _monday_of_week(loaded["study_date"]))
+        if (
+            old in pairs
+            and loaded["duration_minutes"] == session.duration_minutes
+        ):
+            return
+        pairs.add(old)
+    mark_dirty(pairs, session.user)
+
+
+def record_session_deleted(session):
+    """Queue the week a deleted session was counted in."""
+    mark_dirty(
+        [(session.goal_id, _monday_of_week(session.study_date))],
+        session.user,
+    )
+
+
+def record_goal_saved(goal, update_fields=None):
+    """
+    Queue the goal's outcomes whose stored targets no longer match.
+
+    Args:
+        goal (Goal): The saved goal.
+        update_fields (Iterable[str] | None): Fields passed to save(), if
+        any; saves that cannot touch the targets are skipped.
+    """
+    targets = {"weekly_hours_target", "weekly_lessons_target"}
+    if update_fields is not None and not targets & set(update_fields):
+        return
+    stale = (
+        GoalOutcome.objects.filter(goal=goal)
+        .exclude(
+            hours_target=goal.weekly_hours_target,
+            lessons_target=goal.weekly_lessons_target,
+        )
+        .values_list("week_start", flat=True)
+    )
+    mark_dirty(((goal.pk, week_start) for week_start in stale), goal.user)
+
+
+def _pair_filter(pairs, week_field, span=False):
+    """OR together one condition per week covering its queued goals."""
+    goals_by_week = {}
+    for goal_id, week_start in pairs:
+        goals_by_week.setdefault(week_start, []).append(goal_id)
+    condition = Q()
+    for week_start, goal_ids in goals_by_week.items():
+        week = (
+            {f"{week_field}__gte": week_start,
+             f"{week_field}__lte": _sunday_of_week(week_start)}
+            if span else {week_field: week_start}
+        )
+        condition |= Q(goal_id__in=goal_ids, **week)
+    return condition
+
+
+def refreeze_dirty_outcomes(batch_size=FREEZE_CHUNK_SIZE):
+    """
+    Recompute the queued outcomes, a batch of queue rows at a time.
+
+    Each batch costs a fixed number of queries however many goals and
+    weeks it covers: the existing outcomes (with their goals' targets),
+    one aggregate over DailyStudyRollup grouped by (goal_id, week), one
+    upsert, a refresh of the affected users' monthly rollups, and the
+    removal of the batch's queue rows. Pairs without a final outcome
+    (weeks not frozen yet, or before the goal existed) are dropped from
+    the queue without creating one; provisional rows are kept current by
+    goals.provisional and finalised by the freeze. Rows marked again
+    after the run started are left for the next run.
+
+    Args:
+        batch_size (int): Queue rows processed per batch.
+
+    Returns:
+        dict: A summary with keys:
+            - "refrozen" (int): Outcomes rewritten.
+            - "cleared" (int): Queue rows removed.
+    """
+    started = timezone.now()
+    queue = DirtyOutcome.objects.filter(marked_at__lte=started)
+    refrozen, cleared, last_pk = 0, 0, 0
+
+    while True:
+        batch = list(
+            queue.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values_list("pk", "goal_id", "week_start")[:batch_size]
+        )
+        if not batch:
+            break
+        last_pk = batch[-1][0]
+        pairs = {(goal_id, week_start) for _, goal_id, week_start in batch}
+
+        outcomes = list(
+            GoalOutcome.objects.filter(
+                _pair_filter(pairs, "week_start"), is_final=True
+            )
+            .select_related("goal")
+            .only(
+                "goal_id",
+                "week_start",
+                "goal__user",
+                "goal__weekly_hours_target",
+                "goal__weekly_lessons_target",
+            )
+        )
+        if outcomes:
+            refrozen += _refreeze(outcomes, batch_size)
+
+        cleared += queue.filter(pk__in=[row[0] for row in batch]).delete()[0]
+
+    return {"refrozen": refrozen, "cleared": cleared}
+
+
+def _refreeze(outcomes, chunk_size):
+    """Rewrite existing outcomes from the rollups; return how many."""
+    pairs = {(o.goal_id, o.week_start) for o in outcomes}
+    totals = {
+        (row["goal_id"], row["week"]): (row["total"], row["sessions"])
+        for row in (
+            DailyStudyRollup.objects
+            .filter(_pair_filter(pairs, "day", span=True))
+            .annotate(week=TruncWeek("day", output_field=models.DateField()))
+            .values("goal_id", "week")
+            .annotate(
+                total=models.Sum("minutes"),
+                sessions=models.Sum("session_count"),
+            )
+            .order_by()
+        )
+    }
+
+    rows = []
+    for outcome in outcomes:
+        total_minutes, lessons_count = totals.get(
+            (outcome.goal_id, outcome.week_start), (0, 0)
+        )
+        rows.append(GoalOutcome(
+            goal_id=outcome.goal_id,
+            week_start=outcome.week_start,
+            **build_outcome_data(
+                outcome.goal, total_minutes or 0, lessons_count or 0,
+                _sunday_of_week(outcome.week_start),
+            ),
+        ))
+
+    weeks = sorted({o.week_start for o in outcomes})
+    with transaction.atomic():
+        GoalOutcome.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["goal", "week_start"],
+            update_fields=OUTCOME_UPDATE_FIELDS,
+        )
+        refresh_monthly_rollups(
+            weeks[0],
+            weeks[-1] + timedelta(days=6),
+            chunk_size,
+            {o.goal.user_id for o in outcomes},
+        )
+
+    for week_start in weeks:
+        outcomes_frozen.send(
+            sender=GoalOutcome,
+            week_start=week_start,
+            week_end=_sunday_of_week(week_start),
+            goals=Goal.objects.filter(pk__in=[
+                goal_id for goal_id, week in pairs if week == week_start
+            ]),
+        )
+    return len(rows)
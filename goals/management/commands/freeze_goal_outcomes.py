@@ -1,5 +1,12 @@
-from django.core.management.base import BaseCommand
-from goals.services import freeze_weekly_outcomes
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from goals.services import (
+    backfill_outcomes,
+    freeze_weekly_outcomes,
+    resolve_freeze_week,
+)
+from goals.sharding import SHARD_SIZE, freeze_in_shards
 
 
 class Command(BaseCommand):
@@ -11,9 +18,20 @@ class Command(BaseCommand):
     It can be safely run manually or on a scheduled basis (e.g., via cron or
     Celery).
 
+    With --workers, goals are frozen in user-id shards on a process pool
+    (see goals.sharding). Each shard commits and is checkpointed on its own,
+    so rerunning after a crash resumes with the unfinished shards.
+
+    With --from (and optionally --to), every week in the range is frozen in
+    one pass by `backfill_outcomes()`, e.g. after importing a history.
+
     Usage:
         python manage.py freeze_goal_outcomes
         python manage.py freeze_goal_outcomes --dry-run
+        python manage.py freeze_goal_outcomes --workers 8
+        python manage.py freeze_goal_outcomes --workers 8 --restart
+        python manage.py freeze_goal_outcomes --week-start 2025-10-27
+        python manage.py freeze_goal_outcomes --from 2024-01-01 --to 2025-12-31
 
     Attributes:
         help (str): A short description shown in `python manage.py help`.
@@ -30,8 +48,25 @@ class Command(BaseCommand):
 
         Options:
             --dry-run: Run without saving changes to the database.
+            --workers (int): Freeze in resumable shards on this many
+            processes.
+            --shard-size (int): User ids per shard (default 1000).
+            --restart: Ignore this week's shard checkpoints.
+            --week-start (date): Freeze the week starting on this Monday
+            instead of last week.
+            --from (date): Backfill every week from the one containing
+            this day.
+            --to (date): Last day of the backfill (default: last week).
         """
         parser.add_argument("--dry-run", action="store_true")
+        parser.add_argument("--workers", type=int)
+        parser.add_argument("--shard-size", type=int, default=SHARD_SIZE)
+        parser.add_argument("--restart", action="store_true")
+        parser.add_argument("--week-start", type=date.fromisoformat)
+        parser.add_argument(
+            "--from", dest="date_from", type=date.fromisoformat
+        )
+        parser.add_argument("--to", dest="date_to", type=date.fromisoformat)
 
     def handle(self, *args, **opts):
         """
@@ -47,8 +82,100 @@ class Command(BaseCommand):
         Returns:
             None: Outputs results directly to the console.
         """
-        result = freeze_weekly_outcomes(dry_run=opts["dry_run"])
+        if opts["date_from"]:
+            self.handle_backfill(opts)
+            return
+        if opts["date_to"]:
+            raise CommandError("--to requires --from.")
+
+        week_start = opts["week_start"]
+        if week_start and week_start.weekday() != 0:
+            raise CommandError("--week-start must be a Monday.")
+        week_end = week_start + timedelta(days=6) if week_start else None
+
+        if opts["workers"]:
+            if opts["dry_run"]:
+                raise CommandError("--dry-run cannot be used with --workers.")
+            self.handle_sharded(opts, week_start, week_end)
+            return
+
+        result = freeze_weekly_outcomes(
+            week_start=week_start, week_end=week_end, dry_run=opts["dry_run"]
+        )
         self.stdout.write(self.style.SUCCESS(
             f"Week {result['week_start']}–{result['week_end']} | "
             f"created: {result['created']} | updated: {result['updated']}"
         ))
+
+    def handle_backfill(self, opts):
+        """
+        Freeze every week between --from and --to in one pass.
+
+        Args:
+            opts (dict): Parsed options, including 'date_from' and
+            'date_to'.
+        """
+        conflicting = [
+            flag for flag, key in (
+                ("--week-start", "week_start"),
+                ("--workers", "workers"),
+                ("--dry-run", "dry_run"),
+                ("--restart", "restart"),
+            )
+            if opts[key]
+        ]
+        if conflicting:
+            raise CommandError(
+                f"--from cannot be used with {', '.join(conflicting)}."
+            )
+        if opts["date_to"] and opts["date_to"] < opts["date_from"]:
+            raise CommandError("--to must not be before --from.")
+
+        result = backfill_outcomes(opts["date_from"], opts["date_to"])
+        if not result["weeks"]:
+            self.stdout.write("No completed weeks in range; nothing to do.")
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"Weeks {result['week_start']}–{result['week_end']} "
+            f"({result['weeks']}) | created: {result['created']} | "
+            f"updated: {result['updated']}"
+        ))
+
+    def handle_sharded(self, opts, week_start, week_end):
+        """
+        Freeze a week in checkpointed shards and report throughput.
+
+        Args:
+            opts (dict): Parsed options, including 'workers', 'shard_size'
+            and 'restart'.
+            week_start (date | None): Explicit Monday, or None for last week.
+            week_end (date | None): Matching Sunday, or None.
+        """
+        week = resolve_freeze_week(week_start, week_end)
+        if week is None:
+            self.stdout.write(
+                "Not Monday in the default time zone; nothing to do."
+            )
+            return
+
+        def report(shard):
+            goals = shard["created"] + shard["updated"]
+            rate = goals / shard["seconds"] if shard["seconds"] else 0
+            self.stdout.write(
+                f"Shard users {shard['low']}–{shard['high']} | "
+                f"goals: {goals} | {shard['seconds']:.2f}s | "
+                f"{rate:.0f} goals/s"
+            )
+
+        result = freeze_in_shards(
+            *week,
+            workers=opts["workers"],
+            shard_size=opts["shard_size"],
+            restart=opts["restart"],
+            on_shard=report,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Week {week[0]}–{week[1]} | workers: {result['workers']} | "
+            f"shards: {result['shards']} (skipped {result['skipped']}) | "
+            f"created: {result['created']} | updated: {result['updated']}"
+        ))
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+
+from goals.dirty import refreeze_dirty_outcomes
+from goals.services import FREEZE_CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    """
+    Django management command to re-freeze outcomes queued as stale.
+
+    Sessions backdated into, moved out of or deleted from a frozen week,
+    and goal target edits, queue the affected (goal, week) pairs (see
+    goals.dirty). This command recomputes only those outcomes. It also
+    runs on every `run_scheduler` tick.
+
+    Usage:
+        python manage.py refreeze_dirty_outcomes
+        python manage.py refreeze_dirty_outcomes --batch-size 2000
+
+    Attributes:
+        help (str): A short description shown in `python manage.py help`.
+    """
+
+    help = "Re-freeze goal outcomes made stale by late edits."
+
+    def add_arguments(self, parser):
+        """
+        Add optional command-line arguments.
+
+        Options:
+            --batch-size (int): Queued pairs recomputed per batch
+            (default 500).
+        """
+        parser.add_argument(
+            "--batch-size", type=int, default=FREEZE_CHUNK_SIZE
+        )
+
+    def handle(self, *args, **opts):
+        """
+        Drain the queue and print a summary.
+
+        Args:
+            *args: Positional command arguments.
+            **opts: Keyword options, including 'batch_size'.
+
+        Returns:
+            None: Outputs results directly to the console.
+        """
+        result = refreeze_dirty_outcomes(batch_size=opts["batch_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Re-froze {result['refrozen']} outcome(s) | "
+            f"queue entries cleared: {result['cleared']}"
+        ))
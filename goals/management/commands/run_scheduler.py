@@ -0,0 +1,92 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from goals.scheduler import (
+    instance_id,
+    run_dirty_refreeze,
+    run_weekly_freeze,
+)
+
+
+class Command(BaseCommand):
+    """
+    Django management command running the in-process weekly scheduler.
+
+    Every --interval seconds (plus up to --jitter seconds of random delay,
+    so instances started together do not collide), the scheduler freezes
+    each time zone cohort's weeks, from the first one missing from the
+    ledger up to the cohort's own last week, with one backfill pass per
+    cohort (see goals.scheduler). Cohorts are picked up as their Monday
+    begins, and missed Mondays are caught up on the next tick instead of
+    inside a user request. Each tick then re-freezes any outcomes queued
+    as stale by late edits (see goals.dirty). Lease rows ensure only one
+    instance does each job when several are running.
+
+    Usage:
+        python manage.py run_scheduler
+        python manage.py run_scheduler --once
+        python manage.py run_scheduler --interval 900 --jitter 120
+
+    Attributes:
+        help (str): A short description shown in `python manage.py help`.
+    """
+
+    help = "Run the weekly freeze scheduler, catching up missed weeks."
+
+    def add_arguments(self, parser):
+        """
+        Add optional command-line arguments.
+
+        Options:
+            --once: Run a single tick and exit (e.g. from cron).
+            --interval (int): Seconds between ticks (default 3600).
+            --jitter (int): Maximum random delay before each tick
+            (default 60).
+        """
+        parser.add_argument("--once", action="store_true")
+        parser.add_argument("--interval", type=int, default=3600)
+        parser.add_argument("--jitter", type=int, default=60)
+
+    def handle(self, *args, **opts):
+        """
+        Tick until interrupted (or once) and report each run.
+
+        Args:
+            *args: Positional command arguments.
+            **opts: Keyword options, including 'once', 'interval' and
+            'jitter'.
+
+        Returns:
+            None: Outputs results directly to the console.
+        """
+        owner = instance_id()
+        while True:
+            if opts["jitter"]:
+                time.sleep(random.uniform(0, opts["jitter"]))
+            self.tick(owner)
+            if opts["once"]:
+                return
+            time.sleep(opts["interval"])
+
+    def tick(self, owner):
+        """Run the weekly freeze and dirty re-freeze jobs once each."""
+        result = run_weekly_freeze(owner)
+        if result is None:
+            self.stdout.write("Another instance holds the lease; skipped.")
+        elif not result["weeks"]:
+            self.stdout.write("All weeks are frozen; nothing to do.")
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Froze {result['weeks']} week(s) for "
+                f"{', '.join(result['cohorts'])} | "
+                f"created: {result['created']} | "
+                f"updated: {result['updated']}"
+            ))
+
+        result = run_dirty_refreeze(owner)
+        if result and result["cleared"]:
+            self.stdout.write(self.style.SUCCESS(
+                f"Re-froze {result['refrozen']} stale outcome(s)."
+            ))
@@ -0,0 +1,326 @@
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from itertools import islice
+import random
+import re
+from time import perf_counter
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from achievements.services import evaluate_achievements_for_user
+from achievements.streaks import rebuild_user_streak
+from courses.models import Course
+from goals.models import Goal
+from goals.provisional import rebuild_user_provisional
+from goals.services import backfill_outcomes
+from study_sessions.models import StudySession
+from study_sessions.rollups import rebuild_rollups
+
+COURSE_TITLES = [
+    "Python Basics", "Data Structures", "Statistics", "Spanish",
+    "Calculus", "Web Development", "Machine Learning", "Music Theory",
+]
+WEEKLY_HOUR_TARGETS = [Decimal(h) for h in ("1.5", "2.0", "3.0", "5.0", "8.0")]
+
+# Relative likelihood of studying on Mon..Sun and at each hour 7..22
+WEEKDAY_WEIGHTS = [14, 15, 15, 14, 10, 16, 16]
+HOUR_WEIGHTS = [2, 3, 3, 2, 2, 3, 4, 3, 2, 3, 5, 7, 9, 9, 7, 4]
+
+# Column order of the tuples yielded by Command._sessions
+SESSION_FIELDS = [
+    "user", "course", "goal", "started_at", "study_date",
+    "duration_minutes", "notes",
+]
+
+
+class Command(BaseCommand):
+    """
+    Django management command to build a production-sized dataset.
+
+    Creates users, courses and goals with chunked `bulk_create` and study
+    sessions with chunked `executemany` inserts, then derives the tables
+    the app normally maintains incrementally: daily rollups, weekly
+    GoalOutcome snapshots (and the monthly rollups refreshed with them),
+    the current week's provisional outcomes, streaks and achievement
+    awards.
+
+    Generation is deterministic for a given --seed. Each user gets an
+    activity level, a handful of preferred weeks off and a personal session
+    length, so totals, streaks and trends vary the way real histories do.
+
+    Usage examples:
+        python manage.py seed_scale_dataset
+        python manage.py seed_scale_dataset --users 10000
+        python manage.py seed_scale_dataset --sessions-per-user 2000
+        python manage.py seed_scale_dataset --users 500 --skip-derived
+
+    Attributes:
+        help (str): Short description shown in the Django 'help' command
+        output.
+    """
+
+    help = "Seed a large synthetic dataset for load and query testing."
+
+    def add_arguments(self, parser):
+        """
+        Add command-line arguments for the size profile.
+
+        Options:
+            --users (int): Number of users to create (default 100).
+            --sessions-per-user (int): Sessions per user (default 200).
+            --courses-per-user (int): Courses (each with one goal) per user
+            (default 2).
+            --weeks (int): Weeks of history to spread sessions over
+            (default 52).
+            --seed (int): Random seed (default 42).
+            --chunk-size (int): Rows per bulk_create (default 5000).
+            --prefix (str): Username prefix (default "scale").
+            --skip-derived (bool): Only insert raw rows.
+        """
+        parser.add_argument("--users", type=int, default=100)
+        parser.add_argument("--sessions-per-user", type=int, default=200)
+        parser.add_argument("--courses-per-user", type=int, default=2)
+        parser.add_argument("--weeks", type=int, default=52)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--chunk-size", type=int, default=5000)
+        parser.add_argument("--prefix", default="scale")
+        parser.add_argument(
+            "--skip-derived",
+            action="store_true",
+            help="Skip rollups, outcomes, streaks and awards.",
+        )
+
+    def handle(self, *args, **opts):
+        """
+        Generate the dataset and print timings per stage.
+
+        Args:
+            *args: Unused positional arguments.
+            **opts: Command options parsed from the CLI.
+
+        Returns:
+            None: Outputs results directly to the console via stdout.
+        """
+        self.rng = random.Random(opts["seed"])
+        self.chunk_size = opts["chunk_size"]
+
+        today = timezone.localdate()
+        this_monday = today - timedelta(days=today.weekday())
+        first_monday = this_monday - timedelta(weeks=opts["weeks"])
+
+        started = perf_counter()
+        users = self._create_users(opts["prefix"], opts["users"])
+        goals_by_user = self._create_courses_and_goals(
+            users, opts["courses_per_user"], first_monday
+        )
+        self._report("users, courses and goals", started)
+
+        started = perf_counter()
+        sessions = self._insert_rows(
+            StudySession,
+            SESSION_FIELDS,
+            self._sessions(
+                goals_by_user,
+                opts["sessions_per_user"],
+                first_monday,
+                opts["weeks"],
+                today,
+            ),
+        )
+        self._report(f"{sessions} sessions", started)
+
+        if opts["skip_derived"]:
+            return
+
+        user_qs = get_user_model().objects.filter(pk__in=list(goals_by_user))
+
+        started = perf_counter()
+        rows = rebuild_rollups(user_qs)
+        self._report(f"{rows} daily rollups", started)
+
+        # Raw inserts fire no signals, and the backfill stops at last week
+        started = perf_counter()
+        rows = sum(
+            rebuild_user_provisional(user)
+            for user in user_qs.select_related("preference").iterator(
+                chunk_size=self.chunk_size
+            )
+        )
+        self._report(f"{rows} provisional outcomes", started)
+
+        started = perf_counter()
+        result = backfill_outcomes(first_monday, chunk_size=self.chunk_size)
+        self._report(f"{result['weeks']} weeks of outcomes", started)
+
+        started = perf_counter()
+        awards = 0
+        for user in user_qs.iterator(chunk_size=self.chunk_size):
+            rebuild_user_streak(user.pk)
+            awards += len(evaluate_achievements_for_user(user))
+        self._report(f"streaks and {awards} awards", started)
+
+    # ---------- Stages ----------
+    def _create_users(self, prefix, count):
+        """
+        Bulk-create users sharing one password hash; return them.
+
+        Only the generated usernames are read back, so real accounts that
+        happen to share the prefix are never seeded.
+        """
+        User = get_user_model()
+        password = make_password("password")
+        self._bulk_insert(
+            User,
+            (
+                User(username=f"{prefix}{i:07d}", password=password)
+                for i in range(count)
+            ),
+        )
+        return list(
+            User.objects.filter(
+                username__regex=rf"^{re.escape(prefix)}[0-9]{{7}}$"
+            )
+            .order_by("pk").only("pk")[:count]
+        )
+
+    def _create_courses_and_goals(self, users, per_user, created_on):
+        """
+        Create courses and one goal per course; return goal ids by user.
+
+        Goals are backdated to `created_on` so the outcome backfill covers
+        the whole seeded history.
+        """
+        rng = self.rng
+        courses = []
+        for user in users:
+            for title in rng.sample(COURSE_TITLES, per_user):
+                courses.append(Course(
+                    owner_id=user.pk,
+                    title=title,
+                    status=Course.Status.ACTIVE,
+                ))
+        self._bulk_insert(Course, Course.assign_slugs(courses))
+
+        goals = []
+        for course in Course.objects.filter(
+            owner__in=[u.pk for u in users]
+        ).only("pk", "owner_id").iterator(chunk_size=self.chunk_size):
+            lessons = rng.choice([None, None, 3, 5])
+            goals.append(Goal(
+                user_id=course.owner_id,
+                course_id=course.pk,
+                weekly_hours_target=rng.choice(WEEKLY_HOUR_TARGETS),
+                weekly_lessons_target=lessons,
+                study_days_per_week=rng.randint(2, 6),
+            ))
+        self._bulk_insert(Goal, goals)
+        # auto_now_add overrides created_at on insert, so backdate afterwards
+        Goal.objects.filter(user__in=[u.pk for u in users]).update(
+            created_at=datetime.combine(
+                created_on, time(), timezone.get_current_timezone()
+            )
+        )
+
+        goals_by_user = {u.pk: [] for u in users}
+        for goal_id, user_id, course_id in Goal.objects.filter(
+            user__in=goals_by_user
+        ).values_list("pk", "user_id", "course_id"):
+            goals_by_user[user_id].append((goal_id, course_id))
+        return goals_by_user
+
+    def _sessions(self, goals_by_user, per_user, first_monday, weeks, today):
+        """Yield StudySession value tuples (SESSION_FIELDS order) per user."""
+        rng = self.rng
+        tz = timezone.get_current_timezone()
+        adapt_datetime = connection.ops.adapt_datetimefield_value
+        adapt_date = connection.ops.adapt_datefield_value
+        last_day = (today - first_monday).days
+
+        for user_id, goals in goals_by_user.items():
+            if not goals:
+                continue
+
+            # Per-user habits: skipped weeks, typical length, goal linking
+            week_weights = [
+                0 if rng.random() < 0.15 else rng.uniform(0.5, 1.5)
+                for _ in range(weeks + 1)
+            ]
+            week_weights[-1] = week_weights[-1] or 1
+            typical = rng.uniform(25, 70)
+            linked = rng.uniform(0.6, 0.95)
+
+            chosen_weeks = rng.choices(
+                range(weeks + 1), weights=week_weights, k=per_user
+            )
+            days = rng.choices(range(7), weights=WEEKDAY_WEIGHTS, k=per_user)
+            hours = rng.choices(range(7, 23), weights=HOUR_WEIGHTS, k=per_user)
+
+            for week, weekday, hour in zip(chosen_weeks, days, hours):
+                offset = week * 7 + weekday
+                if offset > last_day:
+                    # Current week: only days up to today
+                    offset = rng.randint(weeks * 7, last_day)
+                day = first_monday + timedelta(days=offset)
+                goal_id, course_id = rng.choice(goals)
+                started_at = datetime.combine(
+                    day, time(hour, rng.randrange(0, 60, 5)), tz
+                )
+                yield (
+                    user_id,
+                    course_id,
+                    goal_id if rng.random() < linked else None,
+                    adapt_datetime(started_at),
+                    adapt_date(day),
+                    max(5, min(240, int(rng.gauss(typical, typical / 3)))),
+                    "",
+                )
+
+    # ---------- Helpers ----------
+    def _bulk_insert(self, model, objs):
+        """Insert objects in chunks, one transaction each; return the count."""
+        total = 0
+        it = iter(objs)
+        while True:
+            chunk = list(islice(it, self.chunk_size))
+            if not chunk:
+                return total
+            with transaction.atomic():
+                model.objects.bulk_create(chunk)
+            total += len(chunk)
+
+    def _insert_rows(self, model, fields, rows):
+        """
+        Insert pre-adapted value tuples with one executemany per chunk.
+
+        Used for sessions, where `bulk_create` spends most of its time
+        preparing each value and, on SQLite, is capped at 999 parameters
+        (about 140 rows) per statement.
+        """
+        qn = connection.ops.quote_name
+        columns = ", ".join(
+            qn(model._meta.get_field(name).column) for name in fields
+        )
+        sql = (
+            f"INSERT INTO {qn(model._meta.db_table)} ({columns}) "
+            f"VALUES ({', '.join(['%s'] * len(fields))})"
+        )
+        total = 0
+        it = iter(rows)
+        with connection.cursor() as cursor:
+            while True:
+                chunk = list(islice(it, self.chunk_size))
+                if not chunk:
+                    return total
+                with transaction.atomic():
+                    cursor.executemany(sql, chunk)
+                total += len(chunk)
+
+    def _report(self, label, started):
+        """Print how long a stage took."""
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {label} in {perf_counter() - started:.1f}s."
+        ))
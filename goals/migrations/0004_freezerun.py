@@ -0,0 +1,31 @@
+# Generated by Django 4.2.25 on 2026-10-17 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0003_goaloutcome_goaloutcome_unique_goal_week'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FreezeRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('week_start', models.DateField()),
+                ('scope', models.CharField(default='all', max_length=64)),
+                ('created', models.PositiveIntegerField(default=0)),
+                ('updated', models.PositiveIntegerField(default=0)),
+                ('frozen_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-week_start'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='freezerun',
+            constraint=models.UniqueConstraint(fields=('week_start', 'scope'), name='unique_freeze_week_scope'),
+        ),
+    ]
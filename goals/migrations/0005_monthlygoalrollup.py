@@ -0,0 +1,60 @@
+# Generated by Django 4.2.25 on 2026-10-17 14:00
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.db.models import Max, Sum
+from django.db.models.functions import TruncMonth
+import django.db.models.deletion
+
+
+def populate_monthly_rollups(apps, schema_editor):
+    """Build month rows from daily rollups up to the latest frozen week."""
+    FreezeRun = apps.get_model("goals", "FreezeRun")
+    MonthlyGoalRollup = apps.get_model("goals", "MonthlyGoalRollup")
+    DailyStudyRollup = apps.get_model("study_sessions", "DailyStudyRollup")
+
+    latest = FreezeRun.objects.aggregate(latest=Max("week_start"))["latest"]
+    if latest is None:
+        return
+
+    totals = (
+        DailyStudyRollup.objects
+        .filter(goal__isnull=False, day__lte=latest + timedelta(days=6))
+        .annotate(month=TruncMonth("day"))
+        .values("goal_id", "month")
+        .annotate(minutes=Sum("minutes"))
+        .order_by()
+    )
+    MonthlyGoalRollup.objects.bulk_create(
+        (MonthlyGoalRollup(**t) for t in totals.iterator()),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0004_freezerun'),
+        ('study_sessions', '0002_dailystudyrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyGoalRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('minutes', models.PositiveIntegerField(default=0)),
+                ('goal', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_rollups', to='goals.goal')),
+            ],
+            options={
+                'ordering': ['goal', 'month'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='monthlygoalrollup',
+            constraint=models.UniqueConstraint(fields=('goal', 'month'), name='unique_goal_month'),
+        ),
+        migrations.RunPython(populate_monthly_rollups, migrations.RunPython.noop),
+    ]
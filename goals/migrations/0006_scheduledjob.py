@@ -0,0 +1,25 @@
+# Generated by Django 4.2.25 on 2026-10-17 16:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0005_monthlygoalrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduledJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=64, unique=True)),
+                ('locked_by', models.CharField(blank=True, max_length=64)),
+                ('locked_until', models.DateTimeField(blank=True, null=True)),
+                ('last_started_at', models.DateTimeField(blank=True, null=True)),
+                ('last_succeeded_at', models.DateTimeField(blank=True, null=True)),
+                ('last_week_start', models.DateField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.25 on 2026-10-17 18:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0006_scheduledjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DirtyOutcome',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('week_start', models.DateField()),
+                ('marked_at', models.DateTimeField(auto_now=True)),
+                ('goal', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dirty_weeks', to='goals.goal')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='dirtyoutcome',
+            constraint=models.UniqueConstraint(fields=('goal', 'week_start'), name='unique_dirty_goal_week'),
+        ),
+    ]
@@ -0,0 +1,115 @@
+# Generated by Django 4.2.25 on 2026-10-17 19:00
+
+from datetime import timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Cast, Round
+from django.utils import timezone
+
+
+def populate_minutes(apps, schema_editor):
+    """Approximate minutes for existing outcomes from their rounded hours."""
+    GoalOutcome = apps.get_model("goals", "GoalOutcome")
+    GoalOutcome.objects.filter(is_final=True).update(
+        minutes_completed=Cast(
+            Round(F("hours_completed") * 60), models.IntegerField()
+        )
+    )
+
+
+def populate_provisional(apps, schema_editor):
+    """Create provisional outcomes for each goal's current week."""
+    Goal = apps.get_model("goals", "Goal")
+    GoalOutcome = apps.get_model("goals", "GoalOutcome")
+    StudySession = apps.get_model("study_sessions", "StudySession")
+    UserPreference = apps.get_model("tracker", "UserPreference")
+
+    zones = dict(UserPreference.objects.values_list("user_id", "timezone"))
+    mondays = {}
+
+    def this_monday(user_id):
+        name = zones.get(user_id, settings.TIME_ZONE)
+        if name not in mondays:
+            today = timezone.localdate(timezone=ZoneInfo(name))
+            mondays[name] = today - timedelta(days=today.weekday())
+        return mondays[name]
+
+    # Every zone's current Monday is within a day of the default one
+    since = this_monday(None) - timedelta(days=7)
+    days = (
+        StudySession.objects
+        .filter(goal__is_active=True, study_date__gte=since)
+        .values("goal_id", "user_id", "study_date")
+        .annotate(minutes=Sum("duration_minutes"), sessions=Count("pk"))
+        .order_by()
+    )
+    totals = {}
+    for day in days.iterator():
+        monday = this_monday(day["user_id"])
+        if monday <= day["study_date"] <= monday + timedelta(days=6):
+            total = totals.setdefault((day["goal_id"], monday), [0, 0])
+            total[0] += day["minutes"]
+            total[1] += day["sessions"]
+
+    goals = Goal.objects.in_bulk({goal_id for goal_id, _ in totals})
+    outcomes = []
+    for (goal_id, monday), (minutes, sessions) in totals.items():
+        goal = goals[goal_id]
+        hours = (Decimal(minutes) / Decimal(60)).quantize(
+            Decimal("0.1"), rounding=ROUND_HALF_UP
+        )
+        completed = (
+            goal.weekly_hours_target is not None
+            and hours >= goal.weekly_hours_target
+        ) or (
+            goal.weekly_lessons_target is not None
+            and sessions >= goal.weekly_lessons_target
+        )
+        outcomes.append(GoalOutcome(
+            goal_id=goal_id,
+            week_start=monday,
+            week_end=monday + timedelta(days=6),
+            hours_completed=hours,
+            lessons_completed=sessions,
+            minutes_completed=minutes,
+            hours_target=goal.weekly_hours_target,
+            lessons_target=goal.weekly_lessons_target,
+            completed=completed,
+            is_final=False,
+        ))
+    # Weeks someone already froze explicitly keep their final outcome
+    GoalOutcome.objects.bulk_create(
+        outcomes, batch_size=500, ignore_conflicts=True
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0007_dirtyoutcome'),
+        ('study_sessions', '0003_studysession_study_date'),
+        ('tracker', '0004_userpreference'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='goaloutcome',
+            name='minutes_completed',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='goaloutcome',
+            name='is_final',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddIndex(
+            model_name='goaloutcome',
+            index=models.Index(condition=models.Q(('is_final', False)), fields=['week_start'], name='outcome_provisional_week_idx'),
+        ),
+        migrations.RunPython(populate_minutes, migrations.RunPython.noop),
+        migrations.RunPython(populate_provisional, migrations.RunPython.noop),
+    ]
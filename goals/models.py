@@ -1,5 +1,8 @@
 from django.db import models
-from django.db.models import Sum, Q, CheckConstraint
+from django.db.models import (
+    Sum, Min, Q, CheckConstraint, Value, OuterRef, Subquery,
+)
+from django.db.models.functions import Coalesce
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.utils import timezone
@@ -25,6 +28,94 @@ def validate_half_hours(value):
         )
 
 
+def _week_bounds(today):
+    """
+    Return the (Monday, next Monday) pair for the ISO week containing today.
+
+    Args:
+        today (date): Any date within the week.
+
+    Returns:
+        tuple: (week_start, week_end) where week_end is exclusive.
+    """
+    week_start = today - timedelta(days=today.weekday())
+    return week_start, week_start + timedelta(days=7)
+
+
+class GoalQuerySet(models.QuerySet):
+    """
+    Custom queryset for Goal with batch progress helpers.
+
+    Lets list and detail pages load every figure they display in the same
+    query that fetches the goals, instead of one aggregate per goal.
+    """
+
+    def with_progress(self, today=None):
+        """
+        Annotate weekly and lifetime study minutes: the week's from the
+        goal's current GoalOutcome row (provisional until the week is
+        frozen), lifetime ones aggregated over its DailyStudyRollup rows.
+        Goals without a row for the week, such as inactive ones, fall back
+        to the week's rollups.
+
+        The annotated values are picked up by `weekly_study_minutes`,
+        `total_study_minutes` and every percentage/hours helper built on
+        them, so templates can call those methods repeatedly without
+        issuing extra queries.
+
+        Args:
+            today (date, optional): Date for determining the current week.
+
+        Returns:
+            GoalQuerySet: Goals annotated with `progress_week_start`,
+            `progress_weekly_minutes` and `progress_total_minutes`.
+        """
+        today = today or timezone.localdate()
+        week_start, week_end = _week_bounds(today)
+        this_week = GoalOutcome.objects.filter(
+            goal=OuterRef("pk"), week_start=week_start
+        )
+        in_week = Q(
+            daily_rollups__day__gte=week_start,
+            daily_rollups__day__lt=week_end,
+        )
+        return self.annotate(
+            progress_week_start=Value(
+                week_start, output_field=models.DateField()
+            ),
+            progress_weekly_minutes=Coalesce(
+                Subquery(this_week.values("minutes_completed")[:1]),
+                Sum("daily_rollups__minutes", filter=in_week),
+                0,
+            ),
+            progress_total_minutes=Coalesce(
+                Sum("daily_rollups__minutes"), 0
+            ),
+        )
+
+    def with_projection(self):
+        """
+        Annotate the inputs of the completion projection: lifetime study
+        minutes and the first day studied, from one grouped aggregate over
+        the goal's DailyStudyRollup rows.
+
+        `study_pace_hours_per_week`, `projected_completion_date` and
+        `overall_progress_percent` read these annotations instead of
+        querying per goal. Combines with `with_progress()`: both aggregate
+        over the same rollup join, so the sums are not multiplied.
+
+        Returns:
+            GoalQuerySet: Goals annotated with `projection_total_minutes`
+            and `projection_first_day`.
+        """
+        return self.annotate(
+            projection_total_minutes=Coalesce(
+                Sum("daily_rollups__minutes"), 0
+            ),
+            projection_first_day=Min("daily_rollups__day"),
+        )
+
+
 class Goal(models.Model):
     """
     Represents a user’s study goal for a course or independent study.
@@ -104,6 +195,8 @@ class Goal(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = GoalQuerySet.as_manager()
+
     # ---------------- Validation ----------------
     def clean(self):
         """
@@ -270,14 +363,23 @@ class Goal(models.Model):
         """
         Return total study minutes logged for this goal across all sessions.
 
+        Reads the DailyStudyRollup table, or the `progress_total_minutes`
+        / `projection_total_minutes` annotation from
+        `Goal.objects.with_progress()` / `with_projection()` when present.
+
         Returns:
             int: Sum of duration_minutes across linked StudySession objects.
         """
-        from study_sessions.models import StudySession
+        for name in ("progress_total_minutes", "projection_total_minutes"):
+            annotated = getattr(self, name, None)
+            if annotated is not None:
+                return annotated
+
+        from study_sessions.models import DailyStudyRollup
         agg = (
-            StudySession.objects
+            DailyStudyRollup.objects
             .filter(goal=self)
-            .aggregate(total=Sum("duration_minutes"))
+            .aggregate(total=Sum("minutes"))
         )
         return agg["total"] or 0
 
@@ -289,24 +391,40 @@ class Goal(models.Model):
         """
         Return minutes logged for this goal in the current ISO week (Mon–Sun).
 
+        Reads the week's GoalOutcome row, which is kept current while the
+        week is in progress (see goals.provisional), or the
+        `progress_weekly_minutes` annotation from
+        `Goal.objects.with_progress()` when it was computed for the same
+        week. Without a row (e.g. for an inactive goal) it sums at most
+        seven DailyStudyRollup days instead.
+
         Args:
             today (date, optional): Date for determining the current week.
 
         Returns:
             int: Total study minutes for this week.
         """
-        from study_sessions.models import StudySession
         today = today or timezone.localdate()
-        week_start = today - timedelta(days=today.weekday())
-        week_end = week_start + timedelta(days=7)
+        week_start, week_end = _week_bounds(today)
 
-        agg = (
-            StudySession.objects.filter(
-                goal=self,
-                started_at__date__gte=week_start,
-                started_at__date__lt=week_end,
-            ).aggregate(total=Sum("duration_minutes"))
+        annotated = getattr(self, "progress_weekly_minutes", None)
+        if (
+            annotated is not None
+            and getattr(self, "progress_week_start", None) == week_start
+        ):
+            return annotated
+
+        minutes = (
+            self.outcomes.filter(week_start=week_start)
+            .values_list("minutes_completed", flat=True)
+            .first()
         )
+        if minutes is not None:
+            return minutes
+
+        agg = self.daily_rollups.filter(
+            day__gte=week_start, day__lt=week_end
+        ).aggregate(total=Sum("minutes"))
         return agg["total"] or 0
 
     def weekly_progress_percent(self, today=None):
@@ -368,51 +486,68 @@ class Goal(models.Model):
         """Return this week’s logged time in hours (rounded)."""
         return round(self.weekly_study_minutes() / 60, decimals)
 
-    def projected_completion_date(self):
+    def _projection_inputs(self):
+        """
+        Return (total study minutes, first day studied) for this goal.
+
+        Uses the `Goal.objects.with_projection()` annotations when present,
+        otherwise one aggregate over the goal's DailyStudyRollup rows.
+
+        Returns:
+            tuple: (int, date | None)
+        """
+        if hasattr(self, "projection_first_day"):
+            return self.projection_total_minutes, self.projection_first_day
+
+        from study_sessions.models import DailyStudyRollup
+        agg = DailyStudyRollup.objects.filter(goal=self).aggregate(
+            total=Sum("minutes"), first_day=Min("day")
+        )
+        return agg["total"] or 0, agg["first_day"]
+
+    def study_pace_hours_per_week(self, today=None):
+        """
+        Return the average hours studied per week since the first session.
+
+        Args:
+            today (date, optional): Date to measure up to (defaults to today).
+
+        Returns:
+            float | None: Hours per week, or None if nothing is logged yet.
+        """
+        done_minutes, first_day = self._projection_inputs()
+        if not done_minutes or first_day is None:
+            return None
+
+        today = today or timezone.localdate()
+        days_elapsed = (today - first_day).days or 1
+        return (done_minutes / 60) / (days_elapsed / 7)
+
+    def projected_completion_date(self, today=None):
         """
         Estimate a completion date based on current average weekly pace.
 
+        Args:
+            today (date, optional): Date to project from (defaults to today).
+
         Returns:
             date | None: Predicted completion date, or None if insufficient
             data.
         """
-        from study_sessions.models import StudySession
-
         total_required = self.total_required_minutes()
         if not total_required or total_required <= 0:
             return None
 
-        done_minutes = self.total_study_minutes()
-        if done_minutes == 0:
-            return None
-
-        qs = (
-            StudySession.objects
-            .filter(goal=self, started_at__isnull=False)
-            .order_by("started_at")
-        )
-        first = qs.first()
-        if not first:
-            return None
-
-        now = timezone.now()
-        days_elapsed = (now - first.started_at).days or 1
-        weeks_elapsed = days_elapsed / 7
-
-        total_hours_done = done_minutes / 60
-        pace_h_per_week = (
-            total_hours_done / weeks_elapsed
-            if weeks_elapsed > 0
-            else None
-        )
+        pace_h_per_week = self.study_pace_hours_per_week(today)
         if not pace_h_per_week or pace_h_per_week <= 0:
             return None
 
-        total_required_hours = total_required / 60
-        hours_remaining = max(0, total_required_hours - total_hours_done)
+        done_minutes, _ = self._projection_inputs()
+        hours_remaining = max(0, (total_required - done_minutes) / 60)
         weeks_remaining = hours_remaining / pace_h_per_week
 
-        return (now + timedelta(weeks=weeks_remaining)).date()
+        today = today or timezone.localdate()
+        return today + timedelta(weeks=weeks_remaining)
 
     class Meta:
         ordering = ["-is_active", "-created_at"]
@@ -451,6 +586,10 @@ class GoalOutcome(models.Model):
 
     Each GoalOutcome represents a single ISO week’s summary, storing
     both target and achieved values. Used for analytics and charting.
+
+    The in-progress week has a provisional row (`is_final=False`) that is
+    kept up to date as sessions are logged (see goals.provisional) and is
+    finalised by the weekly freeze.
     """
 
     goal = models.ForeignKey(
@@ -466,6 +605,7 @@ class GoalOutcome(models.Model):
         default=0
     )
     lessons_completed = models.PositiveIntegerField(default=0)
+    minutes_completed = models.PositiveIntegerField(default=0)
     hours_target = models.DecimalField(
         max_digits=5,
         decimal_places=1,
@@ -474,6 +614,7 @@ class GoalOutcome(models.Model):
         )
     lessons_target = models.PositiveIntegerField(null=True, blank=True)
     completed = models.BooleanField(default=False)
+    is_final = models.BooleanField(default=True)
     notes = models.TextField(blank=True, default="")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -484,6 +625,13 @@ class GoalOutcome(models.Model):
                 fields=["goal", "week_start"],
                 name="unique_goal_week")
         ]
+        indexes = [
+            models.Index(
+                fields=["week_start"],
+                condition=models.Q(is_final=False),
+                name="outcome_provisional_week_idx",
+            ),
+        ]
         ordering = ["-week_start"]
 
     def __str__(self):
@@ -496,3 +644,154 @@ class GoalOutcome(models.Model):
             or "General goal"
         )
         return f"{name} — {self.week_start} ({'✓' if self.completed else '✗'})"
+
+
+class MonthlyGoalRollup(models.Model):
+    """
+    Study time per goal per calendar month, for the dashboard trend chart.
+
+    Refreshed whenever outcomes are frozen, from the DailyStudyRollup rows
+    of the affected months (up to the end of the latest frozen week), so
+    weeks that span two months are split by day rather than attributed to
+    the month of their Monday.
+
+    Attributes:
+        goal (Goal): The goal the time was logged against.
+        month (date): First day of the calendar month.
+        minutes (int): Minutes studied for the goal in that month.
+    """
+
+    goal = models.ForeignKey(
+        Goal,
+        on_delete=models.CASCADE,
+        related_name="monthly_rollups",
+    )
+    month = models.DateField()
+    minutes = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["goal", "month"],
+                name="unique_goal_month",
+            )
+        ]
+        ordering = ["goal", "month"]
+
+    @property
+    def hours(self):
+        """Return the month's study time in hours."""
+        return self.minutes / 60
+
+    def __str__(self):
+        """Return the goal id, month and hours."""
+        return f"Goal {self.goal_id} — {self.month:%b %Y}: {self.hours:.1f}h"
+
+
+class FreezeRun(models.Model):
+    """
+    Ledger entry recording that a week's outcomes have been frozen.
+
+    One row exists per (week_start, scope) pair once
+    `freeze_weekly_outcomes` has completed for it, which lets request-time
+    callers skip weeks that are already frozen with a single indexed
+    lookup on the unique constraint.
+
+    Attributes:
+        week_start (date): Monday of the frozen ISO week.
+        scope (str): Which goals the run covered ("all" for every active
+        goal).
+        created (int): Outcomes created by the most recent run.
+        updated (int): Outcomes updated by the most recent run.
+        frozen_at (datetime): When the most recent run finished.
+    """
+
+    SCOPE_ALL = "all"
+
+    week_start = models.DateField()
+    scope = models.CharField(max_length=64, default=SCOPE_ALL)
+    created = models.PositiveIntegerField(default=0)
+    updated = models.PositiveIntegerField(default=0)
+    frozen_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["week_start", "scope"],
+                name="unique_freeze_week_scope",
+            )
+        ]
+        ordering = ["-week_start"]
+
+    def __str__(self):
+        """Return the frozen week and scope."""
+        return f"{self.week_start} ({self.scope})"
+
+
+class ScheduledJob(models.Model):
+    """
+    Persisted state and cross-process lease for a `run_scheduler` job.
+
+    A job runs only while its row holds an unexpired lease, taken with a
+    conditional UPDATE, so at most one scheduler instance (e.g. one of
+    several dynos) works on it at a time. A crashed holder's lease simply
+    expires.
+
+    Attributes:
+        name (str): Unique job name (e.g. "weekly_freeze").
+        locked_by (str): Identifier of the current lease holder.
+        locked_until (datetime): When the current lease expires, or None.
+        last_started_at (datetime): When the job last started.
+        last_succeeded_at (datetime): When the job last completed.
+        last_week_start (date): Monday of the latest week any time zone
+        cohort has been frozen for (progress is tracked per cohort in the
+        FreezeRun ledger).
+    """
+
+    name = models.CharField(max_length=64, unique=True)
+    locked_by = models.CharField(max_length=64, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_started_at = models.DateTimeField(null=True, blank=True)
+    last_succeeded_at = models.DateTimeField(null=True, blank=True)
+    last_week_start = models.DateField(null=True, blank=True)
+
+    def __str__(self):
+        """Return the job name and when it last succeeded."""
+        return f"{self.name} (last success {self.last_succeeded_at or '-'})"
+
+
+class DirtyOutcome(models.Model):
+    """
+    Queue entry for a (goal, week) whose frozen outcome may be stale.
+
+    Session writes into finished weeks and goal target edits add rows
+    here (see goals.dirty), and `refreeze_dirty_outcomes` recomputes just
+    those outcomes and removes the rows. Marking an already queued pair
+    only bumps `marked_at`, so a pair marked again while a re-freeze is
+    running stays queued for the next one.
+
+    Attributes:
+        goal (Goal): The goal whose outcome may be stale.
+        week_start (date): Monday of the affected week.
+        marked_at (datetime): When the pair was last marked.
+    """
+
+    goal = models.ForeignKey(
+        Goal,
+        on_delete=models.CASCADE,
+        related_name="dirty_weeks",
+    )
+    week_start = models.DateField()
+    marked_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["goal", "week_start"],
+                name="unique_dirty_goal_week",
+            )
+        ]
+
+    def __str__(self):
+        """Return the goal and week awaiting a re-freeze."""
+        return f"Goal {self.goal_id} week {self.week_start}"
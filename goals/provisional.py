@@ -0,0 +1,276 @@
+"""Live provisional outcomes for the in-progress week.
+
+Every active goal studied in its owner's current week has a GoalOutcome
+row for that week with `is_final=False`. Session writes adjust the row in
+place with one F-expression UPDATE (receivers in goals.receivers), which
+also re-derives the hours and completion from the new totals, so the goal
+list and detail chart read the week directly instead of aggregating
+sessions. The first session of the week, which finds no row, creates it
+from one aggregate over the goal's sessions.
+
+The weekly freeze finalises these rows instead of recomputing them (see
+`freeze_outcomes`). Writes into weeks that are already final are left to
+goals.dirty, which queues them for a re-freeze.
+"""
+
+from functools import reduce
+from operator import or_
+
+from django.db.models import (
+    Case,
+    Count,
+    DecimalField,
+    Exists,
+    ExpressionWrapper,
+    F,
+    OuterRef,
+    Q,
+    Sum,
+    Value,
+    When,
+)
+from django.utils import timezone
+
+from study_sessions.models import StudySession
+from tracker.timezones import user_timezone
+
+from .models import Goal, GoalOutcome
+from .services import (
+    OUTCOME_UPDATE_FIELDS,
+    _monday_of_week,
+    _sunday_of_week,
+    build_outcome_data,
+)
+
+
+def current_week(user):
+    """Return the Monday of the user's current week, in their time zone."""
+    return _monday_of_week(timezone.localdate(timezone=user_timezone(user)))
+
+
+def apply_delta(goal_id, week_start, minutes, lessons):
+    """
+    Add (or subtract) minutes and lessons to a provisional outcome.
+
+    Hours are re-derived from the new minute total, rounded half up to
+    one decimal place as `build_outcome_data` does, and the row is marked
+    completed if either target is met; all in the same UPDATE.
+
+    Args:
+        goal_id (int): The goal.
+        week_start (date): Monday of the outcome's week.
+        minutes (int): Minutes to add (negative to subtract).
+        lessons (int): Sessions to add (negative to subtract).
+
+    Returns:
+        int: 1 if a provisional row was updated, 0 if there is none.
+    """
+    total = F("minutes_completed") + minutes
+    lessons_total = F("lessons_completed") + lessons
+    # Whole tenths of an hour, rounded half up (minutes / 6)
+    hours = ExpressionWrapper(
+        ((total + 3) / 6) / Value(10.0),
+        output_field=DecimalField(max_digits=6, decimal_places=1),
+    )
+    return GoalOutcome.objects.filter(
+        goal_id=goal_id, week_start=week_start, is_final=False
+    ).update(
+        minutes_completed=total,
+        lessons_completed=lessons_total,
+        hours_completed=hours,
+        completed=Case(
+            When(
+                Q(hours_target__lte=hours)
+                | Q(lessons_target__lte=lessons_total),
+                then=Value(True),
+            ),
+            default=Value(False),
+        ),
+        updated_at=timezone.now(),
+    )
+
+
+def refresh_provisional(goal_ids, week_start):
+    """
+    Recompute provisional outcomes for some goals from their sessions.
+
+    Inactive goals and goals whose outcome for the week is already final
+    are skipped.
+
+    Args:
+        goal_ids (Iterable[int]): The goals.
+        week_start (date): Monday of the week.
+
+    Returns:
+        int: Number of provisional rows written.
+    """
+    week_end = _sunday_of_week(week_start)
+    goals = list(
+        Goal.objects.filter(pk__in=goal_ids, is_active=True)
+        .exclude(Exists(GoalOutcome.objects.filter(
+            goal_id=OuterRef("pk"), week_start=week_start, is_final=True
+        )))
+        .only("id", "weekly_hours_target", "weekly_lessons_target")
+    )
+    if not goals:
+        return 0
+
+    totals = {
+        row["goal_id"]: (row["total"], row["sessions"])
+        for row in (
+            StudySession.objects.filter(
+                goal__in=goals,
+                study_date__gte=week_start,
+                study_date__lte=week_end,
+            )
+            .values("goal_id")
+            .annotate(total=Sum("duration_minutes"), sessions=Count("pk"))
+            .order_by()
+        )
+    }
+    GoalOutcome.objects.bulk_create(
+        [
+            GoalOutcome(
+                goal_id=goal.id,
+                week_start=week_start,
+                is_final=False,
+                **build_outcome_data(
+                    goal, *totals.get(goal.id, (0, 0)), week_end
+                ),
+            )
+            for goal in goals
+        ],
+        update_conflicts=True,
+        unique_fields=["goal", "week_start"],
+        update_fields=OUTCOME_UPDATE_FIELDS,
+    )
+    return len(goals)
+
+
+def rebuild_user_provisional(user):
+    """
+    Replace a user's provisional outcomes with ones for their current week.
+
+    Used when the user's study dates move, e.g. after a time zone change.
+
+    Args:
+        user (User): The user.
+
+    Returns:
+        int: Number of provisional rows written.
+    """
+    week_start = current_week(user)
+    GoalOutcome.objects.filter(goal__user=user, is_final=False).delete()
+    goal_ids = (
+        StudySession.objects.filter(
+            user=user,
+            goal__isnull=False,
+            study_date__gte=week_start,
+            study_date__lte=_sunday_of_week(week_start),
+        )
+        .values_list("goal_id", flat=True)
+        .distinct()
+    )
+    return refresh_provisional(list(goal_ids), week_start)
+
+
+def _adjust(goal_id, week_start, minutes, lessons, this_week):
+    """
+    Apply a delta, creating the row if it is missing this week.
+
+    Removals never create a row: there is nothing to subtract from, and
+    the session may be going in a cascade that deletes the goal itself.
+    """
+    if goal_id is None:
+        return
+    if apply_delta(goal_id, week_start, minutes, lessons):
+        return
+    if week_start == this_week and lessons >= 0:
+        refresh_provisional([goal_id], week_start)
+
+
+def record_session_saved(session, created):
+    """
+    Reflect a created or edited session in the provisional outcomes.
+
+    Args:
+        session (StudySession): The saved session.
+        created (bool): Whether the session was just inserted.
+    """
+    this_week = current_week(session.user)
+    new = (session.goal_id, _monday_of_week(session.study_date))
+    loaded = getattr(session, "_loaded_values", None)
+
+    if created or not loaded or not loaded.get("study_date"):
+        _adjust(*new, session.duration_minutes, 1, this_week)
+        return
+
+    old = (loaded["goal_id"], _monday_of_week(loaded["study_date"]))
+    if old == new:
+        diff = session.duration_minutes - loaded["duration_minutes"]
+        if diff:
+            _adjust(*new, diff, 0, this_week)
+        return
+
+    _adjust(*old, -loaded["duration_minutes"], -1, this_week)
+    _adjust(*new, session.duration_minutes, 1, this_week)
+
+
+def record_session_deleted(session):
+    """Subtract a deleted session from its week's provisional outcome."""
+    _adjust(
+        session.goal_id,
+        _monday_of_week(session.study_date),
+        -session.duration_minutes,
+        -1,
+        current_week(session.user),
+    )
+
+
+def record_goal_saved(goal, update_fields=None):
+    """
+    Bring the goal's provisional outcomes in line with its targets.
+
+    A deactivated goal is no longer frozen, so its provisional rows are
+    removed instead (its pages fall back to the rollups). A goal left
+    without a row, e.g. one just reactivated, gets this week's rebuilt if
+    it was studied.
+
+    Args:
+        goal (Goal): The saved goal.
+        update_fields (Iterable[str] | None): Fields passed to save(), if
+        any; saves that cannot touch the targets are skipped.
+    """
+    fields = {"weekly_hours_target", "weekly_lessons_target", "is_active"}
+    if update_fields is not None and not fields & set(update_fields):
+        return
+    rows = GoalOutcome.objects.filter(goal=goal, is_final=False)
+    if not goal.is_active:
+        rows.delete()
+        return
+
+    met = []
+    if goal.weekly_hours_target is not None:
+        met.append(Q(hours_completed__gte=goal.weekly_hours_target))
+    if goal.weekly_lessons_target is not None:
+        met.append(Q(lessons_completed__gte=goal.weekly_lessons_target))
+    updated = rows.update(
+        hours_target=goal.weekly_hours_target,
+        lessons_target=goal.weekly_lessons_target,
+        completed=(
+            Case(When(reduce(or_, met), then=Value(True)),
+                 default=Value(False))
+            if met else Value(False)
+        ),
+        updated_at=timezone.now(),
+    )
+    if updated or (update_fields is not None
+                   and "is_active" not in update_fields):
+        return
+    week_start = current_week(goal.user)
+    studied = goal.study_sessions.filter(
+        study_date__gte=week_start,
+        study_date__lte=_sunday_of_week(week_start),
+    )
+    if studied.exists():
+        refresh_provisional([goal.pk], week_start)
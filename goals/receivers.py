@@ -0,0 +1,38 @@
+"""Signal receivers keeping outcomes in step with session and goal writes.
+
+Writes to the in-progress week adjust its provisional outcomes (see
+goals.provisional); late edits to finished weeks queue their outcomes for
+a re-freeze (see goals.dirty).
+
+Connected in GoalsConfig.ready().
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from study_sessions.models import StudySession
+
+from . import dirty, provisional
+from .models import Goal
+
+
+@receiver(post_save, sender=StudySession)
+def session_saved(sender, instance, created, **kwargs):
+    """Update provisional outcomes and queue the finished weeks changed."""
+    provisional.record_session_saved(instance, created)
+    dirty.record_session_saved(instance, created)
+
+
+@receiver(post_delete, sender=StudySession)
+def session_deleted(sender, instance, **kwargs):
+    """Subtract a deleted session from its week's outcome."""
+    provisional.record_session_deleted(instance)
+    dirty.record_session_deleted(instance)
+
+
+@receiver(post_save, sender=Goal)
+def goal_saved(sender, instance, created, update_fields=None, **kwargs):
+    """Carry target changes to provisional and frozen outcomes."""
+    if not created:
+        provisional.record_goal_saved(instance, update_fields)
+        dirty.record_goal_saved(instance, update_fields)
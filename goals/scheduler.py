@@ -0,0 +1,181 @@
+"""Weekly freeze scheduling with catch-up, for `manage.py run_scheduler`.
+
+Users are frozen in time zone cohorts (see tracker.timezones). On every
+tick, `run_weekly_freeze` works out, for each cohort, every week that
+should have been frozen since the cohort's last recorded freeze, up to
+the cohort's own last week, and freezes them in one `backfill_outcomes`
+pass. With hourly ticks each cohort is frozen within an hour of its
+Monday starting, which spreads the weekly work across the day instead of
+one spike. It only runs while holding the job's lease (see
+ScheduledJob), so any number of scheduler instances can be started and
+only one does the work.
+
+`run_dirty_refreeze` runs on the same ticks, under its own lease, and
+re-freezes the outcomes queued as stale by late edits (see goals.dirty).
+"""
+
+import os
+import socket
+from datetime import date, timedelta
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from tracker.timezones import timezone_cohorts
+
+from .dirty import refreeze_dirty_outcomes
+from .models import FreezeRun, ScheduledJob
+from .services import (
+    _monday_of_week,
+    backfill_outcomes,
+    last_week_range,
+    timezone_scope,
+)
+
+WEEKLY_FREEZE_JOB = "weekly_freeze"
+DIRTY_REFREEZE_JOB = "dirty_refreeze"
+
+#: How long a lease is held before another instance may take it over.
+LEASE_SECONDS = 30 * 60
+
+
+def instance_id() -> str:
+    """Return an identifier for this process (host and pid)."""
+    return f"{socket.gethostname()}:{os.getpid()}"[:64]
+
+
+def acquire_lease(name: str, owner: str, seconds: int = LEASE_SECONDS) -> bool:
+    """
+    Take the named job's lease if it is free, expired or already ours.
+
+    Args:
+        name (str): Job name.
+        owner (str): Identifier of the caller.
+        seconds (int): Lease length.
+
+    Returns:
+        bool: True if the caller now holds the lease.
+    """
+    now = timezone.now()
+    ScheduledJob.objects.get_or_create(name=name)
+    taken = ScheduledJob.objects.filter(
+        Q(locked_until__isnull=True)
+        | Q(locked_until__lt=now)
+        | Q(locked_by=owner),
+        name=name,
+    ).update(locked_by=owner, locked_until=now + timedelta(seconds=seconds))
+    return taken == 1
+
+
+def release_lease(name: str, owner: str) -> None:
+    """Give up the named job's lease if the caller still holds it."""
+    ScheduledJob.objects.filter(name=name, locked_by=owner).update(
+        locked_by="", locked_until=None
+    )
+
+
+def _latest_frozen(scope: str) -> Optional[date]:
+    """Return the latest week_start in the ledger for a scope, if any."""
+    return FreezeRun.objects.filter(scope=scope).aggregate(
+        latest=Max("week_start")
+    )["latest"]
+
+
+def first_unfrozen_week(cohort: str) -> date:
+    """
+    Return the Monday of the first week a cohort still has to be frozen.
+
+    That is the week after the latest one recorded for the cohort. A
+    cohort without entries starts after the latest all-goals entry, or
+    with its own last week if nothing was ever frozen.
+
+    Args:
+        cohort (str): Time zone name of the cohort.
+
+    Returns:
+        date: A Monday; later than the cohort's last week when there is
+        nothing to do.
+    """
+    latest = _latest_frozen(timezone_scope(cohort)) or _latest_frozen(
+        FreezeRun.SCOPE_ALL
+    )
+    if latest is None:
+        today = timezone.localdate(timezone=ZoneInfo(cohort))
+        return last_week_range(today)[0]
+    return _monday_of_week(latest) + timedelta(weeks=1)
+
+
+def run_weekly_freeze(owner: Optional[str] = None) -> Optional[dict]:
+    """
+    Freeze every cohort's missed weeks, if this caller wins the lease.
+
+    Args:
+        owner (str, optional): Lease holder id (defaults to this process).
+
+    Returns:
+        dict | None: None if another instance holds the lease. Otherwise
+        a summary with keys:
+            - "created" (int), "updated" (int): Outcome counts.
+            - "weeks" (int): Cohort weeks frozen (0 if everything was
+            already frozen).
+            - "cohorts" (list[str]): Time zones that had weeks frozen.
+    """
+    owner = owner or instance_id()
+    if not acquire_lease(WEEKLY_FREEZE_JOB, owner):
+        return None
+
+    try:
+        job = ScheduledJob.objects.get(name=WEEKLY_FREEZE_JOB)
+        job.last_started_at = timezone.now()
+        job.save(update_fields=["last_started_at"])
+
+        summary = {"created": 0, "updated": 0, "weeks": 0, "cohorts": []}
+        for cohort in timezone_cohorts():
+            # An empty range (first week after last week) is a no-op
+            result = backfill_outcomes(
+                first_unfrozen_week(cohort), cohort=cohort
+            )
+            if not result["weeks"]:
+                continue
+            for key in ("created", "updated", "weeks"):
+                summary[key] += result[key]
+            summary["cohorts"].append(cohort)
+            latest = _monday_of_week(result["week_end"])
+            if job.last_week_start is None or latest > job.last_week_start:
+                job.last_week_start = latest
+
+        job.last_succeeded_at = timezone.now()
+        job.save(update_fields=["last_succeeded_at", "last_week_start"])
+        return summary
+    finally:
+        release_lease(WEEKLY_FREEZE_JOB, owner)
+
+
+def run_dirty_refreeze(owner: Optional[str] = None) -> Optional[dict]:
+    """
+    Re-freeze the queued stale outcomes, if this caller wins the lease.
+
+    Args:
+        owner (str, optional): Lease holder id (defaults to this process).
+
+    Returns:
+        dict | None: None if another instance holds the lease, otherwise
+        the `refreeze_dirty_outcomes` summary.
+    """
+    owner = owner or instance_id()
+    if not acquire_lease(DIRTY_REFREEZE_JOB, owner):
+        return None
+
+    try:
+        ScheduledJob.objects.filter(name=DIRTY_REFREEZE_JOB).update(
+            last_started_at=timezone.now()
+        )
+        result = refreeze_dirty_outcomes()
+        ScheduledJob.objects.filter(name=DIRTY_REFREEZE_JOB).update(
+            last_succeeded_at=timezone.now()
+        )
+        return result
+    finally:
+        release_lease(DIRTY_REFREEZE_JOB, owner)
@@ -1,18 +1,26 @@
 """Goal outcome freezing services.
 
 Provides utilities to compute ISO week ranges and to freeze per-goal weekly
-progress into GoalOutcome snapshots. Intended to run via a scheduled job
-(e.g., every Monday in Europe/London) or manually with explicit dates.
+progress into GoalOutcome snapshots. Weeks are the users' local ones:
+`manage.py run_scheduler` freezes each time zone cohort as its own Monday
+begins (see goals.scheduler and tracker.timezones), and freezes can also
+be run manually with explicit dates.
 """
 
 from decimal import Decimal, ROUND_HALF_UP
-from typing import Optional, Tuple
+from itertools import islice
+from collections import Counter
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 from django.db import models, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.db.models.functions import TruncMonth, TruncWeek
 from django.utils import timezone
 
-from .models import Goal, GoalOutcome
-from study_sessions.models import StudySession
+from .models import FreezeRun, Goal, GoalOutcome, MonthlyGoalRollup
+from .signals import outcomes_frozen
+from study_sessions.models import DailyStudyRollup
+from tracker.timezones import cohort_users
 from zoneinfo import ZoneInfo
 from datetime import date, timedelta
 
@@ -64,29 +72,497 @@ def last_week_range(today: Optional[date] = None) -> Tuple[date, date]:
     return start, end
 
 
-@transaction.atomic
+#: Goals processed (and outcomes upserted) per database round trip.
+FREEZE_CHUNK_SIZE = 500
+
+#: Fields overwritten when an outcome for (goal, week_start) already exists.
+OUTCOME_UPDATE_FIELDS = [
+    "week_end",
+    "hours_completed",
+    "lessons_completed",
+    "minutes_completed",
+    "hours_target",
+    "lessons_target",
+    "completed",
+    "is_final",
+    "updated_at",
+]
+
+
+def build_outcome_data(goal, total_minutes: int, lessons_count: int,
+                       week_end: date) -> dict:
+    """
+    Turn a goal's weekly totals into GoalOutcome field values.
+
+    Args:
+        goal (Goal): The goal being frozen (only its targets are read).
+        total_minutes (int): Minutes studied for the goal that week.
+        lessons_count (int): Sessions logged that week (lesson proxy).
+        week_end (date): Sunday of the frozen week.
+
+    Returns:
+        dict: Field values for the GoalOutcome row (excluding goal and
+        week_start).
+    """
+    # ---- HOURS (from minutes) ----
+    hours = (Decimal(total_minutes) / Decimal(60)).quantize(
+        Decimal("0.1"), rounding=ROUND_HALF_UP
+    )
+
+    # ---- Targets & completion (robust to Decimal/float/None) ----
+    hours_target_raw = getattr(goal, "weekly_hours_target", None)
+    lessons_target_raw = getattr(goal, "weekly_lessons_target", None)
+
+    hours_target = None
+    if hours_target_raw is not None:
+        # Normalize to Decimal safely even if model gives float
+        hours_target = Decimal(str(hours_target_raw))
+
+    lessons_target = None
+    if lessons_target_raw is not None:
+        lessons_target = int(lessons_target_raw)
+
+    completed = False
+    if hours_target is not None and hours >= hours_target:
+        completed = True
+    if lessons_target is not None and lessons_count >= lessons_target:
+        completed = True
+
+    return {
+        "hours_completed": hours,
+        "lessons_completed": lessons_count,
+        "minutes_completed": total_minutes,
+        "hours_target": hours_target_raw,
+        "lessons_target": lessons_target_raw,
+        "completed": completed,
+        "week_end": week_end,
+    }
+
+
+def _chunked(iterable: Iterable, size: int) -> Iterator[list]:
+    """Yield successive lists of at most `size` items from `iterable`."""
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def upsert_outcomes(outcomes: list) -> Tuple[int, int]:
+    """
+    Insert or update a batch of GoalOutcome rows in one statement.
+
+    Existing rows for the same (goal, week_start) are detected with a
+    single lookup beforehand so callers can still report created vs
+    updated counts.
+
+    Args:
+        outcomes (list[GoalOutcome]): Unsaved instances to upsert.
+
+    Returns:
+        Tuple[int, int]: (created, updated) counts for the batch.
+    """
+    if not outcomes:
+        return 0, 0
+
+    keys = Q()
+    for week_start in {o.week_start for o in outcomes}:
+        keys |= Q(
+            week_start=week_start,
+            goal_id__in=[
+                o.goal_id for o in outcomes if o.week_start == week_start
+            ],
+        )
+
+    with transaction.atomic():
+        existing = GoalOutcome.objects.filter(keys).count()
+        GoalOutcome.objects.bulk_create(
+            outcomes,
+            update_conflicts=True,
+            unique_fields=["goal", "week_start"],
+            update_fields=OUTCOME_UPDATE_FIELDS,
+        )
+    return len(outcomes) - existing, existing
+
+
+def _month_start(d: date) -> date:
+    """Return the first day of the month containing `d`."""
+    return d.replace(day=1)
+
+
+def refresh_monthly_rollups(
+    week_start: date,
+    week_end: date,
+    chunk_size: int = FREEZE_CHUNK_SIZE,
+    users: Optional[Iterable] = None,
+) -> int:
+    """
+    Recompute MonthlyGoalRollup rows for the months a frozen range touches.
+
+    Month totals are summed per day from DailyStudyRollup for active goals,
+    up to the end of the latest frozen week, so a week spanning two months
+    contributes to each by day. Rows for the affected months are replaced
+    wholesale, which keeps re-freezes idempotent.
+
+    Args:
+        week_start (date): Monday of the first frozen week.
+        week_end (date): Sunday of the last frozen week.
+        chunk_size (int): Rows streamed and inserted per round trip.
+        users (Optional[Iterable]): Only refresh these users' goals (user
+        ids, or a user QuerySet).
+
+    Returns:
+        int: Number of month rows written.
+    """
+    latest = FreezeRun.objects.aggregate(
+        latest=models.Max("week_start")
+    )["latest"]
+    covered_to = max(week_end, latest + timedelta(days=6)) if latest \
+        else week_end
+
+    first_month = _month_start(week_start)
+    last_month = _month_start(week_end)
+    next_month = _month_start(last_month + timedelta(days=31))
+
+    rollups = DailyStudyRollup.objects.filter(
+        goal__is_active=True,
+        day__gte=first_month,
+        day__lt=next_month,
+        day__lte=covered_to,
+    )
+    stale = MonthlyGoalRollup.objects.filter(
+        goal__is_active=True,
+        month__gte=first_month,
+        month__lt=next_month,
+    )
+    if users is not None:
+        rollups = rollups.filter(goal__user_id__in=users)
+        stale = stale.filter(goal__user_id__in=users)
+
+    totals = (
+        rollups
+        .annotate(month=TruncMonth("day"))
+        .values("goal_id", "month")
+        .annotate(minutes=models.Sum("minutes"))
+        .order_by()
+        .iterator(chunk_size=chunk_size)
+    )
+
+    written = 0
+    with transaction.atomic():
+        stale.delete()
+        for batch in _chunked(totals, chunk_size):
+            MonthlyGoalRollup.objects.bulk_create(
+                [MonthlyGoalRollup(**t) for t in batch]
+            )
+            written += len(batch)
+    return written
+
+
+def resolve_freeze_week(
+    week_start: Optional[date] = None,
+    week_end: Optional[date] = None,
+) -> Optional[Tuple[date, date]]:
+    """
+    Return the week a freeze should cover, or None to skip.
+
+    Explicit dates are used as given. Otherwise the previous ISO week is
+    returned, but only on Mondays in the default time zone
+    (settings.TIME_ZONE). Users in other zones are frozen by
+    `manage.py run_scheduler` as their own Monday begins.
+
+    Args:
+        week_start (Optional[date]): Monday of the week to freeze.
+        week_end (Optional[date]): Sunday of the week to freeze.
+
+    Returns:
+        Optional[Tuple[date, date]]: (week_start, week_end), or None.
+    """
+    if week_start and week_end:
+        return week_start, week_end
+
+    today_local = timezone.localdate(
+        timezone.now(), timezone.get_default_timezone()
+    )
+    if today_local.weekday() != 0:
+        return None
+    return last_week_range(today_local)
+
+
+def freeze_outcomes(
+    week_start: date,
+    week_end: date,
+    user_range: Optional[Tuple[int, int]] = None,
+    dry_run: bool = False,
+    chunk_size: int = FREEZE_CHUNK_SIZE,
+    users: Optional[List[int]] = None,
+) -> Tuple[int, int]:
+    """
+    Write GoalOutcome rows for active goals, optionally for some users.
+
+    One `GROUP BY goal_id` aggregate over DailyStudyRollup is streamed in
+    goal order and merged against the streamed goals, and outcomes are
+    upserted in chunks that each commit on their own. Goals that already
+    have a provisional outcome for the week (see goals.provisional) are
+    not recomputed: their rows are finalised with one UPDATE at the end
+    and counted as updated. Does not touch the FreezeRun ledger; see
+    `freeze_weekly_outcomes` and goals.sharding.
+
+    Args:
+        week_start (date): Monday of the week to freeze.
+        week_end (date): Sunday of the week to freeze.
+        user_range (Optional[Tuple[int, int]]): Only goals whose user id is
+        in [low, high).
+        dry_run (bool): Print the outcomes instead of writing them.
+        chunk_size (int): Goals fetched and upserted per round trip.
+        users (Optional[List[int]]): Only goals of these user ids.
+
+    Returns:
+        Tuple[int, int]: (created, updated) outcome counts.
+    """
+    goals = Goal.objects.filter(is_active=True).order_by("id")
+    if dry_run:
+        goals = goals.select_related("user", "course")
+    else:
+        goals = goals.only(
+            "id", "weekly_hours_target", "weekly_lessons_target"
+        )
+
+    rollups = DailyStudyRollup.objects.filter(
+        goal__is_active=True,
+        day__gte=week_start,
+        day__lte=week_end,
+    )
+    provisional = GoalOutcome.objects.filter(
+        goal__is_active=True,
+        week_start=week_start,
+        is_final=False,
+    )
+
+    if user_range is not None:
+        low, high = user_range
+        goals = goals.filter(user_id__gte=low, user_id__lt=high)
+        rollups = rollups.filter(
+            goal__user_id__gte=low, goal__user_id__lt=high
+        )
+        provisional = provisional.filter(
+            goal__user_id__gte=low, goal__user_id__lt=high
+        )
+    if users is not None:
+        goals = goals.filter(user_id__in=users)
+        rollups = rollups.filter(goal__user_id__in=users)
+        provisional = provisional.filter(goal__user_id__in=users)
+
+    # Provisional rows are already up to date; they are finalised below
+    goals = goals.exclude(
+        Exists(provisional.filter(goal_id=OuterRef("pk")))
+    )
+
+    # One grouped aggregate for the whole week, streamed in goal order
+    totals = (
+        rollups
+        .values("goal_id")
+        .annotate(
+            total=models.Sum("minutes"),
+            sessions=models.Sum("session_count"),
+        )
+        .order_by("goal_id")
+        .iterator(chunk_size=chunk_size)
+    )
+    next_total = next(totals, None)
+
+    created, updated = 0, 0
+
+    for batch in _chunked(goals.iterator(chunk_size=chunk_size), chunk_size):
+        outcomes = []
+        for goal in batch:
+            # Advance the aggregate stream up to this goal (merge join)
+            while next_total is not None and next_total["goal_id"] < goal.id:
+                next_total = next(totals, None)
+
+            total_minutes, lessons_count = 0, 0
+            if next_total is not None and next_total["goal_id"] == goal.id:
+                total_minutes = next_total["total"] or 0
+                lessons_count = next_total["sessions"]
+
+            data = build_outcome_data(
+                goal, total_minutes, lessons_count, week_end
+            )
+
+            if dry_run:
+                print(f"[DRY RUN] {goal} {week_start}–{week_end} → {data}")
+                continue
+
+            outcomes.append(
+                GoalOutcome(goal_id=goal.id, week_start=week_start, **data)
+            )
+
+        batch_created, batch_updated = upsert_outcomes(outcomes)
+        created += batch_created
+        updated += batch_updated
+
+    if dry_run:
+        print(f"[DRY RUN] finalise {provisional.count()} provisional "
+              f"outcome(s) for {week_start}")
+    else:
+        updated += provisional.update(
+            is_final=True, updated_at=timezone.now()
+        )
+
+    return created, updated
+
+
+def finish_freeze(
+    week_start: date,
+    week_end: date,
+    created: int,
+    updated: int,
+    chunk_size: int = FREEZE_CHUNK_SIZE,
+) -> None:
+    """
+    Record a completed week in the ledger and notify dependants.
+
+    Writes the all-goals FreezeRun row, refreshes the week's
+    MonthlyGoalRollup rows and sends `outcomes_frozen`.
+
+    Args:
+        week_start (date): Monday of the frozen week.
+        week_end (date): Sunday of the frozen week.
+        created (int): Outcomes created across the run.
+        updated (int): Outcomes updated across the run.
+        chunk_size (int): Rows per round trip for the monthly refresh.
+    """
+    FreezeRun.objects.update_or_create(
+        week_start=week_start,
+        scope=FreezeRun.SCOPE_ALL,
+        defaults={"created": created, "updated": updated},
+    )
+    refresh_monthly_rollups(week_start, week_end, chunk_size)
+    outcomes_frozen.send(
+        sender=GoalOutcome,
+        week_start=week_start,
+        week_end=week_end,
+        goals=Goal.objects.filter(is_active=True),
+    )
+
+
+def user_scope(user_id: int) -> str:
+    """Return the FreezeRun scope of a freeze limited to one user."""
+    return f"user:{user_id}"
+
+
+def timezone_scope(name: str) -> str:
+    """Return the FreezeRun scope of a freeze of one time zone cohort."""
+    return f"tz:{name}"
+
+
+def _freeze_for_users(
+    week_start: date,
+    week_end: date,
+    user_ids: List[int],
+    chunk_size: int,
+) -> dict:
+    """
+    Freeze a week for some users, at most once at a time per user.
+
+    Each user has a FreezeRun row for the week (scope "user:<id>") that
+    doubles as a lock: the rows are locked with SELECT ... FOR UPDATE in
+    id order and the freeze runs inside that transaction. A concurrent
+    caller for the same users blocks until the first run commits, then
+    sees every row stamped after its own request started and reuses that
+    run instead of writing the same outcomes again. On SQLite, which
+    ignores FOR UPDATE, the database-wide write lock serialises callers
+    in the same way.
+
+    Args:
+        week_start (date): Monday of the week to freeze.
+        week_end (date): Sunday of the week to freeze.
+        user_ids (List[int]): Users whose active goals are frozen.
+        chunk_size (int): Goals fetched and upserted per round trip.
+
+    Returns:
+        dict: "created" and "updated" counts (both 0 when reused) and
+        "reused" (bool).
+    """
+    requested = timezone.now()
+    scopes = [user_scope(user_id) for user_id in sorted(user_ids)]
+
+    with transaction.atomic():
+        fresh = set()
+        for scope in scopes:
+            _, was_created = FreezeRun.objects.get_or_create(
+                week_start=week_start, scope=scope
+            )
+            if was_created:
+                fresh.add(scope)
+        runs = list(
+            FreezeRun.objects.select_for_update()
+            .filter(week_start=week_start, scope__in=scopes)
+            .order_by("scope")
+        )
+        if all(
+            run.scope not in fresh and run.frozen_at >= requested
+            for run in runs
+        ):
+            return {"created": 0, "updated": 0, "reused": True}
+
+        created, updated = freeze_outcomes(
+            week_start, week_end, chunk_size=chunk_size, users=user_ids
+        )
+        FreezeRun.objects.filter(pk__in=[run.pk for run in runs]).update(
+            created=created, updated=updated, frozen_at=timezone.now()
+        )
+        refresh_monthly_rollups(week_start, week_end, chunk_size, user_ids)
+
+    outcomes_frozen.send(
+        sender=GoalOutcome,
+        week_start=week_start,
+        week_end=week_end,
+        goals=Goal.objects.filter(is_active=True, user_id__in=user_ids),
+    )
+    return {"created": created, "updated": updated, "reused": False}
+
+
 def freeze_weekly_outcomes(
     week_start: Optional[date] = None,
     week_end: Optional[date] = None,
     dry_run: bool = False,
+    chunk_size: int = FREEZE_CHUNK_SIZE,
+    users: Optional[Iterable] = None,
 ) -> dict:
     """
     Summarise a week's study activity into GoalOutcome snapshots for active
     goals.
 
     By default (when week_start/week_end are not supplied), this function
-    only performs work on **Mondays** in the **Europe/London** timezone.
+    only performs work on **Mondays** in the default time zone.
     It then freezes the *previous* ISO week (Mon–Sun). If explicit dates
     are provided, it operates for that week regardless of the current day.
 
-    For each active Goal, it:
-      - Sums StudySession.duration_minutes for the week and converts to hours
-      (1 dp).
-      - Approximates lessons_completed via session count (if one session ≈ one
-      lesson).
-      - Marks `completed=True` if either weekly_hours_target or
-      weekly_lessons_target is met.
-      - Upserts (update_or_create) a GoalOutcome for (goal, week_start).
+    The work is set-based rather than per goal (see `freeze_outcomes`):
+      - One `GROUP BY goal_id` aggregate over the DailyStudyRollup table
+      sums minutes and session counts (lesson proxy) for the week.
+      - Active goals are streamed in id order with `.iterator()` and merged
+      against the aggregate, so memory stays flat however many goals exist.
+      - Outcomes are upserted in chunks with a single
+      `bulk_create(update_conflicts=True)` per chunk. Each chunk commits on
+      its own, so a long run never holds one giant transaction; re-running
+      a week is idempotent.
+
+    Every completed (non dry-run) call is recorded in the FreezeRun ledger
+    so `ensure_week_frozen` can skip the week afterwards, and refreshes the
+    MonthlyGoalRollup rows for the month(s) the week falls in. For large
+    runs split across processes, see goals.sharding.
+
+    With `users`, only those users' goals are frozen. Such runs are
+    single-flight per user (see `_freeze_for_users`): concurrent callers
+    for the same users wait for the in-flight run and reuse it. They are
+    recorded under "user:<id>" ledger scopes rather than the all-goals
+    row, so the week still counts as unfrozen for everyone else.
+
+    Hours are converted from minutes (1 dp) and `completed=True` is set if
+    either weekly_hours_target or weekly_lessons_target is met.
 
     Args:
         week_start (Optional[date]): Monday of the week to freeze. If None,
@@ -95,6 +571,9 @@ def freeze_weekly_outcomes(
         inferred.
         dry_run (bool): If True, prints what would be written without touching
         the DB.
+        chunk_size (int): Goals fetched and upserted per round trip.
+        users (Optional[Iterable]): Users (or user ids) to limit the
+        freeze to.
 
     Returns:
         dict: A summary with keys:
@@ -104,82 +583,342 @@ def freeze_weekly_outcomes(
             if skipped).
             - "week_end" (date | None): The effective Sunday used (or None if
             skipped).
+            - "reused" (bool): Only for `users` runs; True if an in-flight
+            run for the same users was reused.
     """
-    today_local = timezone.now().astimezone(ZoneInfo("Europe/London")).date()
-
-    # Only run automatically on Mondays, unless explicit range is provided
-    if today_local.weekday() != 0 and not (week_start and week_end):
+    week = resolve_freeze_week(week_start, week_end)
+    if week is None:
         return {"created": 0, "updated": 0, "week_start": None, "week_end":
                 None}
+    week_start, week_end = week
+
+    user_ids = None
+    if users is not None:
+        user_ids = [getattr(user, "pk", user) for user in users]
+        if not dry_run:
+            result = _freeze_for_users(
+                week_start, week_end, user_ids, chunk_size
+            )
+            return {**result, "week_start": week_start, "week_end": week_end}
 
-    if not week_start or not week_end:
-        week_start, week_end = last_week_range()
+    created, updated = freeze_outcomes(
+        week_start,
+        week_end,
+        dry_run=dry_run,
+        chunk_size=chunk_size,
+        users=user_ids,
+    )
 
-    created, updated = 0, 0
+    if not dry_run:
+        finish_freeze(week_start, week_end, created, updated, chunk_size)
 
-    for goal in Goal.objects.filter(is_active=True):
-        # Filter sessions by goal and date range (inclusive)
-        sessions = StudySession.objects.filter(
-            goal=goal,
-            started_at__date__gte=week_start,
-            started_at__date__lte=week_end,
-        )
+    return {
+        "created": created,
+        "updated": updated,
+        "week_start": week_start,
+        "week_end": week_end,
+    }
 
-        # ---- HOURS (from minutes) ----
-        total_minutes = (
-            sessions.aggregate(total=models.Sum("duration_minutes"))["total"]
-            or 0
-            )
-        hours = (Decimal(total_minutes) / Decimal(60)).quantize(
-            Decimal("0.1"), rounding=ROUND_HALF_UP
+
+def _week_totals(rows: Iterator[dict]) -> Iterator[Tuple[int, dict]]:
+    """
+    Group a (goal_id, week)-ordered aggregate stream by goal.
+
+    Yields:
+        Tuple[int, dict]: goal_id and {week_start: (minutes, sessions)}.
+    """
+    goal_id, weeks = None, {}
+    for row in rows:
+        if row["goal_id"] != goal_id:
+            if goal_id is not None:
+                yield goal_id, weeks
+            goal_id, weeks = row["goal_id"], {}
+        weeks[row["week"]] = (row["total"] or 0, row["sessions"] or 0)
+    if goal_id is not None:
+        yield goal_id, weeks
+
+
+def _backfill_rows(
+    goals: Iterator[Goal],
+    totals: Iterator[Tuple[int, dict]],
+    first_monday: date,
+    last_monday: date,
+    zone=None,
+    skip: frozenset = frozenset(),
+) -> Iterator[GoalOutcome]:
+    """
+    Merge goals with their weekly totals into unsaved GoalOutcome rows.
+
+    Both streams are ordered by goal id. Each goal gets one row per week
+    from the later of `first_monday` and the week it was created in, up to
+    `last_monday`; weeks without study get zero totals.
+
+    Args:
+        goals (Iterator[Goal]): Active goals in id order.
+        totals (Iterator[Tuple[int, dict]]): Output of `_week_totals`.
+        first_monday (date): Monday of the first week in the range.
+        last_monday (date): Monday of the last week in the range.
+        zone (tzinfo, optional): Zone the goals' creation dates are read
+        in (defaults to the current time zone).
+        skip (frozenset): (goal_id, week_start) pairs to leave out.
+
+    Yields:
+        GoalOutcome: One unsaved outcome per goal and week.
+    """
+    next_total = next(totals, None)
+    for goal in goals:
+        # Advance the aggregate stream up to this goal (merge join)
+        while next_total is not None and next_total[0] < goal.id:
+            next_total = next(totals, None)
+        weeks = {}
+        if next_total is not None and next_total[0] == goal.id:
+            weeks = next_total[1]
+
+        monday = max(
+            first_monday,
+            _monday_of_week(timezone.localdate(goal.created_at, zone)),
         )
+        while monday <= last_monday:
+            if (goal.id, monday) in skip:
+                monday += timedelta(weeks=1)
+                continue
+            total_minutes, lessons_count = weeks.get(monday, (0, 0))
+            yield GoalOutcome(
+                goal_id=goal.id,
+                week_start=monday,
+                **build_outcome_data(
+                    goal, total_minutes, lessons_count,
+                    _sunday_of_week(monday),
+                ),
+            )
+            monday += timedelta(weeks=1)
 
-        # ---- LESSONS (proxy by session count) ----
-        lessons_count = sessions.count()
-
-        # ---- Targets & completion (robust to Decimal/float/None) ----
-        hours_target_raw = getattr(goal, "weekly_hours_target", None)
-        lessons_target_raw = getattr(goal, "weekly_lessons_target", None)
-
-        hours_target = None
-        if hours_target_raw is not None:
-            # Normalize to Decimal safely even if model gives float
-            hours_target = Decimal(str(hours_target_raw))
-
-        lessons_target = None
-        if lessons_target_raw is not None:
-            lessons_target = int(lessons_target_raw)
-
-        completed = False
-        if hours_target is not None and hours >= hours_target:
-            completed = True
-        if lessons_target is not None and lessons_count >= lessons_target:
-            completed = True
-
-        data = {
-            "hours_completed": hours,
-            "lessons_completed": lessons_count,
-            "hours_target": hours_target_raw,
-            "lessons_target": lessons_target_raw,
-            "completed": completed,
-            "week_end": week_end,
-        }
-
-        if dry_run:
-            print(f"[DRY RUN] {goal} {week_start}–{week_end} → {data}")
-            continue
-
-        obj, created_flag = GoalOutcome.objects.update_or_create(
-            goal=goal,
-            week_start=week_start,
-            defaults=data,
+
+def backfill_outcomes(
+    date_from: date,
+    date_to: Optional[date] = None,
+    chunk_size: int = FREEZE_CHUNK_SIZE,
+    cohort: Optional[str] = None,
+) -> dict:
+    """
+    Freeze every week in a date range with one aggregate and bulk upserts.
+
+    The range is widened to whole ISO weeks and capped at last week, so an
+    in-progress week is never frozen. Instead of one `freeze_outcomes`
+    pass per week:
+      - One aggregate over DailyStudyRollup, grouped by (goal_id, week),
+      covers the whole range and is streamed in goal order.
+      - Active goals are streamed in id order and merged against it. Each
+      goal gets an outcome for every week from the one it was created in
+      (or the start of the range) onwards, so no outcomes are made up for
+      weeks before a goal existed.
+      - Outcomes are upserted in chunks of `chunk_size` rows, each in its
+      own transaction, so rerunning a range is idempotent.
+      - Provisional outcomes in the range (see goals.provisional) are
+      skipped, then finalised with one UPDATE and counted as updated.
+
+    Afterwards every week is recorded in the FreezeRun ledger, the monthly
+    rollups for the range are refreshed once, and `outcomes_frozen` is
+    sent for each week.
+
+    With `cohort`, only users in that time zone are frozen, "last week"
+    is theirs, and the weeks are recorded under its "tz:<name>" ledger
+    scope instead of the all-goals one.
+
+    Args:
+        date_from (date): Any day in the first week to freeze.
+        date_to (Optional[date]): Any day in the last week to freeze.
+        Defaults to (and is capped at) last week.
+        chunk_size (int): Outcome rows upserted per round trip.
+        cohort (Optional[str]): Time zone name of the users to freeze.
+
+    Returns:
+        dict: A summary with keys:
+            - "created" (int): Number of GoalOutcome rows created.
+            - "updated" (int): Number of GoalOutcome rows updated.
+            - "weeks" (int): Number of weeks frozen (0 if the range is
+            empty).
+            - "week_start" (date | None): Monday of the first week.
+            - "week_end" (date | None): Sunday of the last week.
+    """
+    zone, scope, users = None, FreezeRun.SCOPE_ALL, None
+    if cohort is not None:
+        zone, scope = ZoneInfo(cohort), timezone_scope(cohort)
+        users = cohort_users(cohort)
+
+    first_monday = _monday_of_week(date_from)
+    last_monday = last_week_range(timezone.localdate(timezone=zone))[0]
+    if date_to is not None:
+        last_monday = min(last_monday, _monday_of_week(date_to))
+    if last_monday < first_monday:
+        return {"created": 0, "updated": 0, "weeks": 0,
+                "week_start": None, "week_end": None}
+    last_sunday = _sunday_of_week(last_monday)
+
+    goals = (
+        Goal.objects.filter(is_active=True)
+        .order_by("id")
+        .only("id", "weekly_hours_target", "weekly_lessons_target",
+              "created_at")
+    )
+    rollups = DailyStudyRollup.objects.filter(
+        goal__is_active=True,
+        day__gte=first_monday,
+        day__lte=last_sunday,
+    )
+    provisional = GoalOutcome.objects.filter(
+        goal__is_active=True,
+        week_start__gte=first_monday,
+        week_start__lte=last_monday,
+        is_final=False,
+    )
+    if users is not None:
+        goals = goals.filter(user__in=users)
+        rollups = rollups.filter(goal__user__in=users)
+        provisional = provisional.filter(goal__user__in=users)
+    skip = frozenset(provisional.values_list("goal_id", "week_start"))
+
+    # One grouped aggregate for the whole range, streamed in goal order
+    totals = _week_totals(
+        rollups
+        .annotate(week=TruncWeek("day", output_field=models.DateField()))
+        .values("goal_id", "week")
+        .annotate(
+            total=models.Sum("minutes"),
+            sessions=models.Sum("session_count"),
+        )
+        .order_by("goal_id", "week")
+        .iterator(chunk_size=chunk_size)
+    )
+    rows = _backfill_rows(
+        goals.iterator(chunk_size=chunk_size), totals, first_monday,
+        last_monday, zone, skip,
+    )
+
+    created, updated = Counter(), Counter()
+    for batch in _chunked(rows, chunk_size):
+        goal_ids = {o.goal_id for o in batch}
+        with transaction.atomic():
+            existing = set(
+                GoalOutcome.objects.filter(
+                    goal_id__in=goal_ids,
+                    week_start__gte=first_monday,
+                    week_start__lte=last_monday,
+                ).values_list("goal_id", "week_start")
+            )
+            GoalOutcome.objects.bulk_create(
+                batch,
+                update_conflicts=True,
+                unique_fields=["goal", "week_start"],
+                update_fields=OUTCOME_UPDATE_FIELDS,
+            )
+        for o in batch:
+            if (o.goal_id, o.week_start) in existing:
+                updated[o.week_start] += 1
+            else:
+                created[o.week_start] += 1
+
+    if skip:
+        provisional.update(is_final=True, updated_at=timezone.now())
+        updated.update(monday for _, monday in skip)
+
+    mondays = []
+    monday = first_monday
+    while monday <= last_monday:
+        mondays.append(monday)
+        monday += timedelta(weeks=1)
+
+    FreezeRun.objects.bulk_create(
+        [
+            FreezeRun(
+                week_start=monday,
+                scope=scope,
+                created=created[monday],
+                updated=updated[monday],
+            )
+            for monday in mondays
+        ],
+        update_conflicts=True,
+        unique_fields=["week_start", "scope"],
+        update_fields=["created", "updated", "frozen_at"],
+    )
+    refresh_monthly_rollups(first_monday, last_sunday, chunk_size, users)
+    frozen_goals = Goal.objects.filter(is_active=True)
+    if users is not None:
+        frozen_goals = frozen_goals.filter(user__in=users)
+    for monday in mondays:
+        outcomes_frozen.send(
+            sender=GoalOutcome,
+            week_start=monday,
+            week_end=_sunday_of_week(monday),
+            goals=frozen_goals,
         )
-        created += int(created_flag)
-        updated += int(not created_flag)
 
     return {
-        "created": created,
-        "updated": updated,
-        "week_start": week_start,
-        "week_end": week_end,
+        "created": sum(created.values()),
+        "updated": sum(updated.values()),
+        "weeks": len(mondays),
+        "week_start": first_monday,
+        "week_end": last_sunday,
     }
+
+
+def is_week_frozen(
+    week_start: date, scopes: Iterable[str] = (FreezeRun.SCOPE_ALL,)
+) -> bool:
+    """
+    Return True if the FreezeRun ledger already has the given week.
+
+    Args:
+        week_start (date): Monday of the week to check.
+        scopes (Iterable[str]): Ledger scopes, any of which counts
+        (defaults to all goals).
+
+    Returns:
+        bool: Whether a completed freeze is recorded for the week.
+    """
+    return FreezeRun.objects.filter(
+        week_start=week_start, scope__in=list(scopes)
+    ).exists()
+
+
+def ensure_week_frozen(
+    week_start: date, week_end: date, user=None
+) -> Optional[dict]:
+    """
+    Freeze a week only if the ledger shows it has not been frozen yet.
+
+    Safe to call on every request: an already-frozen week costs one
+    indexed lookup and no writes. Only weeks missing from the ledger fall
+    through to a real `freeze_weekly_outcomes` run.
+
+    With `user`, the week counts as frozen if it was frozen for everyone,
+    for the cohort of the current time zone (the user's own during a
+    request, see UserTimezoneMiddleware) or for the user alone; otherwise
+    only the user's goals are frozen.
+
+    Args:
+        week_start (date): Monday of the week to freeze.
+        week_end (date): Sunday of the week to freeze.
+        user (User, optional): Limit the check and freeze to this user.
+
+    Returns:
+        dict | None: The freeze summary if a freeze ran, otherwise None.
+    """
+    if user is None:
+        if is_week_frozen(week_start):
+            return None
+        return freeze_weekly_outcomes(
+            week_start=week_start, week_end=week_end
+        )
+
+    scopes = [
+        FreezeRun.SCOPE_ALL,
+        timezone_scope(timezone.get_current_timezone_name()),
+        user_scope(user.pk),
+    ]
+    if is_week_frozen(week_start, scopes):
+        return None
+    return freeze_weekly_outcomes(
+        week_start=week_start, week_end=week_end, users=[user]
+    )
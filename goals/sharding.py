@@ -0,0 +1,201 @@
+"""Sharded, resumable weekly freeze.
+
+Active goals are split into shards by user-id range. Each shard is frozen
+with `goals.services.freeze_outcomes`, commits on its own, and is
+checkpointed as a FreezeRun row whose scope names the range
+("users:<low>-<high>"). A rerun for the same week skips checkpointed
+shards, so a crash only loses the shards that were in flight. Only
+checkpoints for exactly the ranges a run computes count, so a rerun with
+a different shard size re-freezes every shard instead of mixing
+overlapping ranges. Once every
+shard is done, the usual all-goals ledger row, monthly refresh and
+`outcomes_frozen` signal are written by `finish_freeze`.
+
+Shards run on a process pool. SQLite allows a single writer, so on SQLite
+the shards run one after another in the calling process instead.
+
+Model imports are deferred so that spawned workers can import this module
+before Django is set up.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from time import perf_counter
+
+import django
+
+#: Width of each shard's user-id range. Fixed rather than derived from the
+#: worker count so checkpoints stay valid when a rerun uses more workers.
+SHARD_SIZE = 1000
+
+
+def shard_scope(low, high):
+    """Return the FreezeRun scope naming a user-id range."""
+    return f"users:{low}-{high}"
+
+
+def shard_ranges(shard_size=SHARD_SIZE):
+    """
+    Return the user-id ranges that contain at least one active goal.
+
+    Args:
+        shard_size (int): Width of each range.
+
+    Returns:
+        list[tuple[int, int]]: Sorted [low, high) ranges.
+    """
+    from django.db.models import F
+
+    from .models import Goal
+
+    buckets = (
+        Goal.objects.filter(is_active=True)
+        .annotate(bucket=F("user_id") / shard_size)
+        .values_list("bucket", flat=True)
+        .order_by("bucket")
+        .distinct()
+    )
+    return [(b * shard_size, (b + 1) * shard_size) for b in buckets]
+
+
+def _init_worker():
+    """Prepare a pool process: set Django up (a no-op when forked)."""
+    django.setup()
+
+
+def freeze_shard(week_start, week_end, low, high, chunk_size):
+    """
+    Freeze one user-id range and checkpoint it.
+
+    Args:
+        week_start (date): Monday of the week to freeze.
+        week_end (date): Sunday of the week to freeze.
+        low (int): First user id in the shard.
+        high (int): User id one past the end of the shard.
+        chunk_size (int): Goals per round trip.
+
+    Returns:
+        dict: "low", "high", "created", "updated" and "seconds".
+    """
+    from .models import FreezeRun
+    from .services import freeze_outcomes
+
+    started = perf_counter()
+    created, updated = freeze_outcomes(
+        week_start, week_end, user_range=(low, high), chunk_size=chunk_size
+    )
+    FreezeRun.objects.update_or_create(
+        week_start=week_start,
+        scope=shard_scope(low, high),
+        defaults={"created": created, "updated": updated},
+    )
+    return {
+        "low": low,
+        "high": high,
+        "created": created,
+        "updated": updated,
+        "seconds": perf_counter() - started,
+    }
+
+
+def freeze_in_shards(
+    week_start,
+    week_end,
+    workers=1,
+    shard_size=SHARD_SIZE,
+    chunk_size=None,
+    restart=False,
+    on_shard=None,
+):
+    """
+    Freeze a week shard by shard, resuming from earlier checkpoints.
+
+    Args:
+        week_start (date): Monday of the week to freeze.
+        week_end (date): Sunday of the week to freeze.
+        workers (int): Processes to run shards on (forced to 1 on SQLite).
+        shard_size (int): Width of each shard's user-id range.
+        chunk_size (int | None): Goals per round trip (service default if
+        None).
+        restart (bool): Discard this week's shard checkpoints first.
+        on_shard (callable | None): Called with each shard's result dict
+        as it completes.
+
+    Returns:
+        dict: A summary with keys:
+            - "created" / "updated" (int): Outcomes written by this run.
+            - "shards" (int): Shards frozen by this run.
+            - "skipped" (int): Shards already checkpointed.
+            - "workers" (int): Processes actually used.
+    """
+    from django.db import connection, connections
+    from django.db.models import Sum
+
+    from .models import FreezeRun
+    from .services import FREEZE_CHUNK_SIZE, finish_freeze
+
+    chunk_size = chunk_size or FREEZE_CHUNK_SIZE
+    checkpoints = FreezeRun.objects.filter(
+        week_start=week_start, scope__startswith="users:"
+    )
+    if restart:
+        checkpoints.delete()
+
+    ranges = shard_ranges(shard_size)
+    # Checkpoints of other shard sizes overlap these ranges; ignore them
+    checkpoints = checkpoints.filter(
+        scope__in=[shard_scope(*r) for r in ranges]
+    )
+    done = set(checkpoints.values_list("scope", flat=True))
+    pending = [r for r in ranges if shard_scope(*r) not in done]
+
+    if connection.vendor == "sqlite":
+        workers = 1
+
+    results = []
+    if workers <= 1:
+        for low, high in pending:
+            result = freeze_shard(week_start, week_end, low, high, chunk_size)
+            results.append(result)
+            if on_shard:
+                on_shard(result)
+    else:
+        # Children must open their own connections, never share ours
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker
+        ) as pool:
+            futures = [
+                pool.submit(
+                    freeze_shard, week_start, week_end, low, high, chunk_size
+                )
+                for low, high in pending
+            ]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                if on_shard:
+                    on_shard(result)
+
+    created = sum(r["created"] for r in results)
+    updated = sum(r["updated"] for r in results)
+
+    # Ledger totals cover every shard of this size, including ones
+    # checkpointed by earlier runs
+    totals = checkpoints.aggregate(
+        created=Sum("created"), updated=Sum("updated")
+    )
+    finish_freeze(
+        week_start,
+        week_end,
+        totals["created"] or 0,
+        totals["updated"] or 0,
+        chunk_size,
+    )
+
+    return {
+        "created": created,
+        "updated": updated,
+        "shards": len(results),
+        "skipped": len(ranges) - len(pending),
+        "workers": workers,
+    }
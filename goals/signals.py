@@ -0,0 +1,16 @@
+"""Custom signals sent by the goals app.
+
+`outcomes_frozen` is sent after GoalOutcome rows have been written in bulk
+by the freezing services. Bulk upserts bypass the model's post_save
+signal, so other apps that derive data from outcomes listen for this
+instead.
+
+Keyword arguments sent with `outcomes_frozen`:
+    week_start (date): Monday of the frozen week.
+    week_end (date): Sunday of the frozen week.
+    goals (QuerySet[Goal]): The goals whose outcomes were written.
+"""
+
+from django.dispatch import Signal
+
+outcomes_frozen = Signal()
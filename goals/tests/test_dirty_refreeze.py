@@ -0,0 +1,142 @@
+# goals/tests/test_dirty_refreeze.py
+from datetime import date, datetime, time, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from courses.models import Course
+from goals.dirty import mark_dirty, refreeze_dirty_outcomes
+from goals.models import DirtyOutcome, Goal, GoalOutcome
+from goals.services import freeze_weekly_outcomes, last_week_range
+from study_sessions.models import StudySession
+from tracker.models import UserPreference
+
+
+class DirtyRefreezeTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="late", password="pw"
+        )
+        self.week_start, self.week_end = last_week_range()
+        self.goals = [self.add_goal(i) for i in range(2)]
+        self.goal = self.goals[0]
+        self.session = self.log(self.goal, 30)
+        freeze_weekly_outcomes(
+            week_start=self.week_start, week_end=self.week_end
+        )
+        # The fixture session was logged before the freeze
+        DirtyOutcome.objects.all().delete()
+
+    def add_goal(self, i):
+        course = Course.objects.create(title=f"Course {i}", owner=self.user)
+        return Goal.objects.create(
+            user=self.user, course=course, weekly_hours_target=1
+        )
+
+    def log(self, goal, minutes, day=None):
+        return StudySession.objects.create(
+            user=self.user,
+            course=goal.course,
+            goal=goal,
+            duration_minutes=minutes,
+            started_at=timezone.make_aware(
+                datetime.combine(day or self.week_start, time(12))
+            ),
+        )
+
+    def outcome(self, goal=None):
+        return GoalOutcome.objects.get(
+            goal=goal or self.goal, week_start=self.week_start
+        )
+
+    def queued(self):
+        return set(DirtyOutcome.objects.values_list("goal_id", "week_start"))
+
+    def test_backdated_session_refreezes_only_its_pair(self):
+        untouched = self.outcome(self.goals[1]).updated_at
+        self.log(self.goal, 60)
+        self.assertEqual(self.queued(), {(self.goal.pk, self.week_start)})
+
+        result = refreeze_dirty_outcomes()
+
+        self.assertEqual(result, {"refrozen": 1, "cleared": 1})
+        outcome = self.outcome()
+        self.assertEqual(outcome.hours_completed, Decimal("1.5"))
+        self.assertTrue(outcome.completed)
+        self.assertEqual(self.outcome(self.goals[1]).updated_at, untouched)
+        self.assertFalse(DirtyOutcome.objects.exists())
+
+    def test_moved_and_deleted_sessions_queue_both_weeks(self):
+        earlier = self.week_start - timedelta(weeks=1)
+        self.session.started_at -= timedelta(weeks=1)
+        self.session.save()
+        self.assertEqual(self.queued(), {
+            (self.goal.pk, self.week_start), (self.goal.pk, earlier),
+        })
+
+        self.session.delete()
+        refreeze_dirty_outcomes()
+
+        # The earlier week was never frozen, so nothing is made up for it
+        self.assertEqual(self.outcome().hours_completed, Decimal("0.0"))
+        self.assertFalse(
+            GoalOutcome.objects.filter(week_start=earlier).exists()
+        )
+
+    def test_target_edit_queues_outcomes_with_old_targets(self):
+        self.goal.weekly_hours_target = Decimal("0.5")
+        self.goal.save()
+        self.goals[1].milestone_name = "Unchanged targets"
+        self.goals[1].save()
+        self.assertEqual(self.queued(), {(self.goal.pk, self.week_start)})
+
+        refreeze_dirty_outcomes()
+
+        outcome = self.outcome()
+        self.assertEqual(outcome.hours_target, Decimal("0.5"))
+        self.assertTrue(outcome.completed)
+
+    def test_current_week_is_not_queued(self):
+        self.log(self.goal, 30, day=timezone.localdate())
+        self.assertFalse(DirtyOutcome.objects.exists())
+
+    def test_cutoff_uses_the_owners_time_zone(self):
+        # Sunday noon UTC is already Monday in Kiritimati (UTC+14)
+        sunday = datetime(2025, 11, 9, 12, tzinfo=dt_timezone.utc)
+        pair = [(self.goal.pk, date(2025, 11, 3))]
+        with patch("django.utils.timezone.now", return_value=sunday):
+            self.assertEqual(mark_dirty(pair, self.user), 0)
+            UserPreference.objects.create(
+                user=self.user, timezone="Pacific/Kiritimati"
+            )
+            user = get_user_model().objects.get(pk=self.user.pk)
+            self.assertEqual(mark_dirty(pair, user), 1)
+
+    def test_queries_do_not_grow_with_queued_pairs(self):
+        def count(goals):
+            for goal in goals:
+                self.log(goal, 15)
+            with CaptureQueriesContext(connection) as ctx:
+                refreeze_dirty_outcomes()
+            return len(ctx.captured_queries)
+
+        few = count(self.goals[:1])
+        more = [self.add_goal(i) for i in range(2, 6)]
+        freeze_weekly_outcomes(
+            week_start=self.week_start, week_end=self.week_end
+        )
+        self.assertEqual(count(self.goals + more), few)
+
+    def test_command(self):
+        self.log(self.goal, 60)
+        out = StringIO()
+        call_command("refreeze_dirty_outcomes", stdout=out)
+        self.assertIn("Re-froze 1 outcome(s)", out.getvalue())
@@ -0,0 +1,150 @@
+# goals/tests/test_freeze_backfill.py
+from datetime import date, datetime, time, timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils import timezone
+
+from courses.models import Course
+from goals.models import FreezeRun, Goal, GoalOutcome, MonthlyGoalRollup
+from goals.services import (
+    backfill_outcomes,
+    freeze_weekly_outcomes,
+    last_week_range,
+)
+from study_sessions.models import StudySession
+
+
+def aware(day, hour=12):
+    return timezone.make_aware(datetime.combine(day, time(hour)))
+
+
+class BackfillOutcomesTests(TestCase):
+    # Mon 6 Oct – Sun 2 Nov 2025: four weeks across a month boundary
+    date_from = date(2025, 10, 6)
+    date_to = date(2025, 11, 2)
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="backfill", password="pw"
+        )
+        self.old, self.new = [
+            Goal.objects.create(
+                user=self.user,
+                course=Course.objects.create(title=title, owner=self.user),
+                weekly_hours_target=1,
+                weekly_lessons_target=3,
+            )
+            for title in ("History", "Geography")
+        ]
+        Goal.objects.filter(pk=self.old.pk).update(
+            created_at=aware(date(2025, 1, 1))
+        )
+        # Created on the Wednesday of the third week
+        Goal.objects.filter(pk=self.new.pk).update(
+            created_at=aware(date(2025, 10, 22))
+        )
+        for goal, day, minutes in [
+            (self.old, date(2025, 10, 6), 60),
+            (self.old, date(2025, 10, 12), 30),
+            (self.old, date(2025, 10, 31), 45),
+            (self.old, date(2025, 11, 1), 45),
+            (self.new, date(2025, 10, 23), 20),
+        ]:
+            StudySession.objects.create(
+                user=self.user,
+                course=goal.course,
+                goal=goal,
+                duration_minutes=minutes,
+                started_at=aware(day),
+            )
+
+    def outcomes(self):
+        return {
+            (o.goal_id, o.week_start): (
+                o.week_end, o.hours_completed, o.lessons_completed,
+                o.completed,
+            )
+            for o in GoalOutcome.objects.all()
+        }
+
+    def test_matches_weekly_freeze(self):
+        result = backfill_outcomes(self.date_from, self.date_to)
+        backfilled = self.outcomes()
+        months = set(MonthlyGoalRollup.objects.values_list(
+            "goal_id", "month", "minutes"
+        ))
+
+        GoalOutcome.objects.all().delete()
+        MonthlyGoalRollup.objects.all().delete()
+        FreezeRun.objects.all().delete()
+        for week in range(4):
+            week_start = self.date_from + timedelta(weeks=week)
+            freeze_weekly_outcomes(
+                week_start=week_start,
+                week_end=week_start + timedelta(days=6),
+            )
+        expected = {
+            key: value for key, value in self.outcomes().items()
+            if key[0] == self.old.pk or key[1] >= date(2025, 10, 20)
+        }
+
+        self.assertEqual(backfilled, expected)
+        self.assertEqual(months, set(MonthlyGoalRollup.objects.values_list(
+            "goal_id", "month", "minutes"
+        )))
+        self.assertEqual(result["weeks"], 4)
+        self.assertEqual(result["created"], 6)
+
+    def test_no_outcomes_before_goal_existed(self):
+        backfill_outcomes(self.date_from, self.date_to)
+
+        self.assertEqual(
+            list(
+                GoalOutcome.objects.filter(goal=self.new)
+                .order_by("week_start")
+                .values_list("week_start", flat=True)
+            ),
+            [date(2025, 10, 20), date(2025, 10, 27)],
+        )
+
+    def test_records_ledger_and_is_idempotent(self):
+        backfill_outcomes(self.date_from, self.date_to)
+        result = backfill_outcomes(self.date_from, self.date_to)
+
+        self.assertEqual((result["created"], result["updated"]), (0, 6))
+        self.assertEqual(
+            FreezeRun.objects.filter(scope=FreezeRun.SCOPE_ALL).count(), 4
+        )
+        self.assertEqual(
+            FreezeRun.objects.get(week_start=date(2025, 10, 27)).updated, 2
+        )
+
+    def test_stops_at_last_completed_week(self):
+        result = backfill_outcomes(
+            last_week_range()[0], timezone.localdate()
+        )
+
+        self.assertEqual(result["weeks"], 1)
+        self.assertEqual(result["week_end"], last_week_range()[1])
+
+    def test_command(self):
+        out = StringIO()
+        call_command(
+            "freeze_goal_outcomes",
+            "--from", self.date_from.isoformat(),
+            "--to", self.date_to.isoformat(),
+            stdout=out,
+        )
+        self.assertIn("(4) | created: 6", out.getvalue())
+
+        with self.assertRaises(CommandError):
+            call_command(
+                "freeze_goal_outcomes",
+                "--from", self.date_from.isoformat(),
+                "--workers", "2",
+                stdout=StringIO(),
+            )
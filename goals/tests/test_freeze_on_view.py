@@ -9,8 +9,8 @@ from django.test import TestCase, Client, override_settings
 from django.urls import reverse
 from django.utils import timezone
 from courses.models import Course
-from goals.models import Goal, GoalOutcome
-from goals.services import last_week_range
+from goals.models import FreezeRun, Goal, GoalOutcome
+from goals.services import last_week_range, user_scope
 from study_sessions.models import StudySession
 
 
@@ -53,3 +53,34 @@ class WeeklyFreezeOnViewTests(TestCase):
         # Idempotent: hitting the page again does not create duplicates
         client.get(url)
         self.assertEqual(GoalOutcome.objects.filter(goal=goal, week_start=ws).count(), 1)
+
+    @patch("goals.services.timezone.now")
+    def test_frozen_week_is_not_refrozen_on_later_views(self, mock_now):
+        mock_now.return_value = datetime(
+            2025, 11, 4, 9, 0, tzinfo=ZoneInfo("Europe/London")
+        )
+
+        User = get_user_model()
+        user = User.objects.create_user(
+            username="ledger", email="l@example.com", password="pw"
+        )
+        goal = Goal.objects.create(
+            user=user, weekly_hours_target=Decimal("1.0")
+        )
+        ws, _ = last_week_range(today=mock_now.return_value.date())
+
+        client = Client()
+        client.force_login(user)
+        url = reverse("goals:detail", args=[goal.pk])
+
+        client.get(url)
+        # The view only freezes the requesting user's goals
+        self.assertTrue(FreezeRun.objects.filter(
+            week_start=ws, scope=user_scope(user.pk)
+        ).exists())
+
+        # Once the ledger has the week, later views skip the freeze entirely
+        with patch("goals.services.freeze_weekly_outcomes") as mock_freeze:
+            resp = client.get(url)
+        self.assertEqual(resp.status_code, 200)
+        mock_freeze.assert_not_called()
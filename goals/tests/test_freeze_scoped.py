@@ -0,0 +1,85 @@
+# goals/tests/test_freeze_scoped.py
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from courses.models import Course
+from goals.models import FreezeRun, Goal, GoalOutcome
+from goals.services import freeze_weekly_outcomes, last_week_range, user_scope
+from study_sessions.models import StudySession
+
+
+class ScopedFreezeTests(TestCase):
+    def setUp(self):
+        self.week_start, self.week_end = last_week_range()
+        self.users = []
+        for name in ("mine", "theirs"):
+            user = get_user_model().objects.create_user(
+                username=name, password="pw"
+            )
+            course = Course.objects.create(title=f"{name} course", owner=user)
+            goal = Goal.objects.create(
+                user=user, course=course, weekly_hours_target=1
+            )
+            StudySession.objects.create(
+                user=user, course=course, goal=goal, duration_minutes=90,
+                started_at=timezone.make_aware(
+                    datetime.combine(self.week_start, time(10))
+                ),
+            )
+            self.users.append(user)
+        self.me = self.users[0]
+
+    def freeze(self):
+        return freeze_weekly_outcomes(
+            week_start=self.week_start,
+            week_end=self.week_end,
+            users=[self.me],
+        )
+
+    def test_only_freezes_the_users_goals(self):
+        result = self.freeze()
+
+        self.assertEqual((result["created"], result["reused"]), (1, False))
+        self.assertEqual(
+            list(GoalOutcome.objects.values_list("goal__user", flat=True)),
+            [self.me.pk],
+        )
+        self.assertEqual(
+            list(FreezeRun.objects.values_list("scope", flat=True)),
+            [user_scope(self.me.pk)],
+        )
+
+    def test_sequential_calls_refreeze(self):
+        self.freeze()
+        result = self.freeze()
+        self.assertEqual((result["updated"], result["reused"]), (1, False))
+
+    def test_reuses_a_run_that_finished_while_waiting(self):
+        self.freeze()
+        # As if another request's run committed after this one started
+        FreezeRun.objects.update(
+            frozen_at=timezone.now() + timedelta(minutes=1)
+        )
+        GoalOutcome.objects.all().delete()
+
+        result = self.freeze()
+
+        self.assertTrue(result["reused"])
+        self.assertFalse(GoalOutcome.objects.exists())
+
+    def test_view_requires_login_and_post(self):
+        url = reverse("goals:freeze")
+        self.assertEqual(self.client.post(url).status_code, 302)
+        self.assertFalse(GoalOutcome.objects.exists())
+
+        self.client.force_login(self.me)
+        self.assertEqual(self.client.get(url).status_code, 405)
+        self.assertRedirects(self.client.post(url), reverse("goals:list"))
+        self.assertEqual(
+            list(GoalOutcome.objects.values_list("goal__user", flat=True)),
+            [self.me.pk],
+        )
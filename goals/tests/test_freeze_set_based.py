@@ -0,0 +1,168 @@
+# goals/tests/test_freeze_set_based.py
+from datetime import datetime, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from zoneinfo import ZoneInfo
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Sum
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from courses.models import Course
+from goals.models import Goal, GoalOutcome
+from goals.services import freeze_weekly_outcomes
+from study_sessions.models import StudySession
+
+LONDON = ZoneInfo("Europe/London")
+
+
+def per_goal_reference(week_start, week_end):
+    """The original per-goal freeze loop, kept as the expected output."""
+    expected = {}
+    for goal in Goal.objects.filter(is_active=True):
+        sessions = StudySession.objects.filter(
+            goal=goal,
+            started_at__date__gte=week_start,
+            started_at__date__lte=week_end,
+        )
+        total = sessions.aggregate(t=Sum("duration_minutes"))["t"] or 0
+        hours = (Decimal(total) / Decimal(60)).quantize(
+            Decimal("0.1"), rounding=ROUND_HALF_UP
+        )
+        lessons = sessions.count()
+        completed = False
+        if (
+            goal.weekly_hours_target is not None
+            and hours >= Decimal(str(goal.weekly_hours_target))
+        ):
+            completed = True
+        if (
+            goal.weekly_lessons_target is not None
+            and lessons >= goal.weekly_lessons_target
+        ):
+            completed = True
+        expected[goal.pk] = {
+            "week_end": week_end,
+            "hours_completed": hours,
+            "lessons_completed": lessons,
+            "hours_target": goal.weekly_hours_target,
+            "lessons_target": goal.weekly_lessons_target,
+            "completed": completed,
+        }
+    return expected
+
+
+def frozen_rows(week_start):
+    return {
+        o.goal_id: {
+            "week_end": o.week_end,
+            "hours_completed": o.hours_completed,
+            "lessons_completed": o.lessons_completed,
+            "hours_target": o.hours_target,
+            "lessons_target": o.lessons_target,
+            "completed": o.completed,
+        }
+        for o in GoalOutcome.objects.filter(week_start=week_start)
+    }
+
+
+@override_settings(TIME_ZONE="Europe/London", USE_TZ=True)
+class SetBasedFreezeTests(TestCase):
+    week_start = datetime(2025, 10, 27).date()
+    week_end = week_start + timedelta(days=6)
+
+    def setUp(self):
+        User = get_user_model()
+        self.users = [
+            User.objects.create_user(username=f"u{i}", password="pw")
+            for i in range(3)
+        ]
+        targets = [
+            {"weekly_hours_target": Decimal("1.5")},
+            {"weekly_lessons_target": 2},
+            {"weekly_hours_target": Decimal("3.0"),
+             "weekly_lessons_target": 5},
+            {"total_required_lessons": 10},
+        ]
+        self.goals = []
+        for n, user in enumerate(self.users):
+            course = Course.objects.create(title=f"Course {n}", owner=user)
+            for i, kwargs in enumerate(targets):
+                goal = Goal.objects.create(user=user, course=course, **kwargs)
+                self.goals.append(goal)
+                # Spread sessions across the week and its neighbours
+                for day in range(-1, 8, 1 + (i + n) % 3):
+                    StudySession.objects.create(
+                        user=user,
+                        course=course,
+                        goal=goal,
+                        duration_minutes=25 + 10 * i + day,
+                        started_at=timezone.make_aware(
+                            datetime.combine(
+                                self.week_start + timedelta(days=day),
+                                datetime.min.time(),
+                            ) + timedelta(hours=23, minutes=30),
+                            LONDON,
+                        ),
+                    )
+
+        # Inactive goals are never frozen
+        self.goals[1].is_active = False
+        self.goals[1].save()
+
+        # An existing outcome is updated in place, keeping its notes
+        GoalOutcome.objects.create(
+            goal=self.goals[0],
+            week_start=self.week_start,
+            week_end=self.week_end,
+            notes="kept",
+        )
+
+    def test_matches_per_goal_results(self):
+        expected = per_goal_reference(self.week_start, self.week_end)
+
+        result = freeze_weekly_outcomes(
+            week_start=self.week_start,
+            week_end=self.week_end,
+            chunk_size=3,
+        )
+
+        self.assertEqual(frozen_rows(self.week_start), expected)
+        self.assertEqual(result["created"], len(expected) - 1)
+        self.assertEqual(result["updated"], 1)
+        self.assertEqual(
+            GoalOutcome.objects.get(goal=self.goals[0]).notes, "kept"
+        )
+
+    def test_rerun_is_idempotent(self):
+        freeze_weekly_outcomes(
+            week_start=self.week_start, week_end=self.week_end
+        )
+        first = frozen_rows(self.week_start)
+
+        result = freeze_weekly_outcomes(
+            week_start=self.week_start, week_end=self.week_end
+        )
+
+        self.assertEqual(frozen_rows(self.week_start), first)
+        self.assertEqual(result["created"], 0)
+        self.assertEqual(result["updated"], len(first))
+
+    def test_query_count_does_not_grow_with_goals(self):
+        def count_queries():
+            with CaptureQueriesContext(connection) as ctx:
+                freeze_weekly_outcomes(
+                    week_start=self.week_start, week_end=self.week_end
+                )
+            return len(ctx.captured_queries)
+
+        # Warm up so both measured runs take the same ledger path
+        count_queries()
+        before = count_queries()
+        for _ in range(20):
+            Goal.objects.create(
+                user=self.users[0], weekly_hours_target=Decimal("1.0")
+            )
+        self.assertEqual(count_queries(), before)
@@ -0,0 +1,144 @@
+# goals/tests/test_freeze_sharded.py
+from datetime import date, datetime, time, timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils import timezone
+
+from courses.models import Course
+from goals.models import FreezeRun, Goal, GoalOutcome
+from goals.services import freeze_weekly_outcomes
+from goals.sharding import freeze_in_shards, shard_ranges, shard_scope
+from study_sessions.models import StudySession
+
+
+class ShardedFreezeTests(TestCase):
+    week_start = date(2025, 10, 27)
+    week_end = week_start + timedelta(days=6)
+
+    def setUp(self):
+        User = get_user_model()
+        for i in range(5):
+            user = User.objects.create_user(username=f"s{i}", password="pw")
+            course = Course.objects.create(title=f"Course {i}", owner=user)
+            goal = Goal.objects.create(
+                user=user, course=course, weekly_hours_target=1
+            )
+            StudySession.objects.create(
+                user=user,
+                course=course,
+                goal=goal,
+                duration_minutes=30 * (i + 1),
+                started_at=timezone.make_aware(
+                    datetime.combine(self.week_start, time(10))
+                ),
+            )
+        self.shard_size = 2
+
+    def outcomes(self):
+        return dict(
+            GoalOutcome.objects.filter(week_start=self.week_start)
+            .values_list("goal_id", "hours_completed")
+        )
+
+    def test_matches_unsharded_freeze(self):
+        freeze_weekly_outcomes(
+            week_start=self.week_start, week_end=self.week_end
+        )
+        expected = self.outcomes()
+        GoalOutcome.objects.all().delete()
+        FreezeRun.objects.all().delete()
+
+        result = freeze_in_shards(
+            self.week_start, self.week_end, shard_size=self.shard_size
+        )
+
+        self.assertEqual(self.outcomes(), expected)
+        self.assertEqual(result["created"], 5)
+        self.assertEqual(result["shards"], len(shard_ranges(self.shard_size)))
+        ledger = FreezeRun.objects.get(
+            week_start=self.week_start, scope=FreezeRun.SCOPE_ALL
+        )
+        self.assertEqual(ledger.created, 5)
+
+    def test_resume_skips_checkpointed_shards(self):
+        first = shard_ranges(self.shard_size)[0]
+        FreezeRun.objects.create(
+            week_start=self.week_start, scope=shard_scope(*first), created=2
+        )
+
+        result = freeze_in_shards(
+            self.week_start, self.week_end, shard_size=self.shard_size
+        )
+
+        self.assertEqual(result["skipped"], 1)
+        self.assertEqual(
+            result["shards"], len(shard_ranges(self.shard_size)) - 1
+        )
+        skipped_users = range(*first)
+        self.assertFalse(
+            GoalOutcome.objects.filter(
+                goal__user_id__in=skipped_users
+            ).exists()
+        )
+
+    def test_resume_with_another_shard_size_ignores_old_checkpoints(self):
+        freeze_in_shards(self.week_start, self.week_end, shard_size=1)
+
+        result = freeze_in_shards(
+            self.week_start, self.week_end, shard_size=self.shard_size
+        )
+
+        self.assertEqual(result["skipped"], 0)
+        ledger = FreezeRun.objects.get(
+            week_start=self.week_start, scope=FreezeRun.SCOPE_ALL
+        )
+        self.assertEqual((ledger.created, ledger.updated), (0, 5))
+
+    def test_restart_discards_checkpoints(self):
+        freeze_in_shards(
+            self.week_start, self.week_end, shard_size=self.shard_size
+        )
+        result = freeze_in_shards(
+            self.week_start,
+            self.week_end,
+            shard_size=self.shard_size,
+            restart=True,
+        )
+
+        self.assertEqual(result["skipped"], 0)
+        self.assertEqual(result["updated"], 5)
+
+    def test_sqlite_runs_serially(self):
+        result = freeze_in_shards(
+            self.week_start, self.week_end, workers=4,
+            shard_size=self.shard_size,
+        )
+        self.assertEqual(result["workers"], 1)
+
+    def test_command_reports_shard_throughput(self):
+        out = StringIO()
+        call_command(
+            "freeze_goal_outcomes",
+            "--workers", "2",
+            "--shard-size", "2",
+            "--week-start", self.week_start.isoformat(),
+            stdout=out,
+        )
+        self.assertIn("goals/s", out.getvalue())
+        self.assertEqual(len(self.outcomes()), 5)
+
+    def test_command_rejects_non_monday_and_dry_run(self):
+        with self.assertRaises(CommandError):
+            call_command(
+                "freeze_goal_outcomes", "--week-start", "2025-10-28",
+                stdout=StringIO(),
+            )
+        with self.assertRaises(CommandError):
+            call_command(
+                "freeze_goal_outcomes", "--workers", "2", "--dry-run",
+                stdout=StringIO(),
+            )
@@ -0,0 +1,85 @@
+# goals/tests/test_monthly_rollups.py
+from datetime import date, datetime, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from courses.models import Course
+from goals.models import Goal, MonthlyGoalRollup
+from goals.services import freeze_weekly_outcomes
+from study_sessions.models import StudySession
+
+
+class MonthlyGoalRollupTests(TestCase):
+    # Mon 27 Oct – Sun 2 Nov 2025 spans two months
+    week_start = date(2025, 10, 27)
+    week_end = week_start + timedelta(days=6)
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="monthly", password="pw"
+        )
+        self.course = Course.objects.create(title="Chemistry", owner=self.user)
+        self.goal = Goal.objects.create(
+            user=self.user, course=self.course, weekly_hours_target=1
+        )
+
+    def log(self, day, minutes):
+        StudySession.objects.create(
+            user=self.user,
+            course=self.course,
+            goal=self.goal,
+            duration_minutes=minutes,
+            started_at=timezone.make_aware(
+                datetime.combine(day, time(12))
+            ),
+        )
+
+    def months(self):
+        return dict(
+            MonthlyGoalRollup.objects.filter(goal=self.goal)
+            .values_list("month", "minutes")
+        )
+
+    def freeze(self, week_start):
+        freeze_weekly_outcomes(
+            week_start=week_start, week_end=week_start + timedelta(days=6)
+        )
+
+    def test_week_spanning_months_is_split_by_day(self):
+        self.log(date(2025, 10, 30), 60)
+        self.log(date(2025, 11, 1), 30)
+        # Not yet frozen, so not counted
+        self.log(date(2025, 11, 5), 45)
+
+        self.freeze(self.week_start)
+
+        self.assertEqual(
+            self.months(),
+            {date(2025, 10, 1): 60, date(2025, 11, 1): 30},
+        )
+
+    def test_refreeze_and_older_week_keep_later_coverage(self):
+        self.log(date(2025, 11, 1), 30)
+        self.log(date(2025, 11, 5), 45)
+        self.freeze(self.week_start + timedelta(days=7))
+        self.assertEqual(self.months(), {date(2025, 11, 1): 75})
+
+        # Re-freezing the earlier week must not drop the later one
+        self.freeze(self.week_start)
+        self.assertEqual(self.months(), {date(2025, 11, 1): 75})
+
+    def test_dashboard_reads_monthly_rows(self):
+        this_month = timezone.localdate().replace(day=1)
+        MonthlyGoalRollup.objects.create(
+            goal=self.goal, month=this_month, minutes=90
+        )
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse("tracker:dashboard"))
+
+        datasets = response.context["monthly_datasets_json"]
+        self.assertIn('"data": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1.5]',
+                      datasets)
@@ -0,0 +1,82 @@
+# goals/tests/test_projection.py
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from courses.models import Course
+from goals.models import Goal
+from study_sessions.models import StudySession
+
+
+class ProjectionTests(TestCase):
+    today = date(2025, 11, 3)
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="pace", password="pw"
+        )
+        for i in range(3):
+            course = Course.objects.create(title=f"Maths {i}", owner=self.user)
+            goal = Goal.objects.create(
+                user=self.user,
+                course=course,
+                weekly_hours_target=2,
+                total_required_lessons=10,
+                avg_hours_per_lesson=Decimal("1.0"),
+            )
+            # 1h on each of three days, starting two weeks before `today`
+            for day in range(3):
+                StudySession.objects.create(
+                    user=self.user,
+                    course=course,
+                    goal=goal,
+                    duration_minutes=60 * (i + 1),
+                    started_at=timezone.make_aware(datetime.combine(
+                        self.today - timedelta(weeks=2, days=-day), time(9)
+                    )),
+                )
+
+    def test_pace_and_projection(self):
+        goal = Goal.objects.with_projection().get(course__title="Maths 0")
+
+        # 3h over two weeks; 7h remaining at 1.5h a week
+        self.assertEqual(goal.study_pace_hours_per_week(self.today), 1.5)
+        self.assertEqual(
+            goal.projected_completion_date(self.today),
+            self.today + timedelta(weeks=7 / 1.5),
+        )
+        self.assertEqual(goal.overall_progress_percent(), 30)
+
+    def test_annotated_matches_per_goal_queries(self):
+        plain = {
+            g.pk: g.projected_completion_date(self.today)
+            for g in Goal.objects.all()
+        }
+        annotated = {
+            g.pk: g.projected_completion_date(self.today)
+            for g in Goal.objects.with_progress().with_projection()
+        }
+        self.assertEqual(annotated, plain)
+
+    def test_constant_queries_and_no_fanout_with_progress(self):
+        with CaptureQueriesContext(connection) as ctx:
+            goals = list(
+                Goal.objects.with_progress().with_projection()
+                .order_by("course__title")
+            )
+            for goal in goals:
+                goal.projected_completion_date(self.today)
+                goal.overall_progress_percent()
+                goal.total_study_minutes()
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(
+            [g.projection_total_minutes for g in goals], [180, 360, 540]
+        )
+        self.assertEqual(
+            [g.progress_total_minutes for g in goals], [180, 360, 540]
+        )
@@ -0,0 +1,169 @@
+# goals/tests/test_provisional.py
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from courses.models import Course
+from goals.models import Goal, GoalOutcome
+from goals.services import (
+    backfill_outcomes,
+    freeze_weekly_outcomes,
+    last_week_range,
+)
+from study_sessions.models import StudySession
+
+
+class ProvisionalOutcomeTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="live", password="pw"
+        )
+        course = Course.objects.create(title="Live", owner=self.user)
+        self.goal = Goal.objects.create(
+            user=self.user, course=course, weekly_hours_target=1
+        )
+        today = timezone.localdate()
+        self.week_start = today - timedelta(days=today.weekday())
+
+    def log(self, minutes, day=None):
+        return StudySession.objects.create(
+            user=self.user,
+            course=self.goal.course,
+            goal=self.goal,
+            duration_minutes=minutes,
+            started_at=timezone.make_aware(
+                datetime.combine(day or self.week_start, time(12))
+            ),
+        )
+
+    def outcome(self, week_start=None):
+        return GoalOutcome.objects.get(
+            goal=self.goal, week_start=week_start or self.week_start
+        )
+
+    def test_sessions_update_the_row_in_place(self):
+        self.log(20)
+        outcome = self.outcome()
+        self.assertFalse(outcome.is_final)
+        self.assertEqual(outcome.minutes_completed, 20)
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.log(25)
+        statements = [
+            q["sql"] for q in ctx.captured_queries
+            if "goals_goaloutcome" in q["sql"]
+        ]
+        self.assertEqual(len(statements), 1)
+        self.assertTrue(statements[0].startswith("UPDATE"))
+
+        outcome = self.outcome()
+        self.assertEqual(
+            (outcome.minutes_completed, outcome.lessons_completed), (45, 2)
+        )
+        self.assertEqual(outcome.hours_completed, Decimal("0.8"))
+        self.assertFalse(outcome.completed)
+
+        self.log(15)
+        outcome = self.outcome()
+        self.assertEqual(outcome.hours_completed, Decimal("1.0"))
+        self.assertTrue(outcome.completed)
+
+    def test_edits_moves_and_deletes_are_subtracted(self):
+        first, second = self.log(30), self.log(40)
+        first.duration_minutes = 50
+        first.save()
+        self.assertEqual(self.outcome().minutes_completed, 90)
+
+        second.started_at -= timedelta(weeks=1)
+        second.save()
+        first.delete()
+        outcome = self.outcome()
+        self.assertEqual(
+            (outcome.minutes_completed, outcome.lessons_completed), (0, 0)
+        )
+        # No provisional row is made up for a finished week
+        self.assertFalse(GoalOutcome.objects.filter(
+            goal=self.goal, week_start=self.week_start - timedelta(weeks=1)
+        ).exists())
+
+    def test_goal_changes_follow_through(self):
+        self.log(30)
+        self.goal.weekly_hours_target = Decimal("0.5")
+        self.goal.save()
+        outcome = self.outcome()
+        self.assertEqual(outcome.hours_target, Decimal("0.5"))
+        self.assertTrue(outcome.completed)
+
+        self.goal.is_active = False
+        self.goal.save()
+        self.assertFalse(GoalOutcome.objects.filter(goal=self.goal).exists())
+
+    def test_inactive_goals_still_show_the_week(self):
+        self.log(30)
+        self.goal.is_active = False
+        self.goal.save()
+
+        goal = Goal.objects.get(pk=self.goal.pk)
+        self.assertEqual(goal.weekly_study_minutes(), 30)
+        goal = Goal.objects.with_progress().get(pk=self.goal.pk)
+        self.assertEqual(goal.weekly_study_minutes(), 30)
+
+        self.goal.is_active = True
+        self.goal.save(update_fields=["is_active"])
+        outcome = self.outcome()
+        self.assertFalse(outcome.is_final)
+        self.assertEqual(
+            (outcome.minutes_completed, outcome.lessons_completed), (30, 1)
+        )
+
+    def test_freeze_finalises_without_recomputing(self):
+        self.log(30)
+        # A value the rollups would not reproduce shows it is kept as is
+        GoalOutcome.objects.filter(goal=self.goal).update(
+            minutes_completed=31
+        )
+
+        result = freeze_weekly_outcomes(
+            week_start=self.week_start,
+            week_end=self.week_start + timedelta(days=6),
+        )
+
+        self.assertEqual((result["created"], result["updated"]), (0, 1))
+        outcome = self.outcome()
+        self.assertTrue(outcome.is_final)
+        self.assertEqual(outcome.minutes_completed, 31)
+
+    def test_backfill_finalises_unfrozen_provisional_weeks(self):
+        week_start, week_end = last_week_range()
+        GoalOutcome.objects.create(
+            goal=self.goal, week_start=week_start, week_end=week_end,
+            minutes_completed=31, is_final=False,
+        )
+
+        result = backfill_outcomes(week_start)
+
+        self.assertEqual((result["created"], result["updated"]), (0, 1))
+        outcome = self.outcome(week_start)
+        self.assertTrue(outcome.is_final)
+        self.assertEqual(outcome.minutes_completed, 31)
+
+    def test_pages_read_the_provisional_row(self):
+        self.log(45)
+        goal = Goal.objects.with_progress().get(pk=self.goal.pk)
+        self.assertEqual(goal.weekly_study_minutes(), 45)
+        self.assertEqual(self.goal.weekly_progress_percent(), 75)
+
+        self.client.force_login(self.user)
+        response = self.client.get(
+            reverse("goals:detail", args=[self.goal.pk])
+        )
+        self.assertEqual(
+            response.context["chart_labels"][-1],
+            f"{self.week_start.isoformat()} (so far)",
+        )
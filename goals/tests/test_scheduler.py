@@ -0,0 +1,125 @@
+# goals/tests/test_scheduler.py
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from courses.models import Course
+from goals.models import FreezeRun, Goal, GoalOutcome, ScheduledJob
+from goals.scheduler import (
+    WEEKLY_FREEZE_JOB,
+    acquire_lease,
+    run_weekly_freeze,
+)
+from goals.services import last_week_range, timezone_scope
+from study_sessions.models import StudySession
+from tracker.models import UserPreference
+
+
+class WeeklySchedulerTests(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            username="sched", password="pw"
+        )
+        self.goal = Goal.objects.create(
+            user=user,
+            course=Course.objects.create(title="Latin", owner=user),
+            weekly_hours_target=1,
+        )
+        Goal.objects.filter(pk=self.goal.pk).update(
+            created_at=timezone.now() - timedelta(weeks=10)
+        )
+        self.last_week = last_week_range()[0]
+
+    def test_catches_up_every_missed_week(self):
+        FreezeRun.objects.create(
+            week_start=self.last_week - timedelta(weeks=3)
+        )
+
+        result = run_weekly_freeze("a")
+
+        self.assertEqual(result["weeks"], 3)
+        self.assertEqual(
+            set(GoalOutcome.objects.values_list("week_start", flat=True)),
+            {self.last_week - timedelta(weeks=w) for w in range(3)},
+        )
+        job = ScheduledJob.objects.get(name=WEEKLY_FREEZE_JOB)
+        self.assertEqual(job.last_week_start, self.last_week)
+        self.assertIsNotNone(job.last_succeeded_at)
+        self.assertIsNone(job.locked_until)
+
+        # Nothing left until another week passes
+        self.assertEqual(run_weekly_freeze("a")["weeks"], 0)
+
+    def test_without_history_freezes_last_week_only(self):
+        self.assertEqual(run_weekly_freeze("a")["weeks"], 1)
+
+    def test_only_one_instance_holds_the_lease(self):
+        self.assertTrue(acquire_lease(WEEKLY_FREEZE_JOB, "a"))
+        self.assertIsNone(run_weekly_freeze("b"))
+        self.assertFalse(GoalOutcome.objects.exists())
+
+        # An expired lease can be taken over
+        ScheduledJob.objects.update(
+            locked_until=timezone.now() - timedelta(seconds=1)
+        )
+        self.assertEqual(run_weekly_freeze("b")["weeks"], 1)
+
+    def test_command_once(self):
+        out = StringIO()
+        call_command("run_scheduler", "--once", "--jitter", "0", stdout=out)
+        self.assertIn("Froze 1 week(s) for UTC", out.getvalue())
+
+    def test_cohorts_freeze_as_their_monday_begins(self):
+        tokyo = get_user_model().objects.create_user(
+            username="tokyo", password="pw"
+        )
+        UserPreference.objects.create(user=tokyo, timezone="Asia/Tokyo")
+        tokyo_goal = Goal.objects.create(
+            user=tokyo,
+            course=Course.objects.create(title="Kanji", owner=tokyo),
+            weekly_hours_target=1,
+        )
+        Goal.objects.update(created_at=datetime(
+            2025, 1, 1, tzinfo=dt_timezone.utc
+        ))
+        # 23:00 on Sunday 2 November in Tokyo
+        StudySession.objects.create(
+            user=tokyo,
+            course=tokyo_goal.course,
+            goal=tokyo_goal,
+            duration_minutes=60,
+            started_at=datetime(2025, 11, 2, 14, 0, tzinfo=dt_timezone.utc),
+        )
+        FreezeRun.objects.create(week_start=date(2025, 10, 20))
+        week = date(2025, 10, 27)
+
+        # Sunday afternoon in UTC is already Monday in Tokyo
+        sunday = datetime(2025, 11, 2, 16, 0, tzinfo=dt_timezone.utc)
+        with patch("django.utils.timezone.now", return_value=sunday):
+            result = run_weekly_freeze("a")
+
+        self.assertEqual(result["cohorts"], ["Asia/Tokyo"])
+        outcome = GoalOutcome.objects.get()
+        self.assertEqual(
+            (outcome.goal, outcome.week_start, outcome.hours_completed),
+            (tokyo_goal, week, Decimal("1.0")),
+        )
+        self.assertTrue(FreezeRun.objects.filter(
+            week_start=week, scope=timezone_scope("Asia/Tokyo")
+        ).exists())
+
+        # The UTC cohort follows once its own Monday begins
+        monday = datetime(2025, 11, 3, 0, 30, tzinfo=dt_timezone.utc)
+        with patch("django.utils.timezone.now", return_value=monday):
+            result = run_weekly_freeze("a")
+
+        self.assertEqual(result["cohorts"], ["UTC"])
+        self.assertTrue(GoalOutcome.objects.filter(
+            goal=self.goal, week_start=week
+        ).exists())
@@ -0,0 +1,72 @@
+# goals/tests/test_seed_scale_dataset.py
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import Sum
+from django.test import TestCase
+from django.utils import timezone
+
+from goals.models import Goal, GoalOutcome
+from study_sessions.models import StudySession
+from study_sessions.rollups import check_rollups
+
+
+class SeedScaleDatasetTests(TestCase):
+    def seed(self, prefix, *extra):
+        call_command(
+            "seed_scale_dataset",
+            "--users", "3",
+            "--sessions-per-user", "40",
+            "--weeks", "4",
+            "--prefix", prefix,
+            *extra,
+            stdout=StringIO(),
+        )
+        return StudySession.objects.filter(user__username__startswith=prefix)
+
+    def test_builds_raw_and_derived_rows(self):
+        sessions = self.seed("a")
+
+        self.assertEqual(sessions.count(), 120)
+        self.assertEqual(Goal.objects.count(), 6)
+        self.assertEqual(
+            GoalOutcome.objects.filter(is_final=True).count(), 6 * 4
+        )
+        today = timezone.localdate()
+        this_week = sessions.filter(
+            goal__isnull=False,
+            study_date__gte=today - timedelta(days=today.weekday()),
+        )
+        provisional = GoalOutcome.objects.filter(is_final=False)
+        self.assertTrue(this_week.exists())
+        self.assertEqual(
+            sorted(provisional.values_list("goal_id", "minutes_completed")),
+            sorted(
+                this_week.values("goal_id")
+                .annotate(total=Sum("duration_minutes"))
+                .values_list("goal_id", "total")
+            ),
+        )
+        self.assertEqual(check_rollups(get_user_model().objects.all()), [])
+        for started_at, study_date in sessions.values_list(
+            "started_at", "study_date"
+        ):
+            self.assertEqual(timezone.localdate(started_at), study_date)
+
+    def test_accounts_sharing_the_prefix_are_left_alone(self):
+        real = get_user_model().objects.create_user(
+            username="alice", password="pw"
+        )
+        sessions = self.seed("a")
+
+        self.assertEqual(sessions.filter(user=real).count(), 0)
+        self.assertFalse(Goal.objects.filter(user=real).exists())
+        self.assertEqual(sessions.values("user").distinct().count(), 3)
+
+    def test_same_seed_gives_same_sessions(self):
+        fields = ("started_at", "study_date", "duration_minutes")
+        first = list(self.seed("a", "--skip-derived").values_list(*fields))
+        second = list(self.seed("b", "--skip-derived").values_list(*fields))
+        self.assertEqual(first, second)
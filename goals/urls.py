@@ -12,4 +12,5 @@ urlpatterns = [
     path("<int:pk>/", GoalDetailView.as_view(), name="detail"),
     path("<int:pk>/edit/", GoalUpdateView.as_view(), name="edit"),
     path("<int:pk>/delete/", GoalDeleteView.as_view(), name="delete"),
+    path("freeze/", manual_freeze, name="freeze"),
 ]
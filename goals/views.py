@@ -4,6 +4,7 @@ Contains class-based views for CRUD operations on Goal objects and
 utility views for freezing weekly outcomes and triggering achievements.
 """
 
+from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse_lazy
 from django.views.generic import (
@@ -15,38 +16,47 @@ from django.views.generic import (
     )
 from django.contrib import messages
 from django.shortcuts import redirect
+from django.views.decorators.http import require_POST
 
 from .models import Goal
 from .forms import GoalForm
-from .services import last_week_range, freeze_weekly_outcomes
+from .services import (
+    last_week_range,
+    freeze_weekly_outcomes,
+    ensure_week_frozen,
+)
 from achievements.services import evaluate_achievements_for_user
 
 
+@login_required
+@require_POST
 def manual_freeze(request):
     """
-    Manually freeze last week's outcomes and evaluate achievements.
+    Manually freeze last week's outcomes for the user and evaluate
+    achievements.
 
     This view:
       1) Computes the previous ISO week (Mon–Sun).
-      2) Freezes weekly outcomes for all active goals.
+      2) Freezes weekly outcomes for the requesting user's active goals
+         only. Concurrent requests for the same user wait for the
+         in-flight freeze and reuse it instead of running their own.
       3) Evaluates and awards any new achievements for the current user,
          displaying a success message for each one.
       4) Redirects back to the goals list.
 
     Args:
-        request (HttpRequest): The incoming request.
+        request (HttpRequest): The incoming POST request.
 
     Returns:
         HttpResponseRedirect: Redirect to the 'goals:list' page.
     """
     ws, we = last_week_range()
-    freeze_weekly_outcomes(week_start=ws, week_end=we, dry_run=False)
+    freeze_weekly_outcomes(week_start=ws, week_end=we, users=[request.user])
 
-    if request.user.is_authenticated:
-        new_awards = evaluate_achievements_for_user(request.user)
-        for ua in new_awards:
-            messages.success(
-                request, f"Unlocked achievement: {ua.achievement.title} ✨")
+    new_awards = evaluate_achievements_for_user(request.user)
+    for ua in new_awards:
+        messages.success(
+            request, f"Unlocked achievement: {ua.achievement.title} ✨")
 
     return redirect("goals:list")
 
@@ -64,12 +74,22 @@ class GoalListView(LoginRequiredMixin, ListView):
 
     def get_queryset(self):
         """
-        Return only the current user's goals.
+        Return only the current user's goals, annotated with progress.
+
+        Weekly and lifetime minutes and the projection inputs are computed
+        for every goal in the same query, so the per-card progress and
+        projection helpers in the template do not hit the database again.
 
         Returns:
             QuerySet[Goal]: Goals filtered by the requesting user.
         """
-        return Goal.objects.filter(user=self.request.user)
+        return (
+            Goal.objects
+            .filter(user=self.request.user)
+            .select_related("course")
+            .with_progress()
+            .with_projection()
+        )
 
 
 class GoalCreateView(LoginRequiredMixin, CreateView):
@@ -162,9 +182,11 @@ class GoalDetailView(LoginRequiredMixin, DetailView):
     Show details of a single goal owned by the logged-in user.
 
     Augments context with:
-      - A recent weekly outcomes slice for charts (up to 26 weeks).
+      - A recent weekly outcomes slice for charts (up to 26 weeks),
+        including the current week's provisional outcome.
       - Pre-built arrays for chart labels/series.
-      - On access, freezes the previous week and evaluates achievements.
+      - On access, freezes the previous week if the FreezeRun ledger does
+        not have it yet, and evaluates achievements.
     """
 
     model = Goal
@@ -176,27 +198,37 @@ class GoalDetailView(LoginRequiredMixin, DetailView):
         Restrict access to the current user's own goals.
 
         Returns:
-            QuerySet[Goal]: The user's goals.
+            QuerySet[Goal]: The user's goals, annotated with progress and
+            projection inputs.
         """
-        return Goal.objects.filter(user=self.request.user)
+        return (
+            Goal.objects
+            .filter(user=self.request.user)
+            .select_related("course")
+            .with_progress()
+            .with_projection()
+        )
 
     def get_context_data(self, **kwargs):
         """
         Add weekly outcomes and chart data to the template context.
 
-        Also ensures the previous week is frozen and runs achievement
+        Also ensures the user's previous week is frozen (skipped with a
+        single ledger lookup when it already is) and runs achievement
         evaluation for the current user, surfacing any new unlocks.
 
         Returns:
             dict: Extended context including:
-                - outcomes: recent GoalOutcome objects (ascending by week).
+                - outcomes: recent GoalOutcome objects (ascending by week),
+                  the last one provisional while its week is in progress.
                 - chart_* arrays for labels and series values.
         """
         context = super().get_context_data(**kwargs)
 
-        # Ensure last week is frozen
+        # Ensure the user's last week is frozen (a ledger lookup once it
+        # has been, for everyone, their time zone cohort or them alone)
         ws, we = last_week_range()
-        freeze_weekly_outcomes(week_start=ws, week_end=we, dry_run=False)
+        ensure_week_frozen(ws, we, self.request.user)
 
         # Evaluate achievements
         new_awards = evaluate_achievements_for_user(self.request.user)
@@ -206,12 +238,16 @@ class GoalDetailView(LoginRequiredMixin, DetailView):
                 f"Unlocked achievement: {ua.achievement.title} ✨"
             )
 
-        # Pull recent history (ascending by week for chart)
+        # Pull recent history (ascending by week for chart); the current
+        # week is its live provisional row
         qs = self.object.outcomes.order_by("week_start")
         context["outcomes"] = qs.reverse()[:26][::-1]
 
         # Build chart data
-        labels = [o.week_start.isoformat() for o in qs]
+        labels = [
+            o.week_start.isoformat() + ("" if o.is_final else " (so far)")
+            for o in qs
+        ]
         hours_completed = [
             float(o.hours_completed) if o.hours_completed is not None else None
             for o in qs
@@ -3,5 +3,9 @@ from django.apps import AppConfig
 
 class StudySessionsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
-    name = "study_sessions"      
-    label = "study_sessions" 
\ No newline at end of file
+    name = "study_sessions"
+    label = "study_sessions"
+
+    def ready(self):
+        """Connect signal receivers that maintain the daily rollups."""
+        from . import signals  # noqa: F401
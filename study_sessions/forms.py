@@ -1,6 +1,6 @@
 # study_sessions/forms.py
 from django import forms
-from .models import StudySession
+from .models import StudySession, validate_study_start
 from courses.models import Course
 from goals.models import Goal
 
@@ -27,6 +27,7 @@ class StudySessionForm(forms.ModelForm):
 
     def __init__(self, *args, user=None, **kwargs):
         super().__init__(*args, **kwargs)
+        self.user = user
 
         # REMOVE ALL HELP TEXT FROM FORM FIELDS
         for field in self.fields.values():
@@ -35,9 +36,15 @@ class StudySessionForm(forms.ModelForm):
         # Filter user-specific dropdowns
         if user is not None:
             self.fields["course"].queryset = Course.objects.filter(owner=user)
+            # Goal labels include the user and course names
             self.fields["goal"].queryset = Goal.objects.filter(
                 user=user, is_active=True
-            )
+            ).select_related("user", "course")
+
+    def clean_started_at(self):
+        started_at = self.cleaned_data["started_at"]
+        validate_study_start(started_at, self.user)
+        return started_at
 
     def clean_duration_minutes(self):
         mins = self.cleaned_data["duration_minutes"]
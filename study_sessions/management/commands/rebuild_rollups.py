@@ -0,0 +1,66 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from study_sessions.rollups import check_rollups, rebuild_rollups
+
+
+class Command(BaseCommand):
+    """
+    Django management command to rebuild or check DailyStudyRollup rows.
+
+    The rollup table is normally maintained by StudySession signals. This
+    command recomputes it from raw sessions (e.g. after bulk imports that
+    bypass signals) or, with --check, reports rows that have drifted.
+
+    Usage:
+        python manage.py rebuild_rollups
+        python manage.py rebuild_rollups --check
+        python manage.py rebuild_rollups --user 42
+
+    Attributes:
+        help (str): A short description shown in `python manage.py help`.
+    """
+
+    help = "Rebuild or check the daily study rollup table."
+
+    def add_arguments(self, parser):
+        """
+        Add optional command-line arguments.
+
+        Options:
+            --check: Report mismatching rollups without changing anything.
+            --user (int): Only process this user id.
+        """
+        parser.add_argument("--check", action="store_true")
+        parser.add_argument("--user", type=int)
+
+    def handle(self, *args, **opts):
+        """
+        Rebuild (or check) the rollups and print a summary.
+
+        Args:
+            *args: Positional command arguments.
+            **opts: Keyword options, including 'check' and 'user'.
+
+        Returns:
+            None: Outputs results directly to the console.
+        """
+        users = get_user_model().objects.all()
+        if opts["user"]:
+            users = users.filter(pk=opts["user"])
+
+        if not opts["check"]:
+            written = rebuild_rollups(users)
+            self.stdout.write(self.style.SUCCESS(
+                f"Rebuilt {written} rollup rows."
+            ))
+            return
+
+        mismatches = check_rollups(users)
+        for key, stored, expected in mismatches:
+            self.stdout.write(self.style.WARNING(
+                f"Mismatch {key}: stored {stored} vs sessions {expected}"
+            ))
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked rollups | mismatches: {len(mismatches)}"
+        ))
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.25 on 2026-10-17 12:00
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+import django.db.models.deletion
+
+
+def populate_rollups(apps, schema_editor):
+    """Build the initial rollup rows from existing sessions."""
+    StudySession = apps.get_model("study_sessions", "StudySession")
+    DailyStudyRollup = apps.get_model("study_sessions", "DailyStudyRollup")
+    totals = (
+        StudySession.objects
+        .annotate(day=TruncDate("started_at"))
+        .values("user_id", "goal_id", "course_id", "day")
+        .annotate(minutes=Sum("duration_minutes"), session_count=Count("id"))
+        .order_by()
+    )
+    DailyStudyRollup.objects.bulk_create(
+        (DailyStudyRollup(**t) for t in totals.iterator()),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('goals', '0004_freezerun'),
+        ('courses', '0002_alter_course_colour_alter_course_slug'),
+        ('study_sessions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyStudyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('minutes', models.PositiveIntegerField(default=0)),
+                ('session_count', models.PositiveIntegerField(default=0)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='courses.course')),
+                ('goal', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='goals.goal')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-day'],
+                'indexes': [models.Index(fields=['user', 'day'], name='rollup_user_day_idx'), models.Index(fields=['goal', 'day'], name='rollup_goal_day_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailystudyrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('goal__isnull', False)), fields=('user', 'goal', 'course', 'day'), name='unique_rollup_goal_day'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailystudyrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('goal__isnull', True)), fields=('user', 'course', 'day'), name='unique_rollup_no_goal_day'),
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.25 on 2026-10-17 15:00
+
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+
+
+def populate_study_date(apps, schema_editor):
+    """Fill study_date for existing sessions in a single UPDATE."""
+    StudySession = apps.get_model("study_sessions", "StudySession")
+    StudySession.objects.update(study_date=TruncDate("started_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('study_sessions', '0002_dailystudyrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studysession',
+            name='study_date',
+            field=models.DateField(editable=False, null=True, help_text='Local date the session started on (derived).'),
+        ),
+        migrations.RunPython(populate_study_date, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='studysession',
+            name='study_date',
+            field=models.DateField(editable=False, help_text='Local date the session started on (derived).'),
+        ),
+        migrations.AddIndex(
+            model_name='studysession',
+            index=models.Index(fields=['user', 'study_date', 'duration_minutes'], name='session_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studysession',
+            index=models.Index(fields=['goal', 'study_date', 'duration_minutes'], name='session_goal_date_idx'),
+        ),
+    ]
@@ -1,7 +1,35 @@
+from datetime import date
+
 from django.db import models
 from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.utils import timezone
 from courses.models import Course
 from goals.models import Goal
+from tracker.timezones import user_timezone
+
+#: Earliest study date accepted. Weekly streak bitmaps count weeks from
+#: this Monday (see achievements.models.UserStreak).
+EARLIEST_STUDY_DATE = date(1970, 1, 5)
+
+
+def validate_study_start(started_at, user=None):
+    """
+    Reject session start times before EARLIEST_STUDY_DATE.
+
+    Args:
+        started_at (datetime): The session's start.
+        user (User, optional): Owner whose time zone the date is read in
+        (defaults to the current time zone).
+
+    Raises:
+        ValidationError: If the local start date is too early.
+    """
+    zone = user_timezone(user) if user is not None else None
+    if timezone.localdate(started_at, zone) < EARLIEST_STUDY_DATE:
+        raise ValidationError(
+            f"Sessions must start on or after {EARLIEST_STUDY_DATE:%d %b %Y}."
+        )
 
 
 class StudySession(models.Model):
@@ -17,11 +45,16 @@ class StudySession(models.Model):
         course (Course): The course this session relates to.
         goal (Goal | None): Optional related goal. Null if not tied to a goal.
         started_at (datetime): The date and time the session began.
+        study_date (date): Date of started_at in the user's time zone, kept
+        in step on save so day/week/month filters can range-scan an index
+        instead of converting every row's timestamp.
         duration_minutes (int): Length of the session in minutes.
         notes (str): Optional notes about the study session.
 
     Meta:
         ordering (list): Sessions are ordered by most recent start time.
+        indexes (list): (user, study_date) and (goal, study_date), each
+        carrying duration_minutes so date-range totals are index-only.
     """
 
     user = models.ForeignKey(
@@ -47,6 +80,10 @@ class StudySession(models.Model):
     started_at = models.DateTimeField(
         help_text="Date and time the study session started."
     )
+    study_date = models.DateField(
+        editable=False,
+        help_text="Local date the session started on (derived).",
+    )
     duration_minutes = models.PositiveIntegerField(
         help_text="Duration of the study session in minutes."
     )
@@ -57,6 +94,58 @@ class StudySession(models.Model):
 
     class Meta:
         ordering = ["-started_at"]
+        indexes = [
+            models.Index(
+                fields=["user", "study_date", "duration_minutes"],
+                name="session_user_date_idx",
+            ),
+            models.Index(
+                fields=["goal", "study_date", "duration_minutes"],
+                name="session_goal_date_idx",
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remember the values loaded from the database.
+
+        Signal receivers compare against `_loaded_values` to update derived
+        data (streaks, rollups) for the state a session had before an edit.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def clean(self):
+        """Validate that the session does not start before tracking can."""
+        super().clean()
+        if self.started_at is not None:
+            try:
+                validate_study_start(
+                    self.started_at, self.user if self.user_id else None
+                )
+            except ValidationError as error:
+                raise ValidationError({"started_at": error.messages})
+
+    def save(self, *args, **kwargs):
+        """
+        Derive study_date, save, and refresh `_loaded_values` to match.
+
+        study_date is the local date in the user's time zone (see
+        tracker.timezones), so days, weeks and months are the user's own.
+        """
+        self.study_date = timezone.localdate(
+            self.started_at, user_timezone(self.user)
+        )
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "started_at" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "study_date"}
+        super().save(*args, **kwargs)
+        self._loaded_values = {
+            f.attname: getattr(self, f.attname)
+            for f in self._meta.concrete_fields
+        }
 
     def __str__(self):
         """
@@ -71,3 +160,70 @@ class StudySession(models.Model):
             f"{self.user.username} • {self.course} • "
             f"{hrs:.2f}h on {self.started_at.date()}"
         )
+
+
+class DailyStudyRollup(models.Model):
+    """
+    Materialised per-day totals of StudySession rows.
+
+    One row exists per (user, goal, course, local day) that has at least
+    one session. Rows are kept consistent by StudySession signals and can
+    be rebuilt with `manage.py rebuild_rollups`. Weekly, monthly and
+    lifetime aggregates read these rows instead of raw sessions, so a heavy
+    user costs at most a handful of rows per week.
+
+    Attributes:
+        user (User): Owner of the sessions.
+        goal (Goal | None): Goal the sessions contribute to, if any.
+        course (Course): Course the sessions belong to.
+        day (date): Local date the sessions started on.
+        minutes (int): Sum of duration_minutes for the day.
+        session_count (int): Number of sessions for the day.
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="daily_rollups",
+    )
+    goal = models.ForeignKey(
+        Goal,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="daily_rollups",
+    )
+    course = models.ForeignKey(
+        Course,
+        on_delete=models.CASCADE,
+        related_name="daily_rollups",
+    )
+    day = models.DateField()
+    minutes = models.PositiveIntegerField(default=0)
+    session_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-day"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "goal", "course", "day"],
+                condition=models.Q(goal__isnull=False),
+                name="unique_rollup_goal_day",
+            ),
+            models.UniqueConstraint(
+                fields=["user", "course", "day"],
+                condition=models.Q(goal__isnull=True),
+                name="unique_rollup_no_goal_day",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["user", "day"], name="rollup_user_day_idx"),
+            models.Index(fields=["goal", "day"], name="rollup_goal_day_idx"),
+        ]
+
+    def __str__(self):
+        """Return the user, day and totals for admin/debugging."""
+        return (
+            f"{self.user_id} • {self.day} • {self.minutes}m "
+            f"({self.session_count} sessions)"
+        )
@@ -0,0 +1,202 @@
+"""Maintenance of the DailyStudyRollup table.
+
+StudySession signals call `record_session_saved` / `record_session_deleted`
+so that each write adjusts at most two rollup rows with F-expression
+updates. `rebuild_rollups` and `check_rollups` recompute the table from raw
+sessions for repairs and consistency checks.
+"""
+
+from itertools import islice
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+
+from .models import DailyStudyRollup, StudySession
+
+#: Users processed per rebuild/check batch.
+ROLLUP_CHUNK_SIZE = 500
+
+
+def _key(values):
+    """Return the rollup key for a dict of session attnames."""
+    return (
+        values["user_id"],
+        values["goal_id"],
+        values["course_id"],
+        values["study_date"],
+    )
+
+
+def apply_delta(key, minutes, sessions):
+    """
+    Add (or subtract) minutes and session counts to one rollup row.
+
+    The row is updated in place with F() expressions; a missing row is
+    created for positive deltas, retrying as an update if a concurrent
+    writer created it first. Rows left without sessions are removed.
+
+    Args:
+        key (tuple): (user_id, goal_id, course_id, day).
+        minutes (int): Minutes to add (negative to subtract).
+        sessions (int): Sessions to add (negative to subtract).
+    """
+    user_id, goal_id, course_id, day = key
+    rows = DailyStudyRollup.objects.filter(
+        user_id=user_id, goal_id=goal_id, course_id=course_id, day=day
+    )
+    delta = {
+        "minutes": F("minutes") + minutes,
+        "session_count": F("session_count") + sessions,
+    }
+
+    if rows.update(**delta):
+        if sessions < 0:
+            rows.filter(session_count__lte=0).delete()
+        return
+
+    if sessions <= 0:
+        return
+
+    try:
+        with transaction.atomic():
+            DailyStudyRollup.objects.create(
+                user_id=user_id,
+                goal_id=goal_id,
+                course_id=course_id,
+                day=day,
+                minutes=minutes,
+                session_count=sessions,
+            )
+    except IntegrityError:
+        rows.update(**delta)
+
+
+def record_session_saved(session, created):
+    """
+    Reflect a created or edited session in the rollup table.
+
+    Args:
+        session (StudySession): The saved session.
+        created (bool): Whether the session was just inserted.
+    """
+    new_key = _key(vars(session))
+    loaded = getattr(session, "_loaded_values", None)
+
+    if created or not loaded:
+        apply_delta(new_key, session.duration_minutes, 1)
+        return
+
+    old_key = _key(loaded)
+    if old_key == new_key:
+        diff = session.duration_minutes - loaded["duration_minutes"]
+        if diff:
+            apply_delta(new_key, diff, 0)
+        return
+
+    apply_delta(old_key, -loaded["duration_minutes"], -1)
+    apply_delta(new_key, session.duration_minutes, 1)
+
+
+def record_session_deleted(session):
+    """
+    Remove a deleted session from the rollup table.
+
+    Args:
+        session (StudySession): The deleted session.
+    """
+    apply_delta(_key(vars(session)), -session.duration_minutes, -1)
+
+
+def fold_goal_rollups(goal):
+    """
+    Move a goal's rollups to the goal-less rows before the goal is deleted.
+
+    Deleting a goal sets its sessions' goal to NULL, so their minutes must
+    keep counting towards the user's and course's totals.
+
+    Args:
+        goal (Goal): The goal about to be deleted.
+    """
+    for row in DailyStudyRollup.objects.filter(goal=goal):
+        apply_delta(
+            (row.user_id, None, row.course_id, row.day),
+            row.minutes,
+            row.session_count,
+        )
+
+
+def _session_totals(user_ids):
+    """Yield rollup-shaped dicts aggregated from raw sessions."""
+    return (
+        StudySession.objects
+        .filter(user_id__in=user_ids)
+        .values("user_id", "goal_id", "course_id", day=F("study_date"))
+        .annotate(minutes=Sum("duration_minutes"), session_count=Count("id"))
+        .order_by()
+    )
+
+
+def _user_batches(users):
+    """Yield lists of user ids in chunks."""
+    ids = users.values_list("pk", flat=True).order_by("pk").iterator()
+    while True:
+        batch = list(islice(ids, ROLLUP_CHUNK_SIZE))
+        if not batch:
+            return
+        yield batch
+
+
+def rebuild_rollups(users):
+    """
+    Recompute the rollup rows for the given users from raw sessions.
+
+    Args:
+        users (QuerySet[User]): Users whose rollups should be rebuilt.
+
+    Returns:
+        int: Number of rollup rows written.
+    """
+    written = 0
+    for user_ids in _user_batches(users):
+        rows = [DailyStudyRollup(**t) for t in _session_totals(user_ids)]
+        with transaction.atomic():
+            DailyStudyRollup.objects.filter(user_id__in=user_ids).delete()
+            DailyStudyRollup.objects.bulk_create(
+                rows, batch_size=ROLLUP_CHUNK_SIZE
+            )
+        written += len(rows)
+    return written
+
+
+def check_rollups(users):
+    """
+    Compare stored rollups with totals recomputed from raw sessions.
+
+    Args:
+        users (QuerySet[User]): Users to check.
+
+    Returns:
+        list[tuple]: (key, stored, expected) for every mismatching key,
+        where stored/expected are (minutes, session_count) or None.
+    """
+    mismatches = []
+    for user_ids in _user_batches(users):
+        expected = {
+            (t["user_id"], t["goal_id"], t["course_id"], t["day"]):
+            (t["minutes"], t["session_count"])
+            for t in _session_totals(user_ids)
+        }
+        stored = {
+            (r["user_id"], r["goal_id"], r["course_id"], r["day"]):
+            (r["minutes"], r["session_count"])
+            for r in DailyStudyRollup.objects
+            .filter(user_id__in=user_ids)
+            .values(
+                "user_id", "goal_id", "course_id", "day",
+                "minutes", "session_count",
+            )
+        }
+        for key in expected.keys() | stored.keys():
+            if expected.get(key) != stored.get(key):
+                mismatches.append((key, stored.get(key), expected.get(key)))
+    return mismatches
@@ -0,0 +1,43 @@
+"""Signal receivers keeping DailyStudyRollup in step with session writes.
+
+Connected in StudySessionsConfig.ready().
+"""
+
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from goals.models import Goal
+
+from .models import StudySession
+from .rollups import (
+    fold_goal_rollups,
+    record_session_deleted,
+    record_session_saved,
+)
+
+
+@receiver(post_save, sender=StudySession)
+def session_saved(sender, instance, created, **kwargs):
+    """Add a new session to, or move an edited one within, the rollups."""
+    record_session_saved(instance, created)
+
+
+@receiver(post_delete, sender=StudySession)
+def session_deleted(sender, instance, **kwargs):
+    """Subtract a deleted session from the rollups."""
+    record_session_deleted(instance)
+
+
+@receiver(pre_delete, sender=Goal)
+def goal_deleting(sender, instance, origin=None, **kwargs):
+    """
+    Keep a deleted goal's minutes in the goal-less rollup rows.
+
+    Only applies when the goal itself is being deleted; when a user or
+    course deletion cascades to the goal, its rollups go with it anyway.
+    """
+    if isinstance(origin, Goal) or (
+        isinstance(origin, QuerySet) and origin.model is Goal
+    ):
+        fold_goal_rollups(instance)
@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from courses.models import Course
+from goals.models import Goal
+
+from .models import DailyStudyRollup, StudySession
+from .rollups import check_rollups
+
+
+class DailyRollupTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="roll", password="pw"
+        )
+        self.course = Course.objects.create(title="Physics", owner=self.user)
+        self.goal = Goal.objects.create(
+            user=self.user, course=self.course, weekly_hours_target=2
+        )
+        self.now = timezone.now()
+
+    def log(self, minutes, days_ago=0, goal=None):
+        return StudySession.objects.create(
+            user=self.user,
+            course=self.course,
+            goal=goal,
+            duration_minutes=minutes,
+            started_at=self.now - timedelta(days=days_ago),
+        )
+
+    def assert_consistent(self):
+        users = get_user_model().objects.all()
+        self.assertEqual(check_rollups(users), [])
+
+    def test_create_edit_delete_stay_consistent(self):
+        first = self.log(30, goal=self.goal)
+        self.log(15, goal=self.goal)
+        self.log(20, days_ago=2)
+
+        row = DailyStudyRollup.objects.get(goal=self.goal)
+        self.assertEqual((row.minutes, row.session_count), (45, 2))
+        self.assert_consistent()
+
+        first.duration_minutes = 40
+        first.save()
+        self.assert_consistent()
+
+        first.started_at -= timedelta(days=1)
+        first.goal = None
+        first.save()
+        self.assert_consistent()
+
+        first.delete()
+        self.assert_consistent()
+        self.assertEqual(DailyStudyRollup.objects.count(), 2)
+
+    def test_goal_delete_keeps_minutes_for_user(self):
+        self.log(30, goal=self.goal)
+        self.log(10)
+
+        self.goal.delete()
+
+        self.assert_consistent()
+        self.assertEqual(
+            DailyStudyRollup.objects.get(user=self.user).minutes, 40
+        )
+
+    def test_course_delete_removes_rollups(self):
+        self.log(30, goal=self.goal)
+        self.course.delete()
+        self.assertFalse(DailyStudyRollup.objects.exists())
+
+    def test_rebuild_command_repairs_drift(self):
+        self.log(30, goal=self.goal)
+        DailyStudyRollup.objects.update(minutes=1)
+
+        out = StringIO()
+        call_command("rebuild_rollups", "--check", stdout=out)
+        self.assertIn("mismatches: 1", out.getvalue())
+
+        call_command("rebuild_rollups", stdout=StringIO())
+        self.assert_consistent()
+
+
+@override_settings(TIME_ZONE="Europe/London", USE_TZ=True)
+class StudyDateTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="dates", password="pw"
+        )
+        self.course = Course.objects.create(title="History", owner=self.user)
+
+    def test_study_date_is_local_and_follows_started_at(self):
+        # 23:30 UTC in summer is already the next day in London
+        session = StudySession.objects.create(
+            user=self.user,
+            course=self.course,
+            duration_minutes=30,
+            started_at=datetime(2025, 6, 1, 23, 30, tzinfo=dt_timezone.utc),
+        )
+        self.assertEqual(str(session.study_date), "2025-06-02")
+
+        session.started_at -= timedelta(days=3)
+        session.save(update_fields=["started_at"])
+        session.refresh_from_db()
+        self.assertEqual(str(session.study_date), "2025-05-30")
@@ -125,7 +125,7 @@ class MyStudySessionsView(LoginRequiredMixin, ListView):
         return (
             StudySession.objects
             .filter(user=self.request.user)
-            .select_related("course", "goal")
+            .select_related("course", "goal__user", "goal__course")
             .order_by("-started_at")
         )
 
@@ -146,4 +146,8 @@ class StudySessionDeleteView(LoginRequiredMixin, DeleteView):
         Limit queryset to sessions owned by the logged-in user.
         This avoids 403s and means other users' sessions 404.
         """
-        return StudySession.objects.filter(user=self.request.user)
\ No newline at end of file
+        return (
+            StudySession.objects
+            .filter(user=self.request.user)
+            .select_related("user", "course", "goal__user", "goal__course")
+        )
\ No newline at end of file
@@ -0,0 +1,214 @@
+"""Project middleware: per-request timing and the user's time zone.
+
+RequestTimingMiddleware counts queries and sums their time through
+`connection.execute_wrapper`, times template rendering separately from
+the rest of the view, and reports the phases in a `Server-Timing` header
+(visible in the browser's network panel). Requests slower than
+REQUEST_TIMING_SLOW_MS are logged with their most expensive SQL
+fingerprints.
+
+It is off unless REQUEST_TIMING_ENABLED is set. When off, Django drops it
+from the middleware chain at startup, so it costs nothing.
+
+UserTimezoneMiddleware activates the signed-in user's time zone for the
+request (see tracker.timezones).
+"""
+
+import logging
+import re
+from collections import defaultdict
+from contextvars import ContextVar
+from time import perf_counter
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.template.backends.django import Template
+from django.utils import timezone
+
+from tracker.timezones import TIMEZONE_SESSION_KEY, timezone_name
+
+logger = logging.getLogger("studystar.timing")
+
+_current = ContextVar("request_timing", default=None)
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r"IN \((?:(?:%s|\?), )*(?:%s|\?)\)")
+
+
+def fingerprint(sql):
+    """
+    Return SQL with literals and IN lists collapsed to placeholders.
+
+    Queries that differ only in their parameters share a fingerprint, so
+    repeated fingerprints point at N+1 patterns.
+
+    Args:
+        sql (str): A SQL statement.
+
+    Returns:
+        str: The normalised statement.
+    """
+    return _IN_LISTS.sub("IN (...)", _LITERALS.sub("?", sql))
+
+
+class RequestStats:
+    """
+    Timings collected for one request.
+
+    Instances are used as the `execute_wrapper` for the request's queries.
+
+    Attributes:
+        queries (list[tuple[str, float]]): (sql, seconds) per query.
+        sql_time (float): Total seconds spent executing SQL.
+        template_time (float): Total seconds spent rendering templates.
+    """
+
+    def __init__(self):
+        self.queries = []
+        self.sql_time = 0.0
+        self.template_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        """Run a query and record how long it took."""
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = perf_counter() - started
+            self.sql_time += elapsed
+            self.queries.append((sql, elapsed))
+
+    def top_fingerprints(self, limit=5):
+        """
+        Return the fingerprints that took the most SQL time.
+
+        Args:
+            limit (int): Number of fingerprints to return.
+
+        Returns:
+            list[tuple[str, int, float]]: (fingerprint, count, seconds),
+            most expensive first.
+        """
+        totals = defaultdict(lambda: [0, 0.0])
+        for sql, elapsed in self.queries:
+            entry = totals[fingerprint(sql)]
+            entry[0] += 1
+            entry[1] += elapsed
+        ranked = sorted(totals.items(), key=lambda kv: kv[1][1], reverse=True)
+        return [(fp, n, secs) for fp, (n, secs) in ranked[:limit]]
+
+
+def _timed_render(render):
+    """Wrap a template backend's render() to add to the request's stats."""
+    def wrapper(self, *args, **kwargs):
+        stats = _current.get()
+        if stats is None:
+            return render(self, *args, **kwargs)
+        started = perf_counter()
+        try:
+            return render(self, *args, **kwargs)
+        finally:
+            stats.template_time += perf_counter() - started
+    wrapper.request_timing = True
+    return wrapper
+
+
+class RequestTimingMiddleware:
+    """
+    Add a Server-Timing header and log slow requests.
+
+    The header has these entries, in milliseconds:
+        - total: whole request below this middleware.
+        - view: total minus template rendering (includes view SQL).
+        - tpl: template rendering, including queries evaluated lazily by
+        the template.
+        - sql: time executing SQL, with the query count in its
+        description.
+
+    Settings:
+        REQUEST_TIMING_ENABLED (bool): Turn the middleware on.
+        REQUEST_TIMING_SLOW_MS (int): Log requests slower than this.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "REQUEST_TIMING_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_ms = getattr(settings, "REQUEST_TIMING_SLOW_MS", 500)
+        if not getattr(Template.render, "request_timing", False):
+            Template.render = _timed_render(Template.render)
+
+    def __call__(self, request):
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = perf_counter()
+        try:
+            with connection.execute_wrapper(stats):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total_ms = (perf_counter() - started) * 1000
+
+        tpl_ms = stats.template_time * 1000
+        sql_ms = stats.sql_time * 1000
+        response["Server-Timing"] = ", ".join([
+            f"total;dur={total_ms:.1f}",
+            f"view;dur={total_ms - tpl_ms:.1f}",
+            f"tpl;dur={tpl_ms:.1f}",
+            f'sql;dur={sql_ms:.1f};desc="{len(stats.queries)} queries"',
+        ])
+
+        if total_ms > self.slow_ms:
+            self.log_slow(request, response, stats, total_ms)
+        return response
+
+    def log_slow(self, request, response, stats, total_ms):
+        """Log a slow request with its most expensive SQL fingerprints."""
+        lines = [
+            f"  {n} x {secs * 1000:.1f}ms {fp}"
+            for fp, n, secs in stats.top_fingerprints()
+        ]
+        logger.warning(
+            "Slow request %s %s -> %s in %.1fms (%d queries, %.1fms SQL, "
+            "%.1fms templates)\n%s",
+            request.method,
+            request.path,
+            response.status_code,
+            total_ms,
+            len(stats.queries),
+            stats.sql_time * 1000,
+            stats.template_time * 1000,
+            "\n".join(lines),
+        )
+
+
+class UserTimezoneMiddleware:
+    """
+    Activate the signed-in user's time zone for the request.
+
+    `timezone.localdate()` and template date rendering then use the
+    user's zone. The name is read from the session, where it is stored on
+    login; sessions without it look the preference up once and keep it.
+    Anonymous requests use settings.TIME_ZONE.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        name = None
+        if request.user.is_authenticated:
+            name = request.session.get(TIMEZONE_SESSION_KEY)
+            if name is None:
+                name = timezone_name(request.user)
+                request.session[TIMEZONE_SESSION_KEY] = name
+
+        if name is None:
+            return self.get_response(request)
+        timezone.activate(ZoneInfo(name))
+        try:
+            return self.get_response(request)
+        finally:
+            timezone.deactivate()
@@ -93,16 +93,23 @@ ACCOUNT_EMAIL_VERIFICATION = 'none'
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'studystar.middleware.RequestTimingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'allauth.account.middleware.AccountMiddleware',
+    'studystar.middleware.UserTimezoneMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
 ]
 
+# Per-request SQL/template timing (Server-Timing header, slow request log).
+# Off unless REQUEST_TIMING=1 is set in the environment.
+REQUEST_TIMING_ENABLED = os.environ.get("REQUEST_TIMING") == "1"
+REQUEST_TIMING_SLOW_MS = int(os.environ.get("REQUEST_TIMING_SLOW_MS", 500))
+
 ROOT_URLCONF = 'studystar.urls'
 
 TEMPLATES = [
@@ -172,6 +179,7 @@ AUTH_PASSWORD_VALIDATORS = [
 
 LANGUAGE_CODE = 'en-us'
 
+# Default time zone for users without a preference (see tracker.timezones)
 TIME_ZONE = 'UTC'
 
 USE_I18N = True
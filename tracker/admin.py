@@ -1,8 +1,14 @@
 from django.contrib import admin
-from .models import ContactMessage
+from .models import ContactMessage, UserPreference
 
 @admin.register(ContactMessage)
 class ContactMessageAdmin(admin.ModelAdmin):
     list_display = ("name", "email", "created_at")
     search_fields = ("name", "email", "message")
     list_filter = ("created_at",)
+
+
+@admin.register(UserPreference)
+class UserPreferenceAdmin(admin.ModelAdmin):
+    list_display = ("user", "timezone")
+    search_fields = ("user__username", "timezone")
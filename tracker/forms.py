@@ -0,0 +1,24 @@
+from django import forms
+
+from .timezones import timezone_names
+
+
+class PreferencesForm(forms.Form):
+    """
+    Form for a user's preferences.
+
+    Fields:
+        timezone (ChoiceField): The time zone study days and weeks are
+        counted in, chosen from every IANA zone.
+    """
+
+    timezone = forms.ChoiceField(
+        label="Time zone",
+        help_text="Your study days, weeks and months follow this time zone.",
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["timezone"].choices = [
+            (name, name.replace("_", " ")) for name in timezone_names()
+        ]
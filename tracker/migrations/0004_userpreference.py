@@ -0,0 +1,25 @@
+# Generated by Django 4.2.25 on 2026-10-17 16:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import tracker.timezones
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tracker', '0003_userdataversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserPreference',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('timezone', models.CharField(help_text='Time zone your study days and weeks are counted in.', max_length=64, validators=[tracker.timezones.validate_timezone])),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='preference', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
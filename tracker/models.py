@@ -1,6 +1,8 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 
+from .timezones import validate_timezone
+
 User = get_user_model()
 
 class ContactMessage(models.Model):
@@ -24,3 +26,51 @@ class ContactMessage(models.Model):
 
     def __str__(self):
         return f"{self.name} <{self.email}>"
+
+
+class UserDataVersion(models.Model):
+    """
+    Per-user counter bumped whenever data shown on the dashboard changes.
+
+    Cached dashboard content is keyed by this version, so any write that
+    bumps it (sessions, goals, outcomes, awards) makes older cache entries
+    unreachable without explicit invalidation.
+    """
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        related_name="data_version",
+    )
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user} v{self.version}"
+
+
+class UserPreference(models.Model):
+    """
+    Per-user settings, currently the time zone the user studies in.
+
+    Study dates, weeks and months are all the user's local ones (see
+    tracker.timezones). Users without a row use settings.TIME_ZONE.
+
+    Attributes:
+        user (User): The user these preferences belong to.
+        timezone (str): IANA time zone name, e.g. "America/New_York".
+    """
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        related_name="preference",
+    )
+    timezone = models.CharField(
+        max_length=64,
+        validators=[validate_timezone],
+        help_text="Time zone your study days and weeks are counted in.",
+    )
+
+    def __str__(self):
+        return f"{self.user} ({self.timezone})"
@@ -0,0 +1,142 @@
+"""Per-user data versioning for cached tracker pages, and preferences.
+
+Writes that change what a user's dashboard shows call `bump_data_version`
+(via signal receivers in tracker.signals). Readers fetch the current
+version with `get_data_version` and build cache keys from it, so stale
+entries simply stop being looked up.
+
+`set_user_timezone` changes a user's time zone and re-derives the data
+that depends on it.
+"""
+
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F, Min
+from django.utils import timezone
+
+from achievements.models import AchievementWatermark
+from achievements.streaks import rebuild_user_streak
+from goals.provisional import rebuild_user_provisional
+from goals.services import last_week_range, refresh_monthly_rollups
+from study_sessions.models import DailyStudyRollup, StudySession
+from study_sessions.rollups import rebuild_rollups
+
+from .models import UserDataVersion, UserPreference
+
+#: Seconds a cached dashboard stays valid even without a version bump.
+DASHBOARD_CACHE_TIMEOUT = getattr(settings, "DASHBOARD_CACHE_TIMEOUT", 600)
+
+
+def get_data_version(user):
+    """
+    Return the user's current data version, creating the row if needed.
+
+    Args:
+        user (User): The user whose version is read.
+
+    Returns:
+        int: The current version number.
+    """
+    row, _ = UserDataVersion.objects.get_or_create(user=user)
+    return row.version
+
+
+def bump_data_version(users=None):
+    """
+    Invalidate cached pages for the given users by bumping their version.
+
+    Users without a version row have nothing cached yet, so they are
+    skipped.
+
+    Args:
+        users (QuerySet | list | None): Users (or user ids) to bump. If
+            None, every user is bumped (e.g. after a catalog change).
+
+    Returns:
+        int: Number of rows bumped.
+    """
+    qs = UserDataVersion.objects.all()
+    if users is not None:
+        qs = qs.filter(user__in=users)
+    return qs.update(version=F("version") + 1)
+
+
+def dashboard_cache_key(user, version, today):
+    """
+    Build the cache key for a user's dashboard context.
+
+    The date is part of the key because the weekly window and month
+    labels move with the calendar even when no data changes.
+
+    Args:
+        user (User): The dashboard owner.
+        version (int): The user's data version.
+        today (date): The local date the context was built for.
+
+    Returns:
+        str: The cache key.
+    """
+    return f"tracker:dashboard:{user.pk}:{version}:{today.isoformat()}"
+
+
+def set_user_timezone(user, name, chunk_size=500):
+    """
+    Save a user's time zone and move their study dates into it.
+
+    Every session's study_date is re-derived in the new zone. If any
+    changed, the user's daily rollups, streak record and monthly rollups
+    are rebuilt and their achievement watermark is marked stale, so
+    every week and month window follows the new zone. Provisional
+    GoalOutcome rows are rebuilt for the current week in the new zone;
+    frozen ones are snapshots and are left as they were.
+
+    Args:
+        user (User): The user.
+        name (str): A valid time zone name.
+        chunk_size (int): Sessions read and updated per round trip.
+
+    Returns:
+        int: Number of sessions whose study_date changed.
+    """
+    zone = ZoneInfo(name)
+    sessions = (
+        StudySession.objects.filter(user=user)
+        .only("pk", "started_at", "study_date")
+    )
+    changed = []
+    with transaction.atomic():
+        user.preference, _ = UserPreference.objects.update_or_create(
+            user=user, defaults={"timezone": name}
+        )
+        for session in sessions.iterator(chunk_size=chunk_size):
+            study_date = timezone.localdate(session.started_at, zone)
+            if study_date != session.study_date:
+                session.study_date = study_date
+                changed.append(session)
+        StudySession.objects.bulk_update(
+            changed, ["study_date"], batch_size=chunk_size
+        )
+
+        if changed:
+            rebuild_rollups(get_user_model().objects.filter(pk=user.pk))
+            rebuild_user_streak(user.pk)
+            first_day = DailyStudyRollup.objects.filter(
+                user=user
+            ).aggregate(first=Min("day"))["first"]
+            if first_day is not None:
+                last_sunday = last_week_range(
+                    timezone.localdate(timezone=zone)
+                )[1]
+                refresh_monthly_rollups(
+                    first_day, last_sunday, users=[user.pk]
+                )
+            AchievementWatermark.objects.filter(user=user).update(
+                stale=True
+            )
+        rebuild_user_provisional(user)
+
+    bump_data_version([user.pk])
+    return len(changed)
@@ -0,0 +1,64 @@
+"""Signal receivers that bump per-user data versions on relevant writes,
+and remember the user's time zone in the session on login.
+
+Connected in TrackerConfig.ready().
+"""
+
+from django.contrib.auth.signals import user_logged_in
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from achievements.backfill import awards_bulk_created
+from achievements.models import Achievement, UserAchievement
+from goals.models import Goal, GoalOutcome
+from goals.signals import outcomes_frozen
+from study_sessions.models import StudySession
+
+from .services import bump_data_version
+from .timezones import TIMEZONE_SESSION_KEY, timezone_name
+
+
+@receiver(post_save, sender=StudySession)
+@receiver(post_delete, sender=StudySession)
+@receiver(post_save, sender=Goal)
+@receiver(post_delete, sender=Goal)
+@receiver(post_save, sender=UserAchievement)
+@receiver(post_delete, sender=UserAchievement)
+def user_data_changed(sender, instance, **kwargs):
+    """Bump the owner's version when a session, goal or award changes."""
+    bump_data_version([instance.user_id])
+
+
+@receiver(post_save, sender=GoalOutcome)
+@receiver(post_delete, sender=GoalOutcome)
+def outcome_changed(sender, instance, **kwargs):
+    """Bump the goal owner's version when an outcome changes."""
+    bump_data_version(
+        Goal.objects.filter(pk=instance.goal_id).values("user_id")
+    )
+
+
+@receiver(outcomes_frozen)
+def week_frozen(sender, goals, **kwargs):
+    """Bump every user whose outcomes were written by a bulk freeze."""
+    bump_data_version(goals.values("user_id"))
+
+
+@receiver(awards_bulk_created)
+def awards_added(sender, user_ids, **kwargs):
+    """Bump every user who received a bulk-inserted award."""
+    bump_data_version(user_ids)
+
+
+@receiver(post_save, sender=Achievement)
+@receiver(post_delete, sender=Achievement)
+def catalog_changed(sender, **kwargs):
+    """Catalog changes alter every user's achievement strip."""
+    bump_data_version()
+
+
+@receiver(user_logged_in)
+def remember_timezone(sender, request, user, **kwargs):
+    """Store the user's time zone in the session for the middleware."""
+    if request is not None and hasattr(request, "session"):
+        request.session[TIMEZONE_SESSION_KEY] = timezone_name(user)
@@ -0,0 +1,209 @@
+"""Query budgets for every authenticated page.
+
+QUERY_BUDGETS declares the most queries each URL name may run. Every view
+is rendered for a user with a small history and again for one with a large
+history; the test fails if either render exceeds the budget or if the
+large render needs more queries than the small one. Failures list the SQL
+fingerprints that ran more than once, which is where N+1s show up. A page
+that redirects anonymous visitors to the login page but has no budget
+(and is not listed in UNBUDGETED) fails the suite as well.
+"""
+
+from collections import Counter
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.shortcuts import resolve_url
+from django.urls import URLResolver, get_resolver, reverse
+from django.urls.converters import IntConverter
+from django.utils import timezone
+
+from achievements.models import Achievement, UserAchievement
+from courses.models import Course
+from goals.models import Goal, GoalOutcome, MonthlyGoalRollup
+from goals.services import freeze_weekly_outcomes, last_week_range
+from study_sessions.models import StudySession
+from studystar.middleware import fingerprint
+
+#: URL name -> (max queries, function returning reverse() args for a
+#: Fixture). Counts include the session and user lookups of the request.
+QUERY_BUDGETS = {
+    "tracker:dashboard": (12, None),
+    "tracker:preferences": (3, None),
+    "courses:list": (4, None),
+    "courses:create": (3, None),
+    "courses:detail": (4, lambda f: [f.course.slug]),
+    "courses:update": (4, lambda f: [f.course.slug]),
+    "courses:delete": (4, lambda f: [f.course.slug]),
+    "goals:list": (6, None),
+    "goals:create": (4, None),
+    "goals:detail": (8, lambda f: [f.goal.pk]),
+    "goals:edit": (5, lambda f: [f.goal.pk]),
+    "goals:delete": (6, lambda f: [f.goal.pk]),
+    "study_sessions:new": (5, None),
+    "study_sessions:my_sessions": (5, None),
+    "study_sessions:session_delete": (4, lambda f: [f.session.pk]),
+    "achievements:list": (8, None),
+}
+
+#: Authenticated URL names that are not pages: aliases of budgeted names
+#: and POST-only actions.
+UNBUDGETED = {"courses:course_list", "goals:goal_list", "goals:freeze"}
+
+#: Namespaces of the project's own apps.
+APP_NAMESPACES = {
+    "tracker", "courses", "goals", "study_sessions", "achievements",
+}
+
+
+def authenticated_url_names(client):
+    """
+    Return the app URL names that send anonymous visitors to log in.
+
+    Each URL is reversed with placeholder arguments (1 for ints, "x"
+    otherwise); views check the login before looking anything up.
+    """
+    login_url = resolve_url(settings.LOGIN_URL)
+    names = set()
+    for resolver in get_resolver().url_patterns:
+        if not isinstance(resolver, URLResolver):
+            continue
+        if resolver.namespace not in APP_NAMESPACES:
+            continue
+        for pattern in resolver.url_patterns:
+            if not pattern.name:
+                continue
+            name = f"{resolver.namespace}:{pattern.name}"
+            args = [
+                1 if isinstance(converter, IntConverter) else "x"
+                for converter in pattern.pattern.converters.values()
+            ]
+            response = client.get(reverse(name, args=args))
+            if response.status_code == 302 and response.url.startswith(
+                login_url
+            ):
+                names.add(name)
+    return names
+
+
+def duplicated(queries):
+    """Return 'count x fingerprint' lines for statements run repeatedly."""
+    counts = Counter(fingerprint(q["sql"]) for q in queries)
+    return [
+        f"  {n} x {sql}" for sql, n in counts.most_common() if n > 1
+    ]
+
+
+class Fixture:
+    """
+    A user with `size` courses, each with a goal, sessions and outcomes.
+
+    Attributes:
+        user (User): The logged-in user.
+        course (Course): The user's first course.
+        goal (Goal): The goal on that course.
+        session (StudySession): One of the user's sessions.
+    """
+
+    def __init__(self, username, size):
+        self.user = get_user_model().objects.create_user(
+            username=username, password="pw"
+        )
+        now = timezone.now()
+        this_month = timezone.localdate().replace(day=1)
+        week_start = last_week_range()[0]
+
+        for i in range(size):
+            course = Course.objects.create(
+                title=f"{username} course {i}", owner=self.user
+            )
+            goal = Goal.objects.create(
+                user=self.user,
+                course=course,
+                weekly_hours_target=Decimal("2.0"),
+                total_required_lessons=10,
+                avg_hours_per_lesson=Decimal("1.0"),
+            )
+            for day in range(3):
+                StudySession.objects.create(
+                    user=self.user,
+                    course=course,
+                    goal=goal,
+                    duration_minutes=30,
+                    started_at=now - timedelta(days=day * 3),
+                )
+            GoalOutcome.objects.create(
+                goal=goal,
+                week_start=week_start - timedelta(weeks=1),
+                week_end=week_start - timedelta(days=1),
+            )
+            MonthlyGoalRollup.objects.create(
+                goal=goal, month=this_month, minutes=90
+            )
+            if i == 0:
+                self.course, self.goal = course, goal
+
+        self.session = StudySession.objects.filter(user=self.user).first()
+        for achievement in Achievement.objects.all()[:size]:
+            UserAchievement.objects.create(
+                user=self.user, achievement=achievement
+            )
+
+
+class QueryBudgetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(12):
+            Achievement.objects.create(
+                code=f"hours_{i}",
+                title=f"{i} Hours",
+                rule_type="total_hours",
+                rule_params={"threshold": i + 1},
+            )
+        cls.small = Fixture("small", 1)
+        cls.large = Fixture("large", 10)
+        week_start, week_end = last_week_range()
+        freeze_weekly_outcomes(week_start=week_start, week_end=week_end)
+
+    def count_queries(self, fixture, name, args):
+        """Render a page for a fixture's user and return its queries."""
+        url = reverse(name, args=args(fixture) if args else None)
+        self.client.force_login(fixture.user)
+        cache.clear()
+        # Warm lazily built per-user records before measuring
+        self.client.get(url)
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, name)
+        return ctx.captured_queries
+
+    def test_every_authenticated_page_has_a_budget(self):
+        missing = sorted(
+            authenticated_url_names(self.client)
+            - set(QUERY_BUDGETS) - UNBUDGETED
+        )
+        self.assertEqual(missing, [], "Authenticated URLs without a budget")
+
+    def test_views_stay_within_budget(self):
+        for name, (budget, args) in QUERY_BUDGETS.items():
+            with self.subTest(name):
+                small = self.count_queries(self.small, name, args)
+                large = self.count_queries(self.large, name, args)
+                report = "\n".join(duplicated(large))
+                self.assertLessEqual(
+                    len(large), budget,
+                    f"{name} ran {len(large)} queries (budget {budget})"
+                    f"\n{report}",
+                )
+                self.assertEqual(
+                    len(large), len(small),
+                    f"{name} grows with data: {len(small)} queries for the "
+                    f"small user, {len(large)} for the large one\n{report}",
+                )
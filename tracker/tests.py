@@ -0,0 +1,166 @@
+from datetime import date, datetime, timezone as dt_timezone
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from courses.models import Course
+from study_sessions.models import DailyStudyRollup, StudySession
+
+from .models import UserPreference
+from .timezones import TIMEZONE_SESSION_KEY, cohort_users, timezone_cohorts
+
+
+class DashboardCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="dash", password="pw"
+        )
+        self.course = Course.objects.create(title="Chem", owner=self.user)
+        self.client.force_login(self.user)
+        self.url = reverse("tracker:dashboard")
+
+    def log(self, minutes):
+        StudySession.objects.create(
+            user=self.user,
+            course=self.course,
+            duration_minutes=minutes,
+            started_at=timezone.now(),
+        )
+
+    def test_repeat_visit_reads_cache(self):
+        self.log(30)
+        self.client.get(self.url)
+
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(self.url)
+        self.assertEqual(resp.status_code, 200)
+
+        # Session + user lookups, then only the data version read
+        self.assertEqual(len(ctx.captured_queries), 3)
+
+    def test_new_session_invalidates_cache(self):
+        self.log(30)
+        resp = self.client.get(self.url)
+        self.assertEqual(resp.context["total_hours_this_week"], 0.5)
+
+        self.log(30)
+        resp = self.client.get(self.url)
+        self.assertEqual(resp.context["total_hours_this_week"], 1.0)
+
+
+class RequestTimingTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="timed", password="pw"
+        )
+        self.client.force_login(self.user)
+        self.url = reverse("tracker:dashboard")
+
+    @override_settings(REQUEST_TIMING_ENABLED=True)
+    def test_server_timing_header(self):
+        resp = self.client.get(self.url)
+        header = resp["Server-Timing"]
+        for phase in ("total;dur=", "view;dur=", "tpl;dur=", "sql;dur="):
+            self.assertIn(phase, header)
+        self.assertRegex(header, r'desc="[1-9]\d* queries"')
+
+    @override_settings(REQUEST_TIMING_ENABLED=True, REQUEST_TIMING_SLOW_MS=0)
+    def test_slow_requests_are_logged_with_fingerprints(self):
+        with self.assertLogs("studystar.timing", "WARNING") as logs:
+            self.client.get(self.url)
+        self.assertIn("Slow request GET /dashboard/", logs.output[0])
+        self.assertIn("django_session", logs.output[0])
+
+    def test_disabled_by_default(self):
+        resp = self.client.get(self.url)
+        self.assertFalse(resp.has_header("Server-Timing"))
+
+
+class UserTimezoneTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="tz", password="pw"
+        )
+        self.course = Course.objects.create(title="Art", owner=self.user)
+
+    def log(self, started_at):
+        return StudySession.objects.create(
+            user=self.user,
+            course=self.course,
+            duration_minutes=30,
+            started_at=started_at,
+        )
+
+    def test_study_date_follows_user_timezone(self):
+        # 02:00 UTC on Monday is still Sunday evening in New York
+        started = datetime(2025, 6, 2, 2, 0, tzinfo=dt_timezone.utc)
+        self.assertEqual(self.log(started).study_date, date(2025, 6, 2))
+
+        UserPreference.objects.create(
+            user=self.user, timezone="America/New_York"
+        )
+        self.user.refresh_from_db()
+        self.assertEqual(self.log(started).study_date, date(2025, 6, 1))
+
+    def test_changing_timezone_moves_dates_and_rollups(self):
+        self.client.force_login(self.user)
+        self.log(datetime(2025, 6, 2, 2, 0, tzinfo=dt_timezone.utc))
+
+        resp = self.client.post(
+            reverse("tracker:preferences"),
+            {"timezone": "America/New_York"},
+        )
+
+        self.assertRedirects(resp, reverse("tracker:preferences"))
+        self.assertEqual(
+            StudySession.objects.get().study_date, date(2025, 6, 1)
+        )
+        self.assertEqual(
+            list(DailyStudyRollup.objects.values_list("day", flat=True)),
+            [date(2025, 6, 1)],
+        )
+        self.assertEqual(
+            self.client.session[TIMEZONE_SESSION_KEY], "America/New_York"
+        )
+
+        resp = self.client.post(
+            reverse("tracker:preferences"), {"timezone": "Mars/Olympus"}
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(
+            UserPreference.objects.get(user=self.user).timezone,
+            "America/New_York",
+        )
+
+    def test_requests_use_the_users_timezone(self):
+        UserPreference.objects.create(user=self.user, timezone="Asia/Tokyo")
+        self.client.force_login(self.user)
+        self.assertEqual(
+            self.client.session[TIMEZONE_SESSION_KEY], "Asia/Tokyo"
+        )
+
+        # Sunday evening in UTC is already Monday morning in Tokyo
+        sunday_utc = datetime(2025, 6, 1, 20, 0, tzinfo=dt_timezone.utc)
+        with patch("django.utils.timezone.now", return_value=sunday_utc):
+            resp = self.client.get(reverse("tracker:dashboard"))
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.context["week_start"], date(2025, 6, 2))
+
+    @override_settings(TIME_ZONE="Europe/London")
+    def test_cohorts_group_users_by_timezone(self):
+        other = get_user_model().objects.create_user(
+            username="tokyo", password="pw"
+        )
+        UserPreference.objects.create(user=other, timezone="Asia/Tokyo")
+
+        self.assertEqual(timezone_cohorts(), ["Asia/Tokyo", "Europe/London"])
+        self.assertEqual(list(cohort_users("Europe/London")), [self.user])
+        self.assertEqual(list(cohort_users("Asia/Tokyo")), [other])
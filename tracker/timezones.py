@@ -0,0 +1,104 @@
+"""Per-user time zones.
+
+Each user's study dates, weeks and months are counted in their own time
+zone: their UserPreference `timezone`, or settings.TIME_ZONE without one.
+
+- During a request, UserTimezoneMiddleware activates the signed-in
+  user's zone, so `timezone.localdate()` and every week or month window
+  derived from it are already the user's. The zone name is cached in the
+  session (on login and when the preference changes), so this costs no
+  query.
+- Outside requests, callers pass a zone explicitly: StudySession derives
+  study_date with `user_timezone`, and the weekly freezer works through
+  users in cohorts sharing a zone (`timezone_cohorts`), each as its own
+  Monday begins.
+"""
+
+from functools import lru_cache
+from zoneinfo import ZoneInfo, available_timezones
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.db.models import Q
+
+#: Session key holding the signed-in user's time zone name.
+TIMEZONE_SESSION_KEY = "timezone"
+
+
+@lru_cache(maxsize=None)
+def timezone_names():
+    """Return every IANA time zone name available, sorted."""
+    return tuple(sorted(available_timezones()))
+
+
+def validate_timezone(value):
+    """
+    Reject names that are not IANA time zones.
+
+    Raises:
+        ValidationError: If `value` is not a known time zone.
+    """
+    if value not in timezone_names():
+        raise ValidationError(f"“{value}” is not a known time zone.")
+
+
+def timezone_name(user):
+    """
+    Return the name of the time zone a user's dates are counted in.
+
+    Reads `user.preference`, which Django caches on the instance (including
+    its absence), so repeated calls for one user object cost one query.
+
+    Args:
+        user (User): The user.
+
+    Returns:
+        str: The user's preferred zone, or settings.TIME_ZONE.
+    """
+    try:
+        return user.preference.timezone
+    except ObjectDoesNotExist:
+        return settings.TIME_ZONE
+
+
+def user_timezone(user):
+    """Return the user's time zone as a ZoneInfo (see `timezone_name`)."""
+    return ZoneInfo(timezone_name(user))
+
+
+def timezone_cohorts():
+    """
+    Return the names of every time zone that has users, sorted.
+
+    The default zone is included while any user has no preference.
+
+    Returns:
+        list[str]: Time zone names.
+    """
+    User = get_user_model()
+    names = set(
+        User.objects.filter(preference__isnull=False)
+        .values_list("preference__timezone", flat=True)
+        .distinct()
+    )
+    if User.objects.filter(preference__isnull=True).exists():
+        names.add(settings.TIME_ZONE)
+    return sorted(names)
+
+
+def cohort_users(name):
+    """
+    Return the users whose dates are counted in the given time zone.
+
+    Args:
+        name (str): Time zone name.
+
+    Returns:
+        QuerySet[User]: Users with that preference (plus users without a
+        preference, for the default zone).
+    """
+    in_zone = Q(preference__timezone=name)
+    if name == settings.TIME_ZONE:
+        in_zone |= Q(preference__isnull=True)
+    return get_user_model().objects.filter(in_zone)
@@ -5,22 +5,30 @@ Includes:
 - Authenticated dashboard summarising weekly activity, recent
 sessions/outcomes,
   monthly trend data for charts, and an achievements strip.
+- Authenticated preferences page (time zone).
 """
 
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from datetime import timedelta
 from django.utils import timezone
-from django.db.models import Sum
+from django.db.models import Q, Sum
 import json
-from goals.models import Goal, GoalOutcome
-from study_sessions.models import StudySession
+from goals.models import Goal, GoalOutcome, MonthlyGoalRollup
+from study_sessions.models import DailyStudyRollup, StudySession
 from achievements.models import UserAchievement, Achievement
-from achievements.services import get_user_stats
 import random
 from django.contrib import messages
-from django.db.models.functions import TruncMonth
+from django.core.cache import cache
+from .forms import PreferencesForm
 from .models import ContactMessage
+from .services import (
+    DASHBOARD_CACHE_TIMEOUT,
+    dashboard_cache_key,
+    get_data_version,
+    set_user_timezone,
+)
+from .timezones import TIMEZONE_SESSION_KEY, timezone_name
 
 
 
@@ -102,7 +110,7 @@ def dashboard(request):
         - Weekly summary card: total hours this week (Mon–Sun).
         - Recent sessions (up to 5) with course/goal info.
         - Recent frozen GoalOutcome snapshots (up to 5).
-        - Monthly trend (last 12 months): aggregated hours per goal for
+        - Monthly trend (last 12 months): MonthlyGoalRollup hours per goal for
         Chart.js.
         - Achievements strip: two most recent + next hours milestone hint.
 
@@ -111,48 +119,71 @@ def dashboard(request):
         flag).
         total_hours_this_week (float): Hours studied this week, rounded to 2
         dp.
-        recent_sessions (QuerySet[StudySession]): Latest 5 sessions.
-        recent_outcomes (QuerySet[GoalOutcome]): Latest 5 outcomes.
+        recent_sessions (list[StudySession]): Latest 5 sessions.
+        recent_outcomes (list[GoalOutcome]): Latest 5 outcomes.
         week_start (date): Monday of the current ISO week.
         week_end (date): Sunday of the current ISO week.
-        recent_achievements (QuerySet[UserAchievement]): Latest 2 awards.
+        recent_achievements (list[UserAchievement]): Latest 2 awards.
         next_hours_hint (str | None): e.g., '3.5h until “Bronze Hours”'.
         monthly_labels_json (str): JSON array of month labels for chart.
         monthly_datasets_json (str): JSON array of dataset configs for chart.
 
+    The computed context is cached per user under their data version
+    (see tracker.services), so repeat visits cost one version read and one
+    cache lookup until the user's data changes.
+
     Returns:
         HttpResponse: Rendered dashboard template.
     """
     user = request.user
+    today = timezone.localdate()
+
+    version = get_data_version(user)
+    cache_key = dashboard_cache_key(user, version, today)
+    context = cache.get(cache_key)
+    if context is None:
+        context = build_dashboard_context(user, today)
+        cache.set(cache_key, context, DASHBOARD_CACHE_TIMEOUT)
+
+    return render(request, "tracker/dashboard.html", context)
+
+
+def build_dashboard_context(user, today):
+    """
+    Compute the dashboard context for a user.
+
+    Querysets are evaluated into lists so the result can be cached.
 
+    Args:
+        user (User): The dashboard owner.
+        today (date): Local date used for the weekly and monthly windows.
+
+    Returns:
+        dict: The template context described on `dashboard`.
+    """
     # ---------- Weekly summary ----------
-    today = timezone.localdate()
     week_start = today - timedelta(days=today.weekday())  # Monday
     week_end = week_start + timedelta(days=7)  # next Monday
 
-    weekly_sessions = StudySession.objects.filter(
-        user=user,
-        started_at__date__gte=week_start,
-        started_at__date__lt=week_end,
-    )
-    total_minutes = (
-        weekly_sessions.aggregate(total=Sum("duration_minutes"))["total"]
-        or 0
+    # This week's and lifetime minutes in one pass over the rollups
+    minutes = DailyStudyRollup.objects.filter(user=user).aggregate(
+        week=Sum("minutes", filter=Q(day__gte=week_start, day__lt=week_end)),
+        total=Sum("minutes"),
     )
-    total_hours_this_week = round(total_minutes / 60.0, 2)
+    total_hours_this_week = round((minutes["week"] or 0) / 60.0, 2)
 
     # ---------- Recent sessions & outcomes ----------
-    recent_sessions = (
+    recent_sessions = list(
         StudySession.objects
         .filter(user=user)
-        .select_related("course", "goal")
+        .select_related("course", "goal__user", "goal__course")
         .order_by("-started_at")[:5]
     )
 
-    recent_outcomes = (
+    recent_outcomes = list(
         GoalOutcome.objects
-        .filter(goal__user=user)
-        .select_related("goal")
+        .filter(goal__user=user, is_final=True)
+        .select_related("goal__course")
         .order_by("-created_at")[:5]
     )
 
@@ -171,32 +202,22 @@ def dashboard(request):
             current = current.replace(month=current.month - 1)
     months = list(reversed(months))  # oldest first
 
-    outcomes = (
-        GoalOutcome.objects
-        .filter(goal__user=user)
-        .annotate(month=TruncMonth("week_start"))
-        .values("goal_id", "month")
-        .annotate(total_hours=Sum("hours_completed"))
+    # Pre-aggregated month rows: at most 12 per goal, read via the
+    # (goal, month) unique index
+    rollups = (
+        MonthlyGoalRollup.objects
+        .filter(goal__user=user, month__gte=months[0])
+        .select_related("goal__user", "goal__course")
         .order_by("month")
     )
 
-    goal_ids = {o["goal_id"] for o in outcomes}
-    goals = Goal.objects.filter(id__in=goal_ids)
-    goal_labels = {g.id: str(g) for g in goals}
-
     # Build {goal_id: {month: hours}}
     data_by_goal = {}
-    for o in outcomes:
-        gid = o["goal_id"]
-        m = o["month"]
-        hrs = float(o["total_hours"] or 0)
-
+    for r in rollups:
+        gid = r.goal_id
         if gid not in data_by_goal:
-            data_by_goal[gid] = {
-                "label": goal_labels.get(gid, f"Goal {gid}"),
-                "values": {}
-            }
-        data_by_goal[gid]["values"][m] = hrs
+            data_by_goal[gid] = {"label": str(r.goal), "values": {}}
+        data_by_goal[gid]["values"][r.month] = r.hours
 
     month_labels = [m.strftime("%b %Y") for m in months]
 
@@ -225,38 +246,36 @@ def dashboard(request):
     monthly_datasets_json = json.dumps(datasets)
 
     # ---------- Achievements strip ----------
-    recent_achievements = (
+    recent_achievements = list(
         UserAchievement.objects
         .filter(user=user)
         .select_related("achievement")
         .order_by("-awarded_at")[:2]
     )
 
-    stats = get_user_stats(user)
-    earned_codes = set(
-        UserAchievement.objects
-        .filter(user=user)
-        .values_list("achievement__code", flat=True)
-    )
-
-    total_hours_achs = (
+    # Lowest hours milestone the user has not earned yet
+    next_hours_ach = (
         Achievement.objects
         .filter(rule_type="total_hours")
+        .exclude(
+            id__in=UserAchievement.objects
+            .filter(user=user)
+            .values("achievement_id")
+        )
         .order_by("rule_params__threshold")
+        .first()
     )
 
     next_hours_hint = None
-    current_hours = round(stats["total_minutes"] / 60, 1)
+    current_hours = round((minutes["total"] or 0) / 60, 1)
 
-    for ach in total_hours_achs:
-        if ach.code not in earned_codes:
-            threshold = ach.rule_params.get("threshold", 0)
-            remaining = max(threshold - current_hours, 0)
-            if remaining > 0:
-                next_hours_hint = f"{remaining}h until “{ach.title}”"
-            break
+    if next_hours_ach is not None:
+        threshold = next_hours_ach.rule_params.get("threshold", 0)
+        remaining = max(threshold - current_hours, 0)
+        if remaining > 0:
+            next_hours_hint = f"{remaining}h until “{next_hours_ach.title}”"
 
-    context = {
+    return {
         "active_goals_count": (
             Goal.objects.filter(user=user, is_active=True).count()
             if hasattr(Goal, "is_active")
@@ -277,4 +296,34 @@ def dashboard(request):
         "monthly_datasets_json": monthly_datasets_json,
         }
 
-    return render(request, "tracker/dashboard.html", context)
+
+@login_required
+def preferences(request):
+    """
+    Show and update the user's preferences.
+
+    On a valid POST with a new time zone, the preference is saved, the
+    user's study dates are moved into the new zone (see
+    `set_user_timezone`) and the session's cached zone is updated so the
+    next request already uses it.
+
+    Args:
+        request (HttpRequest): The incoming request.
+
+    Returns:
+        HttpResponse | HttpResponseRedirect: The preferences page, or a
+        redirect back to it after saving.
+    """
+    current = timezone_name(request.user)
+    form = PreferencesForm(
+        request.POST or None, initial={"timezone": current}
+    )
+    if request.method == "POST" and form.is_valid():
+        name = form.cleaned_data["timezone"]
+        if name != current:
+            set_user_timezone(request.user, name)
+            request.session[TIMEZONE_SESSION_KEY] = name
+        messages.success(request, "Preferences saved.")
+        return redirect("tracker:preferences")
+
+    return render(request, "tracker/preferences.html", {"form": form})